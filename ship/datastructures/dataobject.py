@@ -75,6 +75,13 @@ class ADataRowObject(object):
         self.default = kwargs.get('default', None)
         self.update_callback = kwargs.get('update_callback', None)
         self.has_changed = False
+        self.change_count = 0
+        """Incremented every time has_changed is set to True.
+
+        Unlike has_changed this is never reset, so it can be used by any number
+        of caches to check whether the contents have been altered since they
+        last looked at them.
+        """
 
         self.data_collection = []
 
@@ -204,6 +211,7 @@ class ADataRowObject(object):
                 raise IndexError('DataObject addValue() index out of bounds')
 
         self.has_changed = True
+        self.change_count += 1
 #         self.record_length += 1
         self._max = len(self.data_collection)
 
@@ -233,6 +241,7 @@ class ADataRowObject(object):
                 raise IndexError('DataObject setValue() index out of bounds')
 
         self.has_changed = True
+        self.change_count += 1
 
     def deleteValue(self, index):
         """Delete value at supplied position in unit.
@@ -250,6 +259,7 @@ class ADataRowObject(object):
             raise IndexError('DataObject deleteValue() index out of bounds')
 
         self.has_changed = True
+        self.change_count += 1
 #         self.record_length -= 1
         self._max = len(self.data_collection)
 
@@ -287,6 +297,7 @@ class ADataRowObject(object):
             self.has_changed = False
         elif status == True:
             self.has_changed = True
+            self.change_count += 1
 
 
 class IntData(ADataRowObject):
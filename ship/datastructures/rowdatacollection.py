@@ -557,6 +557,14 @@ class RowDataCollection(object):
                     del o
             del temp_list
 
+    def dataObjects(self):
+        """Get all of the ADataRowObject's in the collection.
+
+        Returns:
+            list - of the ADataRowObject's in the order that they are held.
+        """
+        return list(self._collection)
+
     def collectionTypes(self):
         """Get a list of the types (names) of all the objects in the collection.
 
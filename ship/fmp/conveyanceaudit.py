@@ -0,0 +1,236 @@
+"""
+
+ Summary:
+     Model-wide check for negative conveyance in river sections.
+
+     The chainage, elevation, roughness, panel and RPL columns of every river
+     unit in a DatCollection are pulled out in one pass with a SectionTable.
+     The conveyance curve of each section is then calculated with
+     openchannel.calcConveyanceFast(), optionally spread across a process
+     pool for large models. The results are a compact per-unit table of negative conveyance
+     flags and severities that can be used to produce a report or fail a CI
+     check.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import multiprocessing
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.sectiontable import SectionTable
+from ship.utils.tools import openchannel
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+AUDIT_COLUMNS = (rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL)
+"""The ROW_DATA_TYPES needed to calculate conveyance."""
+
+
+class SectionResult(object):
+    """The conveyance check result for a single section.
+
+    The severity of a negative conveyance is the largest drop in conveyance
+    between one depth and the next. max_relative_drop is that drop divided
+    by the conveyance before the drop, so 0.25 means that conveyance fell by
+    25%. stage is the water level at which the largest drop occurs.
+    """
+
+    def __init__(self, name, has_negative, negative_count, max_drop,
+                 max_relative_drop, stage, max_conveyance):
+        self.name = name
+        self.has_negative = has_negative
+        self.negative_count = negative_count
+        self.max_drop = max_drop
+        self.max_relative_drop = max_relative_drop
+        self.stage = stage
+        self.max_conveyance = max_conveyance
+
+    def __repr__(self):
+        return 'SectionResult(%r, %r, %r)' % (self.name, self.has_negative,
+                                              self.max_relative_drop)
+
+
+class ConveyanceAudit(object):
+    """The results of checking a DatCollection for negative conveyance.
+
+    Holds a SectionResult for each river unit in the order that they appear
+    in the DatCollection.
+
+    Example::
+
+        audit = auditConveyance(dat, interpolate_space=0.1, processes=4)
+        print(audit.report(threshold=0.05))
+        if not audit.passed(threshold=0.05):
+            sys.exit(1)
+    """
+
+    def __init__(self, results):
+        self.results = results
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def negatives(self):
+        """Get the results for sections with any negative conveyance.
+
+        Return:
+            list - of SectionResult's.
+        """
+        return [r for r in self.results if r.has_negative]
+
+    def failed(self, threshold=0.0):
+        """Get the sections with a relative conveyance drop over threshold.
+
+        Args:
+            threshold=0.0(float): the largest acceptable max_relative_drop.
+
+        Return:
+            list - of SectionResult's sorted with the most severe first.
+        """
+        failed = [r for r in self.results
+                  if r.has_negative and r.max_relative_drop > threshold]
+        return sorted(failed, key=lambda r: r.max_relative_drop, reverse=True)
+
+    def passed(self, threshold=0.0):
+        """Check whether all sections are within the threshold.
+
+        Return:
+            bool - True if failed(threshold) is empty.
+        """
+        return len(self.failed(threshold)) == 0
+
+    def report(self, threshold=0.0):
+        """Get a plain text summary of the failed sections.
+
+        Args:
+            threshold=0.0(float): see failed().
+
+        Return:
+            str - containing a summary line followed by a line for each
+                failed section.
+        """
+        failed = self.failed(threshold)
+        lines = ['Conveyance audit: %d sections checked, %d with negative '
+                 'conveyance, %d over threshold %s' % (
+                     len(self.results), len(self.negatives()), len(failed),
+                     threshold)]
+        for r in failed:
+            lines.append('%-12s drops: %3d  max drop: %12.3f  relative: %6.1f%%  '
+                         'stage: %.3f' % (r.name, r.negative_count, r.max_drop,
+                                          r.max_relative_drop * 100, r.stage))
+        return '\n'.join(lines)
+
+
+def auditConveyance(dat_collection, **kwargs):
+    """Check all of the river sections in a DatCollection for negative conveyance.
+
+    Args:
+        dat_collection(DatCollection): the model to check.
+        **kwargs:
+            interpolate_space(float): passed to calcConveyanceFast. Default
+                is 0 (only use the section elevations as depths).
+            tolerance(float): passed to calcConveyanceFast. Default is 0.0.
+            no_panels(bool): ignore panel markers. Default is False.
+            use_rpl(bool): apply the relative path length of each panel to
+                its conveyance. Default is False, which matches
+                calcConveyance.
+            processes(int): number of worker processes. Default is 1, which
+                does everything in this process. Starting a pool is only
+                worth it for models with thousands of sections. None uses
+                the number of cpus. On Windows a pool can only be used from
+                code run under an "if __name__ == '__main__':" guard.
+            chunksize(int): number of sections sent to a worker at a time.
+                Default is 200.
+
+    Return:
+        ConveyanceAudit - containing the results.
+    """
+    interpolate_space = kwargs.get('interpolate_space', 0)
+    tolerance = kwargs.get('tolerance', 0.0)
+    no_panels = kwargs.get('no_panels', False)
+    use_rpl = kwargs.get('use_rpl', False)
+    processes = kwargs.get('processes', 1)
+    chunksize = kwargs.get('chunksize', 200)
+
+    table = SectionTable(dat_collection, columns=AUDIT_COLUMNS)
+    columns = [table.column(k) for k in AUDIT_COLUMNS]
+    jobs = []
+    for i in range(len(table.units)):
+        start, end = table.offsets[i], table.offsets[i + 1]
+        x, y, n, p, rpl = [c[start:end] for c in columns]
+        if not use_rpl:
+            rpl = None
+        jobs.append((x, y, n, p, rpl, no_panels, interpolate_space, tolerance))
+
+    if processes == 1 or len(jobs) < 2:
+        outputs = [_auditSection(j) for j in jobs]
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            outputs = pool.map(_auditSection, jobs, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+
+    results = [SectionResult(u.name, *out) for u, out in zip(table.units, outputs)]
+    return ConveyanceAudit(results)
+
+
+def _auditSection(job):
+    """Calculate the conveyance curve of a section and summarise it.
+
+    Module level so that it can be sent to a worker process.
+
+    Args:
+        job(tuple): (x_vals, y_vals, n_vals, panel_vals, rpl_vals, no_panels,
+            interpolate_space, tolerance).
+
+    Return:
+        tuple - (has_negative, negative_count, max_drop, max_relative_drop,
+            stage, max_conveyance).
+    """
+    x, y, n, p, rpl, no_panels, interpolate_space, tolerance = job
+    if len(x) < 2:
+        return (False, 0, 0.0, 0.0, None, 0.0)
+
+    results, has_negative = openchannel.calcConveyanceFast(
+        x, y, panel_vals=p, n_vals=n, no_panels=no_panels,
+        interpolate_space=interpolate_space, tolerance=tolerance,
+        rpl_vals=rpl)
+
+    count = 0
+    max_drop = 0.0
+    max_relative = 0.0
+    stage = None
+    for i, r in enumerate(results):
+        if not r[2]:
+            continue
+        count += 1
+        previous_k = results[i - 1][0]
+        drop = previous_k - r[0]
+        if drop > max_drop:
+            max_drop = drop
+            max_relative = drop / previous_k if previous_k else 0.0
+            stage = r[1]
+    max_k = max(r[0] for r in results) if results else 0.0
+    return (has_negative, count, max_drop, max_relative, stage, max_k)
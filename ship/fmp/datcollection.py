@@ -33,6 +33,11 @@ from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.fmp.datunits.isisunit import CommentUnit
 from ship.fmp import fmpunitfactory as iuf
 from ship.fmp import unitgroups as ugroups
+from ship.fmp import conveyanceaudit
+from ship.fmp import datdiff
+from ship.fmp import sectionextents
+from ship.fmp import sectiontable
+from ship.fmp import unitquery
 from ship.utils import utilfunctions as uf
 from ship.utils import filetools as ft
 
@@ -68,6 +73,9 @@ class DatCollection(object):
         self.path_holder = path_holder
         self._ic_index = -999  # DON'T MESS WITH THIS!
         self._gis_index = -999  # DON'T MESS WITH THIS!
+        self._units_version = 0
+        self._unit_index = None
+        self._unit_index_state = None
         self._min = 0
         self._max = len(self.units)
         self._current = 0
@@ -134,6 +142,7 @@ class DatCollection(object):
         """
         if not isinstance(unit, AUnit):
             raise AttributeError('Given unit is not of type AUnit')
+        self._units_version += 1
         update_node_count = kwargs.get('update_node_count', True)
         ics = kwargs.get('ics', {})
 
@@ -251,6 +260,7 @@ class DatCollection(object):
 
             header.head_data['node_count'].value = ic.node_count
             del self.units[index]
+            self._units_version += 1
             self._max = len(self.units)
             return True
 
@@ -499,6 +509,7 @@ class DatCollection(object):
 
         index = self.index(unit._name, unit._unit_type)
         self.units[index] = unit
+        self._units_version += 1
 
         for i, u in enumerate(self.units, 0):
             if u.name == unit.name:
@@ -512,6 +523,110 @@ class DatCollection(object):
         """
         return len(self.units)
 
+    def fingerprint(self):
+        """Get a stable hash of the contents of the whole model.
+
+        The hash is built from the AUnit.fingerprint() of every unit in the
+        order that they are held, so it will change if any unit is changed,
+        added, removed or moved. As the unit fingerprints are cached this is
+        cheap to call again after small changes to the model.
+
+        Return:
+            str - hex digest of the model contents.
+        """
+        return AUnit.digest([u.fingerprint() for u in self.units])
+
+    def diff(self, other):
+        """Compare the units in this collection with another DatCollection.
+
+        Units are matched by name and unit_type and their fingerprints compared
+        to find the ones that have changed. See the datdiff module for details.
+
+        Example::
+
+            changes = old_dat.diff(new_dat)
+            for c in changes.modified():
+                print(c.name, [f.field for f in c.fields])
+
+        Args:
+            other(DatCollection): the collection to compare against this one.
+
+        Return:
+            DatDiff - containing the added, removed, moved and modified units
+                needed to turn this collection into other.
+        """
+        return datdiff.diffCollections(self, other)
+
+    def query(self):
+        """Start a new query for selecting units from this collection.
+
+        Example::
+
+            for spill in dat.query().type('spill').where('weir_coef', '<', 1.5):
+                print(spill.name)
+
+        See Also:
+            unitquery.UnitQuery.
+
+        Return:
+            UnitQuery - that will select from all units in the collection.
+        """
+        return unitquery.UnitQuery(self)
+
+    def unitIndex(self):
+        """Get the type, category, name and reach index of the units.
+
+        The index is built when first needed and rebuilt whenever units are
+        added, removed or renamed. If you replace items in the units list
+        directly call refreshUnitIndex() afterwards.
+
+        Return:
+            UnitIndex - for the current units.
+        """
+        state = (id(self.units), len(self.units), self._units_version,
+                 AUnit.name_changes)
+        if self._unit_index is None or state != self._unit_index_state:
+            self._unit_index = unitquery.UnitIndex(self.units)
+            self._unit_index_state = state
+        return self._unit_index
+
+    def refreshUnitIndex(self):
+        """Force the unit index to be rebuilt the next time it's used."""
+        self._unit_index = None
+
+    def sectionTable(self, **kwargs):
+        """Get a columnar table of the section rows in this collection.
+
+        **kwargs:
+            See SectionTable constructor.
+
+        Return:
+            SectionTable - loaded with the rows of the river units.
+        """
+        return sectiontable.SectionTable(self, **kwargs)
+
+    def sectionExtents(self, **kwargs):
+        """Get the widths and deactivation extents of all river sections.
+
+        **kwargs:
+            See SectionExtents constructor.
+
+        Return:
+            SectionExtents - with the values for each river unit.
+        """
+        return sectionextents.SectionExtents(self, **kwargs)
+
+    def auditConveyance(self, **kwargs):
+        """Check all of the river sections for negative conveyance.
+
+        **kwargs:
+            See conveyanceaudit.auditConveyance.
+
+        Return:
+            ConveyanceAudit - containing a result for each river unit.
+        """
+        return conveyanceaudit.auditConveyance(self, **kwargs)
+
     def linkedUnits(self, unit):
         """
         """
@@ -0,0 +1,295 @@
+"""
+
+ Summary:
+     Structural diff between two DatCollection's.
+
+     Units are matched between the two collections by (name, unit_type) using
+     dictionary lookups rather than searching. The fingerprints of matched
+     units are compared first and only units that have changed are inspected
+     further to find which head_data values and row_data columns differ.
+
+     Comment and unknown units have randomly generated names, so they are
+     matched on their contents instead. This means that an edited comment
+     will appear as one removed and one added unit.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import bisect
+
+from ship.fmp.headdata import HeadDataItem
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+MOVED = 'moved'
+MODIFIED = 'modified'
+
+CONTENT_MATCHED_TYPES = ('comment', 'unknown')
+"""Unit types that are matched on their contents rather than their name."""
+
+
+class FieldChange(object):
+    """A single value that differs between two versions of a unit.
+
+    For head_data values the group will be 'head_data' and the field will be
+    the head_data key. For row_data the group will be the rowdata_key (e.g.
+    'main') and the field will be the ROW_DATA_TYPES value; old_value and
+    new_value will be lists of the values in the data object. A change to the
+    name_ds of a unit has a group of 'unit'.
+    """
+
+    def __init__(self, group, field, old_value, new_value):
+        self.group = group
+        self.field = field
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def __repr__(self):
+        return 'FieldChange(%r, %r)' % (self.group, self.field)
+
+
+class UnitChange(object):
+    """A unit that has been added, removed, moved or modified.
+
+    The old_index and new_index are the positions of the unit in the
+    DatCollection's being compared. old_index will be None for added units and
+    new_index will be None for removed units.
+
+    A unit that has been both moved and modified will have a change entry for
+    each.
+    """
+
+    def __init__(self, change_type, unit_type, name, old_index, new_index, fields=[]):
+        self.change_type = change_type
+        self.unit_type = unit_type
+        self.name = name
+        self.old_index = old_index
+        self.new_index = new_index
+        self.fields = list(fields)
+
+    def __repr__(self):
+        return 'UnitChange(%r, %r, %r)' % (self.change_type, self.unit_type, self.name)
+
+
+class DatDiff(object):
+    """The result of comparing two DatCollection's.
+
+    Holds a list of UnitChange's. Removed units are listed first in the order
+    they appeared in the old collection, followed by the other changes in the
+    order of the new collection.
+    """
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def hasChanges(self):
+        """Check whether any differences were found.
+
+        Return:
+            bool - True if the collections differ.
+        """
+        return len(self.changes) > 0
+
+    def added(self):
+        """Get the changes for units that are only in the new collection."""
+        return self.byType(ADDED)
+
+    def removed(self):
+        """Get the changes for units that are only in the old collection."""
+        return self.byType(REMOVED)
+
+    def moved(self):
+        """Get the changes for units that have changed position."""
+        return self.byType(MOVED)
+
+    def modified(self):
+        """Get the changes for units that have different contents."""
+        return self.byType(MODIFIED)
+
+    def byType(self, change_type):
+        """Get the changes of a particular type.
+
+        Args:
+            change_type(str): one of ADDED, REMOVED, MOVED or MODIFIED.
+
+        Return:
+            list - of UnitChange's.
+        """
+        return [c for c in self.changes if c.change_type == change_type]
+
+
+def diffCollections(old_dat, new_dat):
+    """Compare two DatCollection's.
+
+    Args:
+        old_dat(DatCollection): the original collection.
+        new_dat(DatCollection): the collection to compare against it.
+
+    Return:
+        DatDiff - containing the changes needed to turn old_dat into new_dat.
+    """
+    old_units = old_dat.units
+    new_units = new_dat.units
+
+    # Index the new units by key. Duplicate keys are matched in order
+    new_index = {}
+    for i, u in enumerate(new_units):
+        key = _matchKey(u)
+        if not key in new_index:
+            new_index[key] = []
+        new_index[key].append(i)
+    for key in new_index:
+        new_index[key].reverse()
+
+    pairs = []
+    removed = []
+    for i, u in enumerate(old_units):
+        candidates = new_index.get(_matchKey(u))
+        if candidates:
+            pairs.append((i, candidates.pop()))
+        else:
+            removed.append(i)
+
+    matched_new = set(p[1] for p in pairs)
+    stationary = _longestIncreasing([p[1] for p in pairs])
+
+    changes = []
+    for i in removed:
+        u = old_units[i]
+        changes.append(UnitChange(REMOVED, u.unit_type, u.name, i, None))
+
+    new_to_old = dict((p[1], p[0]) for p in pairs)
+    for j, u in enumerate(new_units):
+        if not j in matched_new:
+            changes.append(UnitChange(ADDED, u.unit_type, u.name, None, j))
+            continue
+
+        i = new_to_old[j]
+        if not j in stationary:
+            changes.append(UnitChange(MOVED, u.unit_type, u.name, i, j))
+        old_unit = old_units[i]
+        if old_unit.fingerprint() != u.fingerprint():
+            fields = diffUnits(old_unit, u)
+            changes.append(UnitChange(MODIFIED, u.unit_type, u.name, i, j, fields))
+
+    return DatDiff(changes)
+
+
+def diffUnits(old_unit, new_unit):
+    """Find the values that differ between two units.
+
+    Only head_data and row_data columns with different digests are compared
+    value by value.
+
+    Args:
+        old_unit(AUnit): the original unit.
+        new_unit(AUnit): the unit to compare against it.
+
+    Return:
+        list - of FieldChange's.
+    """
+    fields = []
+    if old_unit.name_ds != new_unit.name_ds:
+        fields.append(FieldChange('unit', 'name_ds', old_unit.name_ds, new_unit.name_ds))
+
+    if old_unit.headDataDigest() != new_unit.headDataDigest():
+        old_head = old_unit.head_data
+        new_head = new_unit.head_data
+        keys = sorted(set(old_head.keys()) | set(new_head.keys()))
+        for k in keys:
+            old_val = _headValue(old_head.get(k, None))
+            new_val = _headValue(new_head.get(k, None))
+            if old_val != new_val:
+                fields.append(FieldChange('head_data', k, old_val, new_val))
+
+    old_rows = old_unit.rowDataDigests()
+    new_rows = new_unit.rowDataDigests()
+    for key in sorted(set(old_rows.keys()) | set(new_rows.keys())):
+        if old_rows.get(key) == new_rows.get(key):
+            continue
+        fields.append(FieldChange(key[0], key[1], _rowValues(old_unit, key),
+                                  _rowValues(new_unit, key)))
+    return fields
+
+
+def _matchKey(unit):
+    """Get the key used to match a unit between collections."""
+    if unit.unit_type in CONTENT_MATCHED_TYPES:
+        return (unit.unit_type, unit.headDataDigest())
+    return (unit.unit_type, unit.name)
+
+
+def _headValue(item):
+    if isinstance(item, HeadDataItem):
+        return item.value
+    return item
+
+
+def _rowValues(unit, key):
+    """Get the values in a row_data data object, or None if not found."""
+    try:
+        rows = unit.row_data[key[0]]
+        if rows.has_dummy:
+            return []
+        return list(rows.dataObject(key[1]).data_collection)
+    except KeyError:
+        return None
+
+
+def _longestIncreasing(values):
+    """Find the positions in values that form the longest increasing run.
+
+    Used to find the smallest set of units that must have moved: everything
+    in the longest increasing subsequence of new positions is considered to
+    have stayed put.
+
+    Args:
+        values(list): of unique ints.
+
+    Return:
+        set - of the values that are part of the subsequence.
+    """
+    tails = []
+    tail_pos = []
+    prev = [None] * len(values)
+    for i, v in enumerate(values):
+        k = bisect.bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_pos.append(i)
+        else:
+            tails[k] = v
+            tail_pos[k] = i
+        prev[i] = tail_pos[k - 1] if k > 0 else None
+
+    out = set()
+    i = tail_pos[-1] if tail_pos else None
+    while i is not None:
+        out.add(values[i])
+        i = prev[i]
+    return out
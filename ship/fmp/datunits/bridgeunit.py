@@ -40,6 +40,10 @@ from ship.utils.tools import geometry
 from ship.datastructures import DATA_TYPES as dt
 
 
+ARCH_SEGMENTS = 32
+"""Default number of straight lines used to approximate a bridge arch."""
+
+
 class BridgeUnit (AUnit):
     """Subclass of AUnit storing Isis Bridge Unit data.
 
@@ -385,31 +389,52 @@ class BridgeUnit (AUnit):
                 if not value >= self.row_data['opening'].dataObject(rdt.OPEN_START)[details['next_index']]:
                     raise ValueError('Bridge: OPEN_END must be < than next OPEN_START value')
 
-    def area(self):
+    def area(self, stage=None, arch_segments=ARCH_SEGMENTS):
         """Returns the cross sectional area of the bridge openings.
 
+        Each opening is the area between the bed (the main section geometry)
+        and the underside of the bridge, between the opening start and end
+        chainage. The underside is vertical from the bed to the springing
+        level at the start and end of the opening and a semi-ellipse from the
+        springing level up to the soffit level in the middle. Any part of the
+        bed that is higher than the underside doesn't count.
+
+        Args:
+            stage=None(float): if given only the area below this water level
+                is included.
+            arch_segments=ARCH_SEGMENTS(int): the number of straight lines
+                used to approximate the arch of each opening.
+
         Return:
             Dict - containing the area of the opening(s). keys = 'total', then
                 '1', '2', 'n' for all openings found.
         """
-        return 0
-#         areas = []
-#         opening_data = self.additional_row_collections['Opening']
-#         x_vals = self.row_collection.getRowDataAsList(rdt.CHAINAGE)
-#         y_vals = self.row_collection.getRowDataAsList(rdt.ELEVATION)
-#
-#         start_vals = opening_data.getRowDataAsList(rdt.OPEN_START)
-#         end_vals = opening_data.getRowDataAsList(rdt.OPEN_END)
-#         soffit_vals = opening_data.getRowDataAsList(rdt.SOFFIT_LEVEL)
-#         springing_vals = opening_data.getRowDataAsList(rdt.SPRINGING_LEVEL)
-#         openings = zip(start_vals, end_vals, soffit_vals, springing_vals)
-#
-#         for i, x in enumerate(x_vals):
-#
-#             if math.fabs(x - )
-#
-#
-#         i=0
+        areas = {'total': 0.0}
+        main = self.row_data['main']
+        opening = self.row_data['opening']
+        if main.has_dummy or opening.has_dummy:
+            return areas
+        x_vals = main.dataObjectAsList(rdt.CHAINAGE)
+        y_vals = main.dataObjectAsList(rdt.ELEVATION)
+
+        openings = zip(opening.dataObjectAsList(rdt.OPEN_START),
+                       opening.dataObjectAsList(rdt.OPEN_END),
+                       opening.dataObjectAsList(rdt.SPRINGING_LEVEL),
+                       opening.dataObjectAsList(rdt.SOFFIT_LEVEL))
+        xs = []
+        ys = []
+        offsets = [0]
+        for o in openings:
+            top_x, top_y = archProfile(o[0], o[1], o[2], o[3], arch_segments)
+            xs.extend(top_x)
+            ys.extend(top_y)
+            offsets.append(len(xs))
+        if stage is not None:
+            xs, ys, offsets = geometry.clipLinesAtLevel(xs, ys, offsets, stage)
+        for i, a in enumerate(geometry.areasBetween(x_vals, y_vals, xs, ys, offsets)):
+            areas[str(i + 1)] = a
+            areas['total'] += a
+        return areas
 
 
 class BridgeUnitUsbpr (BridgeUnit):
@@ -790,3 +815,35 @@ class BridgeUnitArch (BridgeUnit):
             out_data.append(self.row_data['opening'].getPrintableRow(i))
 
         return out_data
+
+
+def archProfile(start, end, springing, soffit, segments=ARCH_SEGMENTS):
+    """Get the underside of a bridge opening as a line.
+
+    The arch is a semi-ellipse from the springing level at start and end up
+    to the soffit level in the middle. If the soffit is not above the
+    springing level the underside is flat at the springing level.
+
+    Args:
+        start(float): opening start chainage.
+        end(float): opening end chainage.
+        springing(float): springing level.
+        soffit(float): soffit level.
+        segments=ARCH_SEGMENTS(int): number of lines to use for the arch.
+
+    Return:
+        tuple - (x values, y values) of the underside from start to end.
+    """
+    rise = soffit - springing
+    if not rise > 0 or not end > start:
+        return [start, end], [springing, springing]
+    half = (end - start) / 2.0
+    xs = []
+    ys = []
+    for k in range(segments + 1):
+        theta = math.pi * (1 - k / float(segments))
+        xs.append(start + half * (1 + math.cos(theta)))
+        ys.append(springing + rise * math.sin(theta))
+    xs[-1] = end
+    ys[0] = ys[-1] = springing
+    return xs, ys
@@ -23,6 +23,7 @@
 """
 from __future__ import unicode_literals
 
+import array
 import hashlib
 import uuid
 import random
@@ -67,6 +68,12 @@ class AUnit(object):
     """
 #     __metaclass__ = ABCMeta
 
+    name_changes = 0
+    """Count of the name/name_ds updates made to any unit.
+
+    Used by DatCollection to check whether its name index is out of date.
+    """
+
     def __init__(self, **kwargs):
         """Constructor
 
@@ -109,6 +116,9 @@ class AUnit(object):
         data in the .dat file.
         """
 
+        self._digest_cache = {}
+        """Cached head_data and row_data digests used by fingerprint()."""
+
     @property
     def name(self):
         return self._name
@@ -116,6 +126,7 @@ class AUnit(object):
     @name.setter
     def name(self, value):
         self._name = value
+        AUnit.name_changes += 1
 
     @property
     def name_ds(self):
@@ -124,6 +135,7 @@ class AUnit(object):
     @name_ds.setter
     def name_ds(self, value):
         self._name_ds = value
+        AUnit.name_changes += 1
 
     @property
     def has_ics(self):
@@ -182,6 +194,134 @@ class AUnit(object):
         object_copy = copy.deepcopy(self)
         return object_copy
 
+    def fingerprint(self):
+        """Get a stable hash of the contents of this unit.
+
+        The hash covers the unit type, names, head_data and row_data. Units
+        with the same contents will always return the same fingerprint, in
+        this session or any other, so it can be used to check whether two
+        units are identical or to key caches of derived results.
+
+        The head_data and row_data digests are cached and only recomputed when
+        the change_count of the HeadDataItem's and ADataRowObject's shows that
+        they have been updated. This makes calling fingerprint() on a unit that
+        hasn't changed cheap.
+
+        Return:
+            str - hex digest of the unit contents.
+        """
+        values = list(self._fingerprintIdentity())
+        values.append(self.headDataDigest())
+        for key, digest in sorted(self.rowDataDigests().items()):
+            values.append(key)
+            values.append(digest)
+
+        cached = self._digest_cache.get('unit')
+        if cached is None or cached[0] != values:
+            cached = (values, AUnit.digest(values))
+            self._digest_cache['unit'] = cached
+        return cached[1]
+
+    def headDataDigest(self):
+        """Get a hash of the head_data contents.
+
+        Values stored as HeadDataItem's are cached against their change_count.
+        Any other values (e.g. the 'names' list in a JunctionUnit) can't be
+        tracked and are hashed every time.
+
+        Return:
+            str - hex digest of the head_data.
+        """
+        tracked = []
+        untracked = []
+        for key in sorted(self.head_data.keys()):
+            item = self.head_data[key]
+            if isinstance(item, HeadDataItem):
+                tracked.append((key, item))
+            else:
+                untracked.append((key, item))
+
+        state = [(key, id(item), item.change_count) for key, item in tracked]
+        cached = self._digest_cache.get('head_data')
+        if cached is None or cached[0] != state:
+            digest = AUnit.digest([(key, item.value) for key, item in tracked])
+            # Hold the items so that their ids can't be reused
+            cached = (state, [item for key, item in tracked], digest)
+            self._digest_cache['head_data'] = cached
+
+        if not untracked:
+            return cached[2]
+        return AUnit.digest([cached[2]] + untracked)
+
+    def rowDataDigests(self):
+        """Get a hash of the contents of each row_data data object.
+
+        Each digest is cached against the data object and its change_count so
+        only the data objects that have been updated since the last call will
+        be hashed again. The values in collections that only contain a dummy
+        row are ignored.
+
+        Return:
+            dict - {(rowdata_key, data_type): hex digest} for every data
+                object in every RowDataCollection in row_data.
+        """
+        digests = {}
+        for rowdata_key, rows in self.row_data.items():
+            for obj in rows.dataObjects():
+                key = (rowdata_key, obj.data_type)
+                cached = self._digest_cache.get(key)
+                if (cached is None or not cached[0] is obj or
+                        cached[1] != obj.change_count or cached[2] != rows.has_dummy):
+                    if rows.has_dummy:
+                        digest = AUnit.digest([obj.data_type])
+                    else:
+                        digest = AUnit._columnDigest(obj)
+                    cached = (obj, obj.change_count, rows.has_dummy, digest)
+                    self._digest_cache[key] = cached
+                digests[key] = cached[3]
+        return digests
+
+    def _fingerprintIdentity(self):
+        """Values identifying this unit to include in the fingerprint.
+
+        Units with generated names (e.g. CommentUnit) should override this so
+        that the generated name doesn't change the fingerprint.
+
+        Return:
+            list - of values.
+        """
+        return [self._unit_type, self._name, self._name_ds]
+
+    @staticmethod
+    def _columnDigest(data_obj):
+        """Create a digest of the values in an ADataRowObject.
+
+        Numeric columns are packed as doubles, which is much quicker than
+        using repr() on large sections. Anything else falls back to digest().
+        """
+        try:
+            values = array.array('d', data_obj.data_collection)
+        except TypeError:
+            return AUnit.digest([data_obj.data_type, data_obj.data_collection])
+        h = hashlib.sha1(repr(data_obj.data_type).encode('utf-8'))
+        h.update(values.tobytes() if hasattr(values, 'tobytes') else values.tostring())
+        return h.hexdigest()
+
+    @staticmethod
+    def digest(values):
+        """Create a stable hex digest from a list of values.
+
+        Values are hashed using their repr() so they should be built from
+        basic types (str, int, float, bool, None, lists and tuples of them).
+
+        Args:
+            values(list): the values to hash.
+
+        Return:
+            str - sha1 hex digest.
+        """
+        return hashlib.sha1(repr(list(values)).encode('utf-8')).hexdigest()
+
     def rowDataObject(self, key, rowdata_key='main'):
         """Returns the row data object as a list.
 
@@ -451,6 +591,10 @@ class UnknownUnit(AUnit):
     def readUnitData(self, data):
         self.head_data['all'] = data
 
+    def _fingerprintIdentity(self):
+        """Overrides superclass. The unit name is randomly generated."""
+        return [self._unit_type]
+
 
 class CommentUnit(AUnit):
     """Holds the data in COMMENT sections of the .dat file.
@@ -479,6 +623,14 @@ class CommentUnit(AUnit):
         if not text.strip() == '':
             self.addCommentText(text)
 
+    def headDataDigest(self):
+        """Overrides superclass to hash the comment text."""
+        return AUnit.digest(self.data)
+
+    def _fingerprintIdentity(self):
+        """Overrides superclass. The unit name is randomly generated."""
+        return [self._unit_type]
+
     def addCommentText(self, text):
         text = text.split('\n')
         self.no_of_rows = int(len(self.data) + len(text))
@@ -28,6 +28,7 @@ from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.fmp.headdata import HeadDataItem
+from ship.fmp import sectionextents
 from ship.datastructures import DATA_TYPES as dt
 
 import logging
@@ -353,23 +354,18 @@ class RiverUnit (AUnit):
                 
         Return:
             float - the width of the section.
-        """
-        chainage = self.row_data['main'].dataObject(rdt.CHAINAGE)
 
+        Raises:
+            IndexError: if active_only and there are no active rows.
+
+        See Also:
+            ship.fmp.sectionextents - to get the widths of all sections at once.
+        """
+        chainage = self.row_data['main'].dataObject(rdt.CHAINAGE).data_collection
+        deact = self.row_data['main'].dataObject(rdt.DEACTIVATION).data_collection
+        extents = sectionextents.sectionExtents(chainage, deact)
         if active_only:
-            deact = self.row_data['main'].dataObject(rdt.DEACTIVATION)
-            left_deact = -1
-            right_deact = -1
-            for i, val in enumerate(deact):
-                if val == 'LEFT': left_deact = i
-                if val == 'RIGHT': right_deact = i
-                if left_deact != -1 and right_deact != -1: break
-            new_chain = chainage
-            if right_deact != -1:
-                new_chain = new_chain[:right_deact]
-            if left_deact != -1:
-                new_chain = new_chain[left_deact:]
-            width = abs(new_chain[-1] - new_chain[0])
-        else:
-            width = abs(chainage[-1] - chainage[0])
-        return width
+            if extents[1] is None:
+                raise IndexError('No active rows in section %s' % self.name)
+            return extents[1]
+        return extents[0]
@@ -82,6 +82,8 @@ class HeadDataItem(object):
 
         value = self._checkValue(initial_value)
         self._value = value
+        self.has_changed = False
+        self.change_count = 0
         self._format_float_to_int = kwargs.get('format_float_to_int', None)
 #         self._default_blank_value = kwargs.get('default_blank_value', None)
         self._update_callback = kwargs.get('update_callback', None)
@@ -100,6 +102,8 @@ class HeadDataItem(object):
         """
         val = self._checkValue(val)
         self._value = val
+        self.has_changed = True
+        self.change_count += 1
 
     def format(self, auto_newline=False):
         """Return the value converted to unicode str and formatted.
@@ -0,0 +1,233 @@
+"""
+
+ Summary:
+     Hydraulic property tables for river sections.
+
+     A HydraulicTable holds the area, wetted perimeter, top width, hydraulic
+     radius and conveyance of a section on a grid of stages, calculated in
+     one go with openchannel.sectionProperties(). Values at any other stage
+     are found by linear interpolation between the grid stages.
+
+     The HydraulicTableCache memoises the tables for RiverUnit's. Tables are
+     keyed on a hash of the section geometry (the digests of the chainage,
+     elevation, roughness, panel and RPL data objects) so a table is rebuilt
+     automatically when the rows of a unit change and units with identical
+     sections share a table. The least recently used tables are dropped when
+     the cache is full.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import bisect
+from collections import OrderedDict
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.datunits.isisunit import AUnit
+from ship.utils.tools import openchannel
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+PROPERTIES = ('area', 'wp', 'top_width', 'hydraulic_radius', 'conveyance')
+"""The property keys held by a HydraulicTable."""
+
+GEOMETRY_COLUMNS = (rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL)
+"""The ROW_DATA_TYPES that the hydraulic properties depend on."""
+
+
+class HydraulicTable(object):
+    """Hydraulic properties of a section on a grid of stages.
+
+    The stage grid contains every elevation in the section, where the shape
+    of the property curves changes, plus regularly spaced stages between the
+    lowest and highest elevations. Below the lowest point all properties are
+    zero. Above the top of the grid the properties are calculated directly
+    rather than extrapolated.
+    """
+
+    def __init__(self, x_vals, y_vals, n_vals=None, panel_vals=[], rpl_vals=None,
+                 stage_step=0.1):
+        """Constructor.
+
+        Args:
+            x_vals(list): cross section chainage values.
+            y_vals(list): corresponding elevation values.
+            n_vals=None(list): corresponding mannings n values.
+            panel_vals=[](list): corresponding panel markers.
+            rpl_vals=None(list): corresponding relative path length values.
+            stage_step=0.1(float): spacing of the regular stages in the grid.
+        """
+        self._geometry = (list(x_vals), list(y_vals), n_vals, list(panel_vals), rpl_vals)
+        self.stage_step = stage_step
+        self.stages = stageGrid(y_vals, stage_step)
+        self.values = self._calculate(self.stages)
+
+    def _calculate(self, stages):
+        x, y, n, p, rpl = self._geometry
+        props = openchannel.sectionProperties(x, y, stages, n_vals=n,
+                                              panel_vals=p, rpl_vals=rpl)
+        return dict((k, props[k]) for k in PROPERTIES)
+
+    def at(self, stage):
+        """Get all of the properties at a stage.
+
+        Args:
+            stage(float): the water level.
+
+        Return:
+            dict - {property: value} for each of PROPERTIES.
+        """
+        return dict((k, self.value(k, stage)) for k in PROPERTIES)
+
+    def value(self, key, stage):
+        """Get a single property at a stage.
+
+        Args:
+            key(str): one of PROPERTIES.
+            stage(float): the water level.
+
+        Return:
+            float - the interpolated value.
+
+        Raises:
+            KeyError: if key is not in PROPERTIES.
+        """
+        col = self.values[key]
+        stages = self.stages
+        if not stages or stage < stages[0]:
+            return 0.0
+        if stage > stages[-1]:
+            return self._calculate([stage])[key][0]
+
+        i = bisect.bisect_left(stages, stage)
+        if stages[i] == stage:
+            return col[i]
+        s0, s1 = stages[i - 1], stages[i]
+        return col[i - 1] + (col[i] - col[i - 1]) * (stage - s0) / (s1 - s0)
+
+    def valuesAt(self, key, stages):
+        """Get a property at a list of stages.
+
+        Return:
+            list - of interpolated values.
+        """
+        return [self.value(key, s) for s in stages]
+
+
+def stageGrid(y_vals, stage_step):
+    """Get the stages to build a HydraulicTable on.
+
+    Args:
+        y_vals(list): the section elevations.
+        stage_step(float): spacing of the regular stages.
+
+    Return:
+        list - of unique stages in ascending order.
+    """
+    if not y_vals:
+        return []
+    low, high = min(y_vals), max(y_vals)
+    stages = set(y_vals)
+    if stage_step > 0:
+        count = int((high - low) / stage_step)
+        stages.update(low + i * stage_step for i in range(1, count + 1))
+    return sorted(s for s in stages if s <= high)
+
+
+class HydraulicTableCache(object):
+    """Least recently used cache of HydraulicTable's for RiverUnit's.
+
+    Example::
+
+        cache = HydraulicTableCache(maxsize=500)
+        for unit in dat.unitsByType('river'):
+            area = cache.table(unit).value('area', 12.5)
+    """
+
+    def __init__(self, maxsize=256, stage_step=0.1):
+        """Constructor.
+
+        Args:
+            maxsize=256(int): the maximum number of tables to keep.
+            stage_step=0.1(float): passed to the HydraulicTable's.
+        """
+        self.maxsize = maxsize
+        self.stage_step = stage_step
+        self.hits = 0
+        self.misses = 0
+        self._tables = OrderedDict()
+
+    def __len__(self):
+        return len(self._tables)
+
+    def clear(self):
+        """Remove all of the tables from the cache."""
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def table(self, unit):
+        """Get the HydraulicTable for a unit, building it if needed.
+
+        Args:
+            unit(RiverUnit): the unit to get the table for.
+
+        Return:
+            HydraulicTable - for the current geometry of the unit.
+        """
+        key = self.geometryKey(unit)
+        table = self._tables.get(key)
+        if table is not None:
+            self.hits += 1
+            self._tables.pop(key)
+            self._tables[key] = table
+            return table
+
+        self.misses += 1
+        table = self._build(unit)
+        self._tables[key] = table
+        while len(self._tables) > self.maxsize:
+            self._tables.popitem(last=False)
+        return table
+
+    def at(self, unit, stage):
+        """Get all of the properties of a unit at a stage. See HydraulicTable.at()."""
+        return self.table(unit).at(stage)
+
+    def geometryKey(self, unit):
+        """Get the hash of the section geometry of a unit.
+
+        Uses the cached row data digests, so only data objects that have
+        changed since the last call are hashed again.
+
+        Return:
+            str - hex digest.
+        """
+        digests = unit.rowDataDigests()
+        parts = [self.stage_step]
+        parts.extend(digests.get(('main', k)) for k in GEOMETRY_COLUMNS)
+        return AUnit.digest(parts)
+
+    def _build(self, unit):
+        rows = unit.row_data['main']
+        if rows.has_dummy:
+            return HydraulicTable([], [], stage_step=self.stage_step)
+        x, y, n, p, rpl = [rows.dataObjectAsList(k) for k in GEOMETRY_COLUMNS]
+        return HydraulicTable(x, y, n_vals=n, panel_vals=p, rpl_vals=rpl,
+                              stage_step=self.stage_step)
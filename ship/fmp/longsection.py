@@ -0,0 +1,245 @@
+"""
+
+ Summary:
+     Long section profiles of the river reaches in a DatCollection.
+
+     For each reach the cumulative chainage (from the distance head_data of
+     the river units and of any other units, such as interpolates, between
+     them), bed level, left and right bank levels and the active
+     extents of each section (limited by any deactivation markers) are
+     collected into columns ready for plotting or export.
+
+     The section values are calculated from a single columnar extraction of
+     the section rows with a SectionTable. They are cached against the
+     fingerprint of each unit, so after a few units have been edited only
+     those units are extracted and calculated again.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.sectiontable import SectionTable
+from ship.fmp.sectionextents import deactivationIndices
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+PROFILE_COLUMNS = (rdt.CHAINAGE, rdt.ELEVATION, rdt.BANKMARKER, rdt.DEACTIVATION)
+"""The ROW_DATA_TYPES needed to build a long section."""
+
+SECTION_KEYS = ('bed', 'left_bank', 'right_bank', 'active_left', 'active_right')
+"""The per-section values held in a ReachProfile, in addition to chainage."""
+
+
+class ReachProfile(object):
+    """The long section of a single reach.
+
+    All of the lists have a value for each river unit in the reach, in the
+    order they appear in the DatCollection:
+
+        units: the RiverUnit's.
+        chainage: cumulative distance from the first unit in the reach.
+            This includes the distance of any other units, like
+            interpolates, between the river units.
+        bed: lowest elevation between the active extents.
+        left_bank / right_bank: elevation at the LEFT / RIGHT bank marker,
+            or at the active extent if there is no bank marker.
+        active_left / active_right: section chainage at the ends of the
+            active part of the section, the same as used by
+            RiverUnit.width(active_only=True). That's from the LEFT
+            deactivation marker up to the row before the RIGHT one, or the
+            ends of the section. None if there are no active rows.
+
+    Sections with no rows have None for the section values.
+    """
+
+    def __init__(self, reach_number):
+        self.reach_number = reach_number
+        self.units = []
+        self.chainage = []
+        for k in SECTION_KEYS:
+            setattr(self, k, [])
+
+    def __len__(self):
+        return len(self.units)
+
+    def names(self):
+        """Get the names of the units in the reach."""
+        return [u.name for u in self.units]
+
+    def activeWidths(self):
+        """Get the width between the active extents of each section."""
+        return [r - l if l is not None and r is not None else None
+                for l, r in zip(self.active_left, self.active_right)]
+
+
+class LongSection(object):
+    """Long section profiles for all of the reaches in a DatCollection.
+
+    Example::
+
+        long_section = LongSection(dat)
+        for reach in long_section.reaches():
+            plot(reach.chainage, reach.bed)
+
+        # After editing some units only those units are recalculated
+        reaches = long_section.reaches()
+    """
+
+    def __init__(self, dat_collection):
+        """Constructor.
+
+        Args:
+            dat_collection(DatCollection): the model to profile.
+        """
+        self.dat_collection = dat_collection
+        self._cache = {}
+        self.last_updated = 0
+
+    def reaches(self):
+        """Get the profile of each reach.
+
+        Return:
+            list - of ReachProfile's in the order the reaches appear in the
+                DatCollection.
+        """
+        units = self.dat_collection.units
+        rivers = [u for u in units if u.unit_type == 'river']
+        self._updateCache(rivers)
+
+        profiles = []
+        current = None
+        distance = 0.0
+        for unit in units:
+            if unit.unit_type != 'river':
+                # The distance to the next unit still counts towards the
+                # chainage of the next river unit
+                distance += unitDistance(unit)
+                continue
+            if current is None or unit.reach_number != current.reach_number:
+                current = ReachProfile(unit.reach_number)
+                profiles.append(current)
+                total = 0.0
+            else:
+                total += distance
+            distance = unitDistance(unit)
+            current.units.append(unit)
+            current.chainage.append(total)
+            values = self._cache[id(unit)][2]
+            for k, v in zip(SECTION_KEYS, values):
+                getattr(current, k).append(v)
+        return profiles
+
+    def reach(self, reach_number):
+        """Get the profile of a single reach.
+
+        Return:
+            ReachProfile - or None if the reach is not found.
+        """
+        for r in self.reaches():
+            if r.reach_number == reach_number:
+                return r
+        return None
+
+    def clear(self):
+        """Throw away all of the cached section values."""
+        self._cache = {}
+
+    def _updateCache(self, rivers):
+        """Calculate the section values for any new or changed units."""
+        fingerprints = {}
+        changed = []
+        for unit in rivers:
+            fp = unit.fingerprint()
+            fingerprints[id(unit)] = fp
+            cached = self._cache.get(id(unit))
+            if cached is None or not cached[0] is unit or cached[1] != fp:
+                changed.append(unit)
+
+        if changed:
+            table = SectionTable(self.dat_collection, columns=PROFILE_COLUMNS,
+                                 units=changed)
+            columns = [table.column(k) for k in PROFILE_COLUMNS]
+            loaded = set()
+            for unit_id, unit in enumerate(table.units):
+                start, end = table.offsets[unit_id], table.offsets[unit_id + 1]
+                values = sectionValues(*[c[start:end] for c in columns])
+                self._cache[id(unit)] = (unit, fingerprints[id(unit)], values)
+                loaded.add(id(unit))
+            for unit in changed:
+                if not id(unit) in loaded:
+                    self._cache[id(unit)] = (unit, fingerprints[id(unit)],
+                                             (None,) * len(SECTION_KEYS))
+
+        # Drop units that are no longer in the collection
+        for uid in list(self._cache.keys()):
+            if not uid in fingerprints:
+                del self._cache[uid]
+        self.last_updated = len(changed)
+
+
+def unitDistance(unit):
+    """Get the distance from a unit to the next one.
+
+    Return:
+        float - the 'distance' head_data value, or 0.0 if the unit doesn't
+            have one.
+    """
+    head_data = getattr(unit, 'head_data', None)
+    if not head_data or not 'distance' in head_data:
+        return 0.0
+    value = head_data['distance'].value
+    return float(value) if value not in (None, '') else 0.0
+
+
+def sectionValues(chainage, elevation, bankmarker, deactivation):
+    """Calculate the long section values of a single section.
+
+    Args:
+        chainage(list): section chainage values.
+        elevation(list): section elevation values.
+        bankmarker(list): section bank marker values.
+        deactivation(list): section deactivation values.
+
+    Return:
+        tuple - (bed, left_bank, right_bank, active_left, active_right). See
+            ReachProfile.
+    """
+    if not chainage:
+        return (None,) * len(SECTION_KEYS)
+
+    # The same active rows as sectionextents.sectionExtents()
+    left_deact, right_deact = deactivationIndices(deactivation)
+    first = left_deact if left_deact != -1 else 0
+    last = right_deact - 1 if right_deact != -1 else len(chainage) - 1
+    if last < first:
+        first, last = 0, len(chainage) - 1
+        active_left = active_right = None
+    else:
+        active_left, active_right = chainage[first], chainage[last]
+
+    bed = min(elevation[first:last + 1])
+    left_bank = elevation[first]
+    right_bank = elevation[last]
+    for i, b in enumerate(bankmarker):
+        if b == 'LEFT':
+            left_bank = elevation[i]
+        elif b == 'RIGHT':
+            right_bank = elevation[i]
+    return (bed, left_bank, right_bank, active_left, active_right)
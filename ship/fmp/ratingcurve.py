@@ -0,0 +1,354 @@
+"""
+
+ Summary:
+     Normal depth stage-discharge rating curves for river sections and
+     conduits.
+
+     Uses Manning's equation, Q = K * sqrt(S), where K is the conveyance of
+     the section at each stage. For river units K comes from
+     openchannel.sectionProperties() and the slope from the 'slope'
+     head_data. Rectangular, circular, full arch and sprung arch conduits are
+     converted to polygons; the flow area at each stage is found by clipping
+     them at the water level with the batch functions in tools.geometry and
+     the wetted perimeter from the length of each wall below the water level.
+     Conduits don't store a slope so one must be given.
+
+     The RatingBuilder caches the curves against the fingerprint of each
+     unit, so the ratings for a whole model can be regenerated cheaply after
+     a few units have been edited.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import bisect
+import math
+from collections import OrderedDict
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.hydraulictable import stageGrid
+from ship.utils.tools import geometry
+from ship.utils.tools import openchannel
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+CONDUIT_TYPES = ('conduit_rectangular', 'conduit_circular', 'conduit_fullarch',
+                 'conduit_sprungarch')
+"""The conduit UNIT_TYPE's that ratings can be generated for."""
+
+
+class RatingCurve(object):
+    """A normal depth stage-discharge relationship.
+
+    stages, flows, areas and conveyance are lists with a value for each
+    stage in ascending order.
+    """
+
+    def __init__(self, name, stages, flows, areas, conveyance, slope):
+        self.name = name
+        self.stages = stages
+        self.flows = flows
+        self.areas = areas
+        self.conveyance = conveyance
+        self.slope = slope
+
+    def __len__(self):
+        return len(self.stages)
+
+    def flowAt(self, stage):
+        """Get the flow at a stage by linear interpolation.
+
+        Return:
+            float - 0.0 below the first stage and the last flow above the
+                last stage.
+        """
+        if not self.stages or stage < self.stages[0]:
+            return 0.0
+        if stage >= self.stages[-1]:
+            return self.flows[-1]
+        i = bisect.bisect_right(self.stages, stage)
+        s0, s1 = self.stages[i - 1], self.stages[i]
+        f0, f1 = self.flows[i - 1], self.flows[i]
+        return f0 + (f1 - f0) * (stage - s0) / (s1 - s0)
+
+    def stageAt(self, flow):
+        """Get the stage at which a flow is first reached.
+
+        Return:
+            float - the interpolated stage or None if the flow is never
+                reached.
+        """
+        for i in range(1, len(self.flows)):
+            f0, f1 = self.flows[i - 1], self.flows[i]
+            if f0 <= flow <= f1 and f1 > f0:
+                s0, s1 = self.stages[i - 1], self.stages[i]
+                return s0 + (s1 - s0) * (flow - f0) / (f1 - f0)
+        if self.flows and flow == self.flows[0]:
+            return self.stages[0]
+        return None
+
+
+class RatingBuilder(object):
+    """Generates and caches RatingCurve's for the units in a model.
+
+    Example::
+
+        builder = RatingBuilder(stage_step=0.05, conduit_slope=0.002)
+        ratings = builder.ratings(dat)
+        q = ratings['RIV_01'].flowAt(12.5)
+    """
+
+    def __init__(self, **kwargs):
+        """Constructor.
+
+        Args:
+            **kwargs:
+                stage_step(float): spacing of the stages for river sections,
+                    which also include every section elevation. Default 0.1.
+                conduit_stages(int): number of equally spaced stages between
+                    the invert and the top of conduits. Default 50.
+                conduit_slope(float): slope used for conduits. Default 0.001.
+                segments(int): number of lines used for curved conduit
+                    walls. Default 32.
+                maxsize(int): largest number of curves cached. Default 4096.
+        """
+        self.stage_step = kwargs.get('stage_step', 0.1)
+        self.conduit_stages = kwargs.get('conduit_stages', 50)
+        self.conduit_slope = kwargs.get('conduit_slope', 0.001)
+        self.segments = kwargs.get('segments', 32)
+        self.maxsize = kwargs.get('maxsize', 4096)
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        """Remove all of the cached curves."""
+        self._cache.clear()
+
+    def canRate(self, unit):
+        """Check whether a rating can be generated for a unit."""
+        if unit.unit_type == 'river':
+            return True
+        if unit.unit_type in CONDUIT_TYPES:
+            return unit.head_data['roughness_type'].value == 'MANNING'
+        return False
+
+    def rating(self, unit):
+        """Get the rating curve for a unit.
+
+        Return:
+            RatingCurve - for the current state of the unit.
+
+        Raises:
+            ValueError: if a rating can't be generated for the unit. See
+                canRate().
+        """
+        if not self.canRate(unit):
+            raise ValueError('Cannot generate a rating for unit %s' % unit.name)
+        key = unit.fingerprint()
+        curve = self._cache.get(key)
+        if curve is not None:
+            self.hits += 1
+            self._cache.pop(key)
+            self._cache[key] = curve
+            return curve
+
+        self.misses += 1
+        if unit.unit_type == 'river':
+            curve = riverRating(unit, self.stage_step)
+        else:
+            curve = conduitRating(unit, self.conduit_slope, self.conduit_stages,
+                                  self.segments)
+        self._cache[key] = curve
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return curve
+
+    def ratings(self, dat_collection):
+        """Get the rating curves for all of the supported units in a model.
+
+        Return:
+            OrderedDict - {unit name: RatingCurve} in model order.
+        """
+        out = OrderedDict()
+        for unit in dat_collection.units:
+            if self.canRate(unit):
+                out[unit.name] = self.rating(unit)
+        return out
+
+
+def riverRating(unit, stage_step=0.1):
+    """Calculate the normal depth rating of a RiverUnit.
+
+    Args:
+        unit(RiverUnit): the section.
+        stage_step=0.1(float): see stageGrid().
+
+    Return:
+        RatingCurve
+    """
+    slope = unit.head_data['slope'].value
+    rows = unit.row_data['main']
+    if rows.has_dummy:
+        return RatingCurve(unit.name, [], [], [], [], slope)
+
+    x, y, n, p, rpl = [rows.dataObjectAsList(k) for k in (
+        rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL)]
+    stages = stageGrid(y, stage_step)
+    props = openchannel.sectionProperties(x, y, stages, n_vals=n, panel_vals=p,
+                                          rpl_vals=rpl)
+    root_s = math.sqrt(slope) if slope > 0 else 0.0
+    flows = [k * root_s for k in props['conveyance']]
+    return RatingCurve(unit.name, stages, flows, props['area'],
+                       props['conveyance'], slope)
+
+
+def conduitRating(unit, slope, stage_count=50, segments=32):
+    """Calculate the normal depth rating of a conduit.
+
+    Args:
+        unit(ConduitUnit): one of the CONDUIT_TYPES.
+        slope(float): the conduit slope.
+        stage_count=50(int): number of stages between invert and soffit.
+        segments=32(int): number of lines used for curved walls.
+
+    Return:
+        RatingCurve
+    """
+    xs, ys, rough = conduitOutline(unit, segments)
+    invert = unit.head_data['invert'].value
+    top = max(ys) if ys else 0.0
+    if not top > 0 or stage_count < 1:
+        return RatingCurve(unit.name, [], [], [], [], slope)
+
+    depths = [top * i / float(stage_count) for i in range(stage_count + 1)]
+    cx, cy, coffs = geometry.clipPolygonsAtLevel(
+        xs * len(depths), ys * len(depths),
+        [i * len(xs) for i in range(len(depths) + 1)], depths)
+    areas = geometry.polygonAreas(cx, cy, coffs)
+
+    conveyance = []
+    for d, area in zip(depths, areas):
+        wp, nxwp = _wettedPerimeter(xs, ys, rough, d)
+        if wp > 0 and nxwp > 0:
+            conveyance.append(((area**5.0 / wp**2.0)**(1.0 / 3.0)) * (wp / nxwp))
+        else:
+            conveyance.append(0.0)
+    root_s = math.sqrt(slope) if slope > 0 else 0.0
+    flows = [k * root_s for k in conveyance]
+    stages = [invert + d for d in depths]
+    return RatingCurve(unit.name, stages, flows, areas, conveyance, slope)
+
+
+def conduitOutline(unit, segments=32):
+    """Get the outline of a conduit as a polygon.
+
+    The polygon is relative to the invert, starting at the left of the
+    invert and going anticlockwise. Each edge has a roughness, taken from
+    the head_data roughness value for the part of the conduit that it's in.
+
+    Args:
+        unit(ConduitUnit): one of the CONDUIT_TYPES.
+        segments=32(int): number of lines used for curved walls.
+
+    Return:
+        tuple - (xs, ys, roughness) where roughness[i] is for the edge from
+            vertex i to vertex i + 1 (wrapping round).
+    """
+    head = unit.head_data
+    utype = unit.unit_type
+    if utype == 'conduit_rectangular':
+        w, h = head['width'].value, head['height'].value
+        xs = [0.0, w, w, 0.0]
+        ys = [0.0, 0.0, h, h]
+        rough = [head['roughness_invert'].value, head['roughness_walls'].value,
+                 head['roughness_soffit'].value, head['roughness_walls'].value]
+
+    elif utype == 'conduit_circular':
+        r = head['diameter'].value / 2.0
+        below, above = head['roughness_below_axis'].value, head['roughness_above_axis'].value
+        xs = []
+        ys = []
+        rough = []
+        for k in range(segments):
+            theta = -math.pi / 2 + 2 * math.pi * k / segments
+            xs.append(r + r * math.cos(theta))
+            ys.append(r + r * math.sin(theta))
+            mid = -math.pi / 2 + 2 * math.pi * (k + 0.5) / segments
+            rough.append(below if math.sin(mid) < 0 else above)
+
+    elif utype == 'conduit_fullarch':
+        w, h = head['width'].value, head['height'].value
+        xs, ys = _archPoints(w, 0.0, h, segments)
+        rough = [head['roughness_above_axis'].value] * (len(xs) - 1)
+        rough.append(head['roughness_below_axis'].value)
+
+    elif utype == 'conduit_sprungarch':
+        w = head['width'].value
+        spring = head['springing_height'].value
+        crown = head['crown_height'].value
+        arch_x, arch_y = _archPoints(w, spring, crown - spring, segments)
+        xs = [0.0, w] + arch_x
+        ys = [0.0, 0.0] + arch_y
+        rough = [head['roughness_invert'].value, head['roughness_walls'].value]
+        rough.extend([head['roughness_soffit'].value] * segments)
+        rough.append(head['roughness_walls'].value)
+
+    else:
+        raise ValueError('Unsupported conduit type: %s' % utype)
+    return xs, ys, rough
+
+
+def _archPoints(width, base, rise, segments):
+    """Points on a semi-ellipse from (width, base) round to (0, base)."""
+    xs = []
+    ys = []
+    half = width / 2.0
+    for k in range(segments + 1):
+        theta = math.pi * k / float(segments)
+        xs.append(half + half * math.cos(theta))
+        ys.append(base + rise * math.sin(theta))
+    return xs, ys
+
+
+def _wettedPerimeter(xs, ys, rough, depth):
+    """Get the wetted perimeter and sum of n * wetted perimeter at a depth."""
+    wp = 0.0
+    nxwp = 0.0
+    count = len(xs)
+    for i in range(count):
+        j = (i + 1) % count
+        x0, y0, x1, y1 = xs[i], ys[i], xs[j], ys[j]
+        if y0 > depth and y1 > depth:
+            continue
+        if y0 > depth or y1 > depth:
+            # Only part of the edge is below the water
+            f = (depth - y0) / (y1 - y0)
+            xm = x0 + f * (x1 - x0)
+            if y0 > depth:
+                x0, y0 = xm, depth
+            else:
+                x1, y1 = xm, depth
+        length = math.hypot(x1 - x0, y1 - y0)
+        wp += length
+        nxwp += rough[i] * length
+    return wp, nxwp
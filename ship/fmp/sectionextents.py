@@ -0,0 +1,182 @@
+"""
+
+ Summary:
+     Section widths and deactivation extents for all river units.
+
+     SectionExtents pulls the chainage, deactivation and bank marker columns
+     of every river unit out of a DatCollection in one pass with a
+     SectionTable and works out the total width, active width, bank to bank
+     width and the deactivation and bank marker indices of every section.
+     The results are held as columns with a value for each unit.
+
+     sectionExtents() does the same for a single section and is what
+     RiverUnit.width() uses.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.sectiontable import SectionTable
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+EXTENT_COLUMNS = (rdt.CHAINAGE, rdt.DEACTIVATION, rdt.BANKMARKER)
+"""The ROW_DATA_TYPES needed to calculate the section extents."""
+
+EXTENT_KEYS = ('total_width', 'active_width', 'bank_width', 'left_deactivation',
+               'right_deactivation', 'left_bank', 'right_bank')
+"""The values returned by sectionExtents(), in order."""
+
+
+class SectionExtents(object):
+    """Widths and extents of every river section in a DatCollection.
+
+    Each of EXTENT_KEYS is an attribute holding a list with a value for each
+    unit in self.units:
+
+        total_width: distance from the first to the last chainage.
+        active_width: width between the deactivation markers. The same as
+            RiverUnit.width(active_only=True); None where that would fail.
+        bank_width: distance between the LEFT and RIGHT bank markers, or the
+            ends of the section if there are none.
+        left_deactivation / right_deactivation: row index of the LEFT and
+            RIGHT deactivation markers, or -1 if not found.
+        left_bank / right_bank: row index of the LEFT and RIGHT bank markers,
+            or -1 if not found.
+
+    Sections that only have a dummy row have a width of 0.0.
+
+    Example::
+
+        extents = dat.sectionExtents()
+        for unit, width in zip(extents.units, extents.active_width):
+            print(unit.name, width)
+    """
+
+    def __init__(self, dat_collection, **kwargs):
+        """Constructor.
+
+        Args:
+            dat_collection(DatCollection): the collection to load from.
+            **kwargs:
+                unit_types(list): AUnit.UNIT_TYPE's to include. Default is
+                    ['river'].
+        """
+        self.dat_collection = dat_collection
+        self.unit_types = kwargs.get('unit_types', ['river'])
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.units)
+
+    def rebuild(self):
+        """Load the extents of the units in the DatCollection."""
+        table = SectionTable(self.dat_collection, columns=EXTENT_COLUMNS,
+                             unit_types=self.unit_types)
+        self.units = table.units
+        for k in EXTENT_KEYS:
+            setattr(self, k, [])
+
+        chainage, deactivation, bankmarker = [table.column(k) for k in EXTENT_COLUMNS]
+        for unit_id in range(len(table.units)):
+            start, end = table.offsets[unit_id], table.offsets[unit_id + 1]
+            if start == end:
+                values = (0.0, 0.0, 0.0, -1, -1, -1, -1)
+            else:
+                values = sectionExtents(chainage[start:end], deactivation[start:end],
+                                        bankmarker[start:end])
+            for k, v in zip(EXTENT_KEYS, values):
+                getattr(self, k).append(v)
+
+    def unitExtents(self, unit):
+        """Get all of the extents for one unit.
+
+        Return:
+            dict - {key: value} for each of EXTENT_KEYS.
+
+        Raises:
+            ValueError: if the unit is not in self.units.
+        """
+        for i, u in enumerate(self.units):
+            if u is unit:
+                return dict((k, getattr(self, k)[i]) for k in EXTENT_KEYS)
+        raise ValueError('Unit %s is not in the extents' % unit.name)
+
+
+def deactivationIndices(deactivation):
+    """Find the LEFT and RIGHT deactivation markers in a section.
+
+    Stops searching as soon as both have been found.
+
+    Args:
+        deactivation(list): the DEACTIVATION values.
+
+    Return:
+        tuple - (left index, right index), -1 where not found.
+    """
+    left_deact = -1
+    right_deact = -1
+    for i, val in enumerate(deactivation):
+        if val == 'LEFT':
+            left_deact = i
+        if val == 'RIGHT':
+            right_deact = i
+        if left_deact != -1 and right_deact != -1:
+            break
+    return left_deact, right_deact
+
+
+def sectionExtents(chainage, deactivation, bankmarker=None):
+    """Calculate the widths and extents of a single section.
+
+    The active width runs from the LEFT deactivation marker up to the row
+    before the RIGHT deactivation marker, as RiverUnit.width() always has.
+
+    Args:
+        chainage(list): the CHAINAGE values; must not be empty.
+        deactivation(list): the DEACTIVATION values.
+        bankmarker=None(list): the BANKMARKER values.
+
+    Return:
+        tuple - values for each of EXTENT_KEYS. See SectionExtents.
+    """
+    total_width = abs(chainage[-1] - chainage[0])
+
+    left_deact, right_deact = deactivationIndices(deactivation)
+    first = left_deact if left_deact != -1 else 0
+    last = right_deact - 1 if right_deact != -1 else len(chainage) - 1
+    if last < first:
+        active_width = None
+    else:
+        active_width = abs(chainage[last] - chainage[first])
+
+    left_bank = -1
+    right_bank = -1
+    if bankmarker is not None:
+        for i, val in enumerate(bankmarker):
+            if val == 'LEFT' and left_bank == -1:
+                left_bank = i
+            elif val == 'RIGHT':
+                right_bank = i
+    bank_width = abs(chainage[right_bank if right_bank != -1 else -1] -
+                     chainage[left_bank if left_bank != -1 else 0])
+
+    return (total_width, active_width, bank_width, left_deact, right_deact,
+            left_bank, right_bank)
@@ -0,0 +1,278 @@
+"""
+
+ Summary:
+     Spatial index over the survey coordinates of the sections in a
+     DatCollection.
+
+     Builds a GridIndex from the EASTING and NORTHING row data of all units
+     that have them (i.e. RiverUnit's) so that questions like "which sections
+     lie within this polygon" or "what is the nearest section to this point"
+     can be answered without iterating every unit and row in the model.
+
+     The index keeps track of the data objects it was built from and can be
+     refreshed incrementally; only units that have been added, removed or had
+     their coordinates changed since the last refresh will be re-indexed.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.utils.tools.spatialindex import GridIndex
+from ship.utils.tools import geometry
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class SectionIndex(object):
+    """Spatial index of the section coordinates in a DatCollection.
+
+    Each indexed point is a row in the 'main' RowDataCollection of a unit
+    that has EASTING and NORTHING values set. Rows where both the easting
+    and northing are zero (the default when no coordinates are given in the
+    .dat file) are not indexed.
+
+    Point queries return (unit, row_index, easting, northing) tuples. Unit
+    queries return the units in the order that they appear in the
+    DatCollection.
+
+    By default the index will call refresh() before every query, which only
+    checks whether the coordinate data objects of each unit have changed, so
+    the results always reflect the current state of the DatCollection. Set
+    auto_refresh to False to manage this manually.
+
+    Example::
+
+        index = SectionIndex(dat, cell_size=100.0)
+        nearest = index.nearestUnits(451000.0, 226500.0, k=3)
+        inside = index.unitsInPolygon(polygon_xy)
+    """
+
+    def __init__(self, dat_collection, **kwargs):
+        """Constructor.
+
+        Args:
+            dat_collection(DatCollection): the collection to index.
+            **kwargs:
+                cell_size(float): the size of the grid cells. Default is 50.0.
+                auto_refresh(bool): call refresh() before each query. Default
+                    is True.
+                unit_types(list): AUnit.UNIT_TYPE's to include. If not given
+                    any unit with EASTING and NORTHING row data is included.
+        """
+        self.dat_collection = dat_collection
+        self.auto_refresh = kwargs.get('auto_refresh', True)
+        self.unit_types = kwargs.get('unit_types', None)
+        self._grid = GridIndex(kwargs.get('cell_size', 50.0))
+        self._tracked = {}
+        self._order = {}
+        self.refresh()
+
+    def __len__(self):
+        """Return the number of points in the index."""
+        return len(self._grid)
+
+    def refresh(self):
+        """Bring the index up to date with the DatCollection.
+
+        Units that have been added to the collection are indexed, units that
+        have been removed are dropped and units whose EASTING or NORTHING data
+        has changed since they were indexed are re-indexed. Everything else
+        is left alone.
+
+        Return:
+            int - the number of units that were (re)indexed or removed.
+        """
+        changed = 0
+        order = {}
+        for pos, unit in enumerate(self.dat_collection.units):
+            objs = self._coordinateObjects(unit)
+            if objs is None:
+                continue
+            uid = id(unit)
+            order[uid] = pos
+            if self._isCurrent(uid, unit, objs):
+                continue
+
+            self._grid.remove(uid)
+            self._indexUnit(uid, unit, objs)
+            changed += 1
+
+        for uid in list(self._tracked.keys()):
+            if not uid in order:
+                self._grid.remove(uid)
+                del self._tracked[uid]
+                changed += 1
+
+        self._order = order
+        return changed
+
+    def rebuild(self):
+        """Throw away the current index and build it again from scratch."""
+        self._grid.clear()
+        self._tracked = {}
+        self._order = {}
+        self.refresh()
+
+    def pointsInBox(self, xmin, ymin, xmax, ymax):
+        """Get all section points inside a bounding box.
+
+        Return:
+            list - of (unit, row_index, easting, northing) tuples.
+        """
+        self._checkRefresh()
+        return self._points(self._grid.box(xmin, ymin, xmax, ymax))
+
+    def unitsInBox(self, xmin, ymin, xmax, ymax):
+        """Get all units with at least one point inside a bounding box.
+
+        Return:
+            list - of AUnit's.
+        """
+        self._checkRefresh()
+        return self._units(self._grid.box(xmin, ymin, xmax, ymax))
+
+    def pointsInRadius(self, x, y, radius):
+        """Get all section points within a distance of a coordinate.
+
+        Return:
+            list - of (unit, row_index, easting, northing) tuples.
+        """
+        self._checkRefresh()
+        return self._points(self._grid.radius(x, y, radius))
+
+    def unitsInRadius(self, x, y, radius):
+        """Get all units with at least one point within a distance of a point.
+
+        Return:
+            list - of AUnit's.
+        """
+        self._checkRefresh()
+        return self._units(self._grid.radius(x, y, radius))
+
+    def pointsInPolygon(self, xy_vals):
+        """Get all section points inside a polygon.
+
+        Args:
+            xy_vals(list): containing a tuple in each element with the x and
+                y values of the polygon vertices.
+
+        Return:
+            list - of (unit, row_index, easting, northing) tuples.
+        """
+        self._checkRefresh()
+        return self._points(self._polygonEntries(xy_vals))
+
+    def unitsInPolygon(self, xy_vals):
+        """Get all units with at least one point inside a polygon.
+
+        Args:
+            xy_vals(list): containing a tuple in each element with the x and
+                y values of the polygon vertices.
+
+        Return:
+            list - of AUnit's.
+        """
+        self._checkRefresh()
+        return self._units(self._polygonEntries(xy_vals))
+
+    def nearestPoints(self, x, y, k=1):
+        """Get the k section points closest to a coordinate.
+
+        Return:
+            list - of (unit, row_index, easting, northing, distance) tuples
+                with the closest first.
+        """
+        self._checkRefresh()
+        out = []
+        for d, e in self._grid.nearest(x, y, k):
+            out.append((self._tracked[e[0]][0], e[3], e[1], e[2], d))
+        return out
+
+    def nearestUnits(self, x, y, k=1):
+        """Get the k units closest to a coordinate.
+
+        The distance to a unit is the distance to its closest point.
+
+        Return:
+            list - of (unit, distance) tuples with the closest first.
+        """
+        self._checkRefresh()
+        return [(self._tracked[e[0]][0], d)
+                for d, e in self._grid.nearest(x, y, k, distinct=True)]
+
+    def _checkRefresh(self):
+        if self.auto_refresh:
+            self.refresh()
+
+    def _coordinateObjects(self, unit):
+        """Get the EASTING and NORTHING data objects of a unit.
+
+        Return:
+            tuple - (easting, northing) ADataRowObject's or None if the unit
+                should not be indexed.
+        """
+        if self.unit_types is not None and not unit.unit_type in self.unit_types:
+            return None
+        try:
+            rows = unit.row_data['main']
+            return (rows.dataObject(rdt.EASTING), rows.dataObject(rdt.NORTHING))
+        except (AttributeError, KeyError):
+            return None
+
+    def _isCurrent(self, uid, unit, objs):
+        """Check whether the indexed points for a unit are up to date."""
+        tracked = self._tracked.get(uid)
+        if tracked is None or not tracked[0] is unit:
+            return False
+        east, north = objs
+        return (tracked[1] is east and tracked[2] == east.change_count and
+                tracked[3] is north and tracked[4] == north.change_count)
+
+    def _indexUnit(self, uid, unit, objs):
+        """Add the points of a unit to the grid and start tracking it."""
+        east, north = objs
+        if unit.row_data['main'].has_dummy:
+            nrows = 0
+        else:
+            nrows = min(len(east), len(north))
+        for i in range(nrows):
+            e, n = east[i], north[i]
+            if e is None or n is None or (e == 0 and n == 0):
+                continue
+            self._grid.insert(uid, e, n, i)
+        self._tracked[uid] = (unit, east, east.change_count,
+                              north, north.change_count)
+
+    def _polygonEntries(self, xy_vals):
+        """Get the grid entries that fall inside a polygon."""
+        xs = [p[0] for p in xy_vals]
+        ys = [p[1] for p in xy_vals]
+        candidates = self._grid.box(min(xs), min(ys), max(xs), max(ys))
+        return [e for e in candidates
+                if geometry.pointInPolygon(e[1], e[2], xy_vals)]
+
+    def _points(self, entries):
+        """Convert grid entries to point tuples sorted by unit and row."""
+        entries = sorted(entries, key=lambda e: (self._order[e[0]], e[3]))
+        return [(self._tracked[e[0]][0], e[3], e[1], e[2]) for e in entries]
+
+    def _units(self, entries):
+        """Convert grid entries to a list of unique units in model order."""
+        uids = sorted(set(e[0] for e in entries), key=lambda u: self._order[u])
+        return [self._tracked[u][0] for u in uids]
@@ -0,0 +1,338 @@
+"""
+
+ Summary:
+     Generate interpolated river sections between two RiverUnit's.
+
+     Both sections are resampled once onto a common normalised chainage. Each
+     section's chainage is scaled to run from 0 to 1 between its end points,
+     or piecewise between its bank markers when both sections have the same
+     ones. The elevation, roughness, RPL and coordinates of both sections are
+     then found at every point on the common grid in a single pass. Each
+     interpolated section is then just a linear blend of the two resampled
+     columns, so a whole reach of interpolates can be created in one call.
+
+     The results are ordinary RiverUnit's that can be added to a
+     DatCollection.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.datunits.riverunit import RiverUnit
+from ship.fmp import fmpunitfactory as iuf
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+BANK_ANCHORS = ('LEFT', 'BED', 'RIGHT')
+"""Bank marker values that are used to line up the two sections."""
+
+
+class ResampledSections(object):
+    """Two sections resampled onto a common normalised chainage.
+
+    Each column is a pair of lists (upstream, downstream) with a value for
+    every point on the grid. The normalised chainage s runs from 0 to the
+    number of anchor segments; point i lies between anchor int(s[i]) and the
+    next one.
+    """
+
+    def __init__(self, us_unit, ds_unit, use_bank_markers=True):
+        """Constructor.
+
+        Args:
+            us_unit(RiverUnit): the upstream section.
+            ds_unit(RiverUnit): the downstream section.
+            use_bank_markers=True(bool): line up the sections on their bank
+                markers when they both have the same LEFT, BED and RIGHT
+                markers.
+
+        Raises:
+            ValueError: if either section has less than two rows.
+        """
+        us = _sectionColumns(us_unit)
+        ds = _sectionColumns(ds_unit)
+        if len(us[rdt.CHAINAGE]) < 2 or len(ds[rdt.CHAINAGE]) < 2:
+            raise ValueError('Both sections must have at least two rows')
+
+        us_anchors = _anchorIndices(us)
+        ds_anchors = _anchorIndices(ds)
+        if not use_bank_markers or not us_anchors[1] == ds_anchors[1]:
+            us_anchors = ([0, len(us[rdt.CHAINAGE]) - 1], [])
+            ds_anchors = ([0, len(ds[rdt.CHAINAGE]) - 1], [])
+        self.anchor_markers = us_anchors[1]
+        self.anchor_chainage = (
+            [us[rdt.CHAINAGE][i] for i in us_anchors[0]],
+            [ds[rdt.CHAINAGE][i] for i in ds_anchors[0]],
+        )
+
+        us_s = _normalise(us[rdt.CHAINAGE], us_anchors[0])
+        ds_s = _normalise(ds[rdt.CHAINAGE], ds_anchors[0])
+        self.s, self.rows = _mergeGrid(us_s, ds_s)
+
+        self.has_coords = _hasCoords(us) and _hasCoords(ds)
+        self.columns = {}
+        linear = [rdt.ELEVATION]
+        if self.has_coords:
+            linear.extend([rdt.EASTING, rdt.NORTHING])
+        for key in linear:
+            self.columns[key] = (
+                _resample(us_s, us[key], self.s, [r[0] for r in self.rows], False),
+                _resample(ds_s, ds[key], self.s, [r[1] for r in self.rows], False),
+            )
+        for key in (rdt.ROUGHNESS, rdt.RPL):
+            self.columns[key] = (
+                _resample(us_s, us[key], self.s, [r[0] for r in self.rows], True),
+                _resample(ds_s, ds[key], self.s, [r[1] for r in self.rows], True),
+            )
+        self._sections = (us, ds)
+
+    def blend(self, t):
+        """Get the rows of a section part way between the two sections.
+
+        Args:
+            t(float): 0.0 is the upstream section and 1.0 the downstream.
+
+        Return:
+            list - of row dicts suitable for FmpUnitFactory.createUnit().
+        """
+        nearest = 0 if t <= 0.5 else 1
+        anchors = [a + t * (b - a) for a, b in zip(*self.anchor_chainage)]
+        cols = dict((k, [a + t * (b - a) for a, b in zip(v[0], v[1])])
+                    for k, v in self.columns.items())
+        source = self._sections[nearest]
+
+        rows = []
+        anchor_row = {}
+        for i, s in enumerate(self.s):
+            k = min(int(s), len(anchors) - 2)
+            f = s - k
+            row = {
+                rdt.CHAINAGE: anchors[k] + f * (anchors[k + 1] - anchors[k]),
+                rdt.ELEVATION: cols[rdt.ELEVATION][i],
+                rdt.ROUGHNESS: cols[rdt.ROUGHNESS][i],
+                rdt.RPL: cols[rdt.RPL][i],
+            }
+            if self.has_coords:
+                row[rdt.EASTING] = cols[rdt.EASTING][i]
+                row[rdt.NORTHING] = cols[rdt.NORTHING][i]
+
+            # Markers come from the nearest section if it has a point here
+            src = self.rows[i][nearest]
+            if src is not None:
+                row[rdt.PANEL_MARKER] = source[rdt.PANEL_MARKER][src]
+                row[rdt.DEACTIVATION] = source[rdt.DEACTIVATION][src]
+            if f == 0 and not k in anchor_row:
+                anchor_row[k] = i
+            rows.append(row)
+
+        for k, marker in enumerate(self.anchor_markers):
+            rows[anchor_row[k + 1]][rdt.BANKMARKER] = marker
+        return rows
+
+
+def interpolateSections(us_unit, ds_unit, distances, **kwargs):
+    """Create interpolated RiverUnit's between two sections.
+
+    The distance head_data of each new unit is set to the distance to the
+    next one, with the last set to the distance to ds_unit. The distance of
+    us_unit is not changed; it will need setting to distances[0] when the
+    new units are added to a DatCollection.
+
+    Example::
+
+        new_units = interpolateSections(us, ds, [25.0, 50.0, 75.0])
+        index = dat.index(us)
+        for i, unit in enumerate(new_units):
+            dat.addUnit(unit, index + 1 + i)
+        us.head_data['distance'].value = 25.0
+
+    Args:
+        us_unit(RiverUnit): the upstream section.
+        ds_unit(RiverUnit): the downstream section.
+        distances(list): distances downstream of us_unit to create sections.
+        **kwargs:
+            reach_length(float): distance between us_unit and ds_unit.
+                Default is the distance head_data of us_unit.
+            names(list): names for the new units. Default is the name of
+                us_unit followed by '_1', '_2', etc.
+            use_bank_markers(bool): see ResampledSections. Default is True.
+
+    Return:
+        list - of RiverUnit's in downstream order.
+
+    Raises:
+        ValueError: if the reach length is not greater than zero, any of the
+            distances are outside of the reach, or the sections can't be
+            resampled.
+    """
+    reach_length = kwargs.get('reach_length', us_unit.head_data['distance'].value)
+    names = kwargs.get('names', None)
+    if not reach_length > 0:
+        raise ValueError('Reach length must be greater than zero')
+    distances = sorted(distances)
+    if distances and (distances[0] <= 0 or distances[-1] >= reach_length):
+        raise ValueError('Distances must be between 0 and the reach length')
+    if names is None:
+        names = ['%s_%d' % (us_unit.name, i + 1) for i in range(len(distances))]
+
+    resampled = ResampledSections(
+        us_unit, ds_unit, kwargs.get('use_bank_markers', True))
+    head = dict((k, us_unit.head_data[k].value) for k in ('slope', 'density'))
+
+    units = []
+    for i, d in enumerate(distances):
+        if i < len(distances) - 1:
+            next_distance = distances[i + 1] - d
+        else:
+            next_distance = reach_length - d
+        head_data = dict(head)
+        head_data['distance'] = next_distance
+        unit = iuf.FmpUnitFactory.createUnit(
+            RiverUnit.UNIT_TYPE, name=names[i], head_data=head_data,
+            row_data={'main': resampled.blend(d / float(reach_length))})
+        unit.reach_number = us_unit.reach_number
+        units.append(unit)
+    return units
+
+
+def _sectionColumns(unit):
+    """Get the row data of a RiverUnit as a dict of lists."""
+    rows = unit.row_data['main']
+    keys = (rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL,
+            rdt.BANKMARKER, rdt.EASTING, rdt.NORTHING, rdt.DEACTIVATION)
+    if rows.has_dummy:
+        return dict((k, []) for k in keys)
+    return dict((k, rows.dataObjectAsList(k)) for k in keys)
+
+
+def _anchorIndices(section):
+    """Find the rows used to line up a section.
+
+    Return:
+        tuple - (list of row indices including the end points,
+            list of the bank markers at the inner indices).
+    """
+    indices = [0]
+    markers = []
+    last = len(section[rdt.CHAINAGE]) - 1
+    for i, m in enumerate(section[rdt.BANKMARKER]):
+        if m in BANK_ANCHORS and 0 < i < last and not m in markers:
+            if section[rdt.CHAINAGE][i] > section[rdt.CHAINAGE][indices[-1]]:
+                indices.append(i)
+                markers.append(m)
+    indices.append(last)
+    return indices, markers
+
+
+def _normalise(chainage, anchors):
+    """Convert chainage to a position relative to the anchors.
+
+    Points between anchor k and k + 1 are given a value between k and k + 1.
+    """
+    out = []
+    k = 0
+    for i, x in enumerate(chainage):
+        while k < len(anchors) - 2 and i > anchors[k + 1]:
+            k += 1
+        a, b = chainage[anchors[k]], chainage[anchors[k + 1]]
+        if i == anchors[k + 1]:
+            out.append(float(k + 1))
+        elif b > a:
+            out.append(k + min(max((x - a) / (b - a), 0.0), 1.0))
+        else:
+            out.append(float(k))
+    return out
+
+
+def _mergeGrid(us_s, ds_s):
+    """Merge the normalised chainage of two sections into a common grid.
+
+    Points with the same position in both sections are paired up in order,
+    so that vertical walls in both sections stay as vertical walls.
+
+    Return:
+        tuple - (list of positions, list of (us_index, ds_index) where the
+            index is None if the section has no point at that position).
+    """
+    s_out = []
+    rows = []
+    i = j = 0
+    while i < len(us_s) or j < len(ds_s):
+        si = us_s[i] if i < len(us_s) else None
+        sj = ds_s[j] if j < len(ds_s) else None
+        if sj is None or (si is not None and si < sj):
+            s = si
+        else:
+            s = sj
+        us_group = []
+        while i < len(us_s) and us_s[i] == s:
+            us_group.append(i)
+            i += 1
+        ds_group = []
+        while j < len(ds_s) and ds_s[j] == s:
+            ds_group.append(j)
+            j += 1
+        for k in range(max(len(us_group), len(ds_group))):
+            s_out.append(s)
+            rows.append((us_group[min(k, len(us_group) - 1)] if us_group else None,
+                         ds_group[min(k, len(ds_group) - 1)] if ds_group else None))
+    return s_out, rows
+
+
+def _resample(section_s, values, grid_s, grid_rows, step):
+    """Get the values of a section at every position on the grid.
+
+    Args:
+        section_s(list): normalised chainage of the section points.
+        values(list): the section values.
+        grid_s(list): the common grid positions.
+        grid_rows(list): index of the section point at each grid position,
+            or None if the section doesn't have one there.
+        step(bool): if True use the value of the previous point rather than
+            interpolating (for values that apply to a segment, e.g. roughness).
+
+    Return:
+        list - of values on the grid.
+    """
+    out = []
+    j = 0
+    last = len(section_s) - 1
+    for s, row in zip(grid_s, grid_rows):
+        if row is not None:
+            out.append(values[row])
+            j = row
+            continue
+        while j < last and section_s[j + 1] < s:
+            j += 1
+        if step:
+            out.append(values[j])
+        else:
+            a, b = section_s[j], section_s[j + 1]
+            f = (s - a) / (b - a)
+            out.append(values[j] + f * (values[j + 1] - values[j]))
+    return out
+
+
+def _hasCoords(section):
+    """Check whether every point of a section has coordinates."""
+    for e, n in zip(section[rdt.EASTING], section[rdt.NORTHING]):
+        if e is None or n is None or (e == 0 and n == 0):
+            return False
+    return True
@@ -0,0 +1,361 @@
+"""
+
+ Summary:
+     Reduce the number of points in river sections.
+
+     Dense sections, e.g. those taken from LiDAR, can contain far more points
+     than are needed to describe the shape of the channel. Points are removed
+     with either the Douglas-Peucker or Visvalingam-Whyatt algorithm, while
+     always keeping the end points, the lowest point, any point with a bank,
+     panel, deactivation or special marker and any point where the roughness
+     or RPL changes.
+
+     The area and conveyance curves of the simplified section are checked
+     against the original. If the error is too large the tolerance is reduced
+     and the section is simplified again.
+
+     simplifySections() pulls the rows of every river unit out of a
+     DatCollection in one pass with a SectionTable and writes the results
+     back.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import heapq
+import math
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.sectiontable import SectionTable
+from ship.utils.tools import openchannel
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+DOUGLAS_PEUCKER = 'dp'
+VISVALINGAM = 'vw'
+
+SIMPLIFY_COLUMNS = (
+    rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL,
+    rdt.BANKMARKER, rdt.DEACTIVATION, rdt.SPECIAL
+)
+"""The ROW_DATA_TYPES used to decide which points can be removed."""
+
+
+class SimplifyResult(object):
+    """The outcome of simplifying a single section.
+
+    kept is the list of row indices that were kept. area_error and
+    conveyance_error are the largest relative differences from the original
+    section (see sectionErrors()). tolerance is the tolerance that was
+    finally used, which may be smaller than the one asked for.
+    """
+
+    def __init__(self, unit, kept, original_count, area_error, conveyance_error,
+                 tolerance):
+        self.unit = unit
+        self.kept = kept
+        self.original_count = original_count
+        self.area_error = area_error
+        self.conveyance_error = conveyance_error
+        self.tolerance = tolerance
+
+    @property
+    def removed_count(self):
+        return self.original_count - len(self.kept)
+
+    def __repr__(self):
+        name = self.unit.name if self.unit is not None else None
+        return 'SimplifyResult(%r, %d -> %d)' % (name, self.original_count,
+                                                 len(self.kept))
+
+
+def simplifySections(dat_collection, tolerance, **kwargs):
+    """Simplify all of the river sections in a DatCollection.
+
+    Args:
+        dat_collection(DatCollection): the model to update.
+        tolerance(float): the simplification tolerance. For Douglas-Peucker
+            this is the largest distance (m) from a removed point to the
+            simplified line. For Visvalingam it is the smallest triangle area
+            (m2) that is kept.
+        **kwargs:
+            method(str): DOUGLAS_PEUCKER or VISVALINGAM. Default is
+                DOUGLAS_PEUCKER.
+            max_area_error(float): largest relative area error allowed.
+                Default is 0.01.
+            max_conveyance_error(float): largest relative conveyance error
+                allowed. Default is 0.02.
+            max_attempts(int): the number of times the tolerance will be
+                halved before giving up and leaving a section unchanged.
+                Default is 5.
+            dry_run(bool): if True the units are not changed. Default is
+                False.
+            unit_types(list): AUnit.UNIT_TYPE's to simplify. Default is
+                ['river'].
+
+    Return:
+        list - of SimplifyResult's, one for each unit.
+    """
+    dry_run = kwargs.pop('dry_run', False)
+    unit_types = kwargs.pop('unit_types', ['river'])
+    table = SectionTable(dat_collection, columns=SIMPLIFY_COLUMNS,
+                         unit_types=unit_types)
+    columns = [table.column(k) for k in SIMPLIFY_COLUMNS]
+
+    results = []
+    for unit_id, unit in enumerate(table.units):
+        start, end = table.offsets[unit_id], table.offsets[unit_id + 1]
+        section = dict((k, c[start:end]) for k, c in zip(SIMPLIFY_COLUMNS, columns))
+        result = simplifySection(section, tolerance, **kwargs)
+        result.unit = unit
+        results.append(result)
+        if not dry_run and result.removed_count > 0:
+            _keepRows(unit, result.kept)
+    return results
+
+
+def simplifySection(section, tolerance, **kwargs):
+    """Simplify a single section.
+
+    Args:
+        section(dict): {ROW_DATA_TYPE: list of values}. Must contain CHAINAGE
+            and ELEVATION. Any of the other SIMPLIFY_COLUMNS that are given
+            will be used to find points that must be kept.
+        tolerance(float): see simplifySections().
+        **kwargs: see simplifySections().
+
+    Return:
+        SimplifyResult - with unit set to None.
+    """
+    method = kwargs.get('method', DOUGLAS_PEUCKER)
+    max_area_error = kwargs.get('max_area_error', 0.01)
+    max_conveyance_error = kwargs.get('max_conveyance_error', 0.02)
+    max_attempts = kwargs.get('max_attempts', 5)
+    if not method in (DOUGLAS_PEUCKER, VISVALINGAM):
+        raise ValueError('Unknown simplification method: %s' % method)
+
+    x = section[rdt.CHAINAGE]
+    y = section[rdt.ELEVATION]
+    count = len(x)
+    everything = list(range(count))
+    if count < 3:
+        return SimplifyResult(None, everything, count, 0.0, 0.0, tolerance)
+
+    keep = requiredPoints(section)
+    for attempt in range(max_attempts + 1):
+        if method == DOUGLAS_PEUCKER:
+            kept = douglasPeucker(x, y, tolerance, keep)
+        else:
+            kept = visvalingam(x, y, tolerance, keep)
+        if len(kept) == count:
+            return SimplifyResult(None, kept, count, 0.0, 0.0, tolerance)
+
+        area_error, k_error = sectionErrors(section, kept)
+        if area_error <= max_area_error and k_error <= max_conveyance_error:
+            return SimplifyResult(None, kept, count, area_error, k_error, tolerance)
+        tolerance /= 2.0
+
+    return SimplifyResult(None, everything, count, 0.0, 0.0, tolerance)
+
+
+def requiredPoints(section):
+    """Find the points in a section that must not be removed.
+
+    Args:
+        section(dict): see simplifySection().
+
+    Return:
+        list - of bools, True where a point must be kept.
+    """
+    y = section[rdt.ELEVATION]
+    count = len(y)
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    keep[y.index(min(y))] = True
+
+    for i, v in enumerate(section.get(rdt.PANEL_MARKER, [])):
+        if v:
+            keep[i] = True
+    for key in (rdt.BANKMARKER, rdt.DEACTIVATION):
+        for i, v in enumerate(section.get(key, [])):
+            if v in ('LEFT', 'RIGHT', 'BED'):
+                keep[i] = True
+    for i, v in enumerate(section.get(rdt.SPECIAL, [])):
+        if v is not None and not v.strip() in ('', '~'):
+            keep[i] = True
+
+    # Roughness and RPL apply from a point to the next one
+    for key in (rdt.ROUGHNESS, rdt.RPL):
+        vals = section.get(key, [])
+        for i in range(1, len(vals)):
+            if vals[i] != vals[i - 1]:
+                keep[i] = True
+    return keep
+
+
+def douglasPeucker(x_vals, y_vals, tolerance, keep=None):
+    """Simplify a line with the Douglas-Peucker algorithm.
+
+    Args:
+        x_vals(list): chainage values.
+        y_vals(list): elevation values.
+        tolerance(float): the largest distance from a removed point to the
+            simplified line.
+        keep=None(list): bools, True for points that must be kept.
+
+    Return:
+        list - of the indices of the points to keep in ascending order.
+    """
+    count = len(x_vals)
+    if keep is None:
+        keep = [False] * count
+    kept = list(keep)
+    kept[0] = kept[-1] = True
+
+    # Simplify each run between required points separately
+    anchors = [i for i in range(count) if kept[i]]
+    stack = list(zip(anchors[:-1], anchors[1:]))
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        max_dist = -1.0
+        max_i = None
+        for i in range(a + 1, b):
+            d = _segmentDistance(x_vals[i], y_vals[i], x_vals[a], y_vals[a],
+                                 x_vals[b], y_vals[b])
+            if d > max_dist:
+                max_dist = d
+                max_i = i
+        if max_dist > tolerance:
+            kept[max_i] = True
+            stack.append((a, max_i))
+            stack.append((max_i, b))
+    return [i for i in range(count) if kept[i]]
+
+
+def visvalingam(x_vals, y_vals, tolerance, keep=None):
+    """Simplify a line with the Visvalingam-Whyatt algorithm.
+
+    Points are removed smallest effective area first until all of the
+    remaining points have an area of at least tolerance.
+
+    Args:
+        x_vals(list): chainage values.
+        y_vals(list): elevation values.
+        tolerance(float): the smallest triangle area that is kept.
+        keep=None(list): bools, True for points that must be kept.
+
+    Return:
+        list - of the indices of the points to keep in ascending order.
+    """
+    count = len(x_vals)
+    if keep is None:
+        keep = [False] * count
+    prev = list(range(-1, count - 1))
+    nxt = list(range(1, count + 1))
+    removed = [False] * count
+
+    def area(i):
+        a, b = prev[i], nxt[i]
+        return abs((x_vals[a] - x_vals[i]) * (y_vals[b] - y_vals[i]) -
+                   (x_vals[b] - x_vals[i]) * (y_vals[a] - y_vals[i])) / 2.0
+
+    heap = [(area(i), i) for i in range(1, count - 1) if not keep[i]]
+    current = dict((i, a) for a, i in heap)
+    heapq.heapify(heap)
+    while heap:
+        a, i = heapq.heappop(heap)
+        if removed[i] or current.get(i) != a:
+            continue
+        if a >= tolerance:
+            break
+        removed[i] = True
+        p, n = prev[i], nxt[i]
+        nxt[p] = n
+        prev[n] = p
+        for j in (p, n):
+            if 0 < j < count - 1 and not keep[j]:
+                # Don't let a neighbour's area drop below the removed one
+                new_area = max(area(j), a)
+                current[j] = new_area
+                heapq.heappush(heap, (new_area, j))
+    return [i for i in range(count) if not removed[i]]
+
+
+def sectionErrors(section, kept):
+    """Compare the area and conveyance of a simplified section to the original.
+
+    The values are compared at every elevation in the original section. The
+    relative error at each depth is the difference divided by the original
+    value. Depths where the original value is less than 1% of its maximum are
+    skipped, as tiny values at the bottom of the channel would otherwise
+    dominate.
+
+    Args:
+        section(dict): see simplifySection().
+        kept(list): the indices of the points in the simplified section.
+
+    Return:
+        tuple - (largest relative area error, largest relative conveyance
+            error).
+    """
+    x = section[rdt.CHAINAGE]
+    y = section[rdt.ELEVATION]
+    n = section.get(rdt.ROUGHNESS, None)
+    p = section.get(rdt.PANEL_MARKER, [])
+    depths = sorted(set(y))
+
+    original = openchannel.sectionProperties(x, y, depths, n_vals=n, panel_vals=p)
+    simple = openchannel.sectionProperties(
+        [x[i] for i in kept], [y[i] for i in kept], depths,
+        n_vals=[n[i] for i in kept] if n else None,
+        panel_vals=[p[i] for i in kept] if p else [])
+
+    errors = []
+    for key in ('area', 'conveyance'):
+        orig = original[key]
+        limit = max(orig) * 0.01
+        worst = 0.0
+        for a, b in zip(orig, simple[key]):
+            if a > limit:
+                worst = max(worst, abs(b - a) / a)
+        errors.append(worst)
+    return errors[0], errors[1]
+
+
+def _segmentDistance(px, py, ax, ay, bx, by):
+    """Get the distance from a point to the line segment a-b."""
+    dx = bx - ax
+    dy = by - ay
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return math.hypot(px - ax, py - ay)
+    t = ((px - ax) * dx + (py - ay) * dy) / length2
+    t = min(max(t, 0.0), 1.0)
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _keepRows(unit, kept):
+    """Delete all of the rows in a unit that are not in kept."""
+    rows = unit.row_data['main']
+    keep = set(kept)
+    for i in range(rows.numberOfRows() - 1, -1, -1):
+        if not i in keep:
+            rows.deleteRow(i, no_copy=True)
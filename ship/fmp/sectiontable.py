@@ -0,0 +1,313 @@
+"""
+
+ Summary:
+     Columnar table of the section rows of all of the river units in a
+     DatCollection.
+
+     Rather than looping through the units and calling dataObjectAsList() for
+     every column of every unit, the SectionTable pulls each column of every
+     unit into a single list in one pass. A unit_id column and a list of
+     per-unit offsets record which rows belong to which unit, so values can be
+     filtered and aggregated across the whole model at once and any changes
+     written straight back into the units.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.utils import utilfunctions as uf
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+DEFAULT_COLUMNS = (
+    rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS, rdt.PANEL_MARKER, rdt.RPL,
+    rdt.BANKMARKER, rdt.EASTING, rdt.NORTHING, rdt.DEACTIVATION
+)
+"""The ROW_DATA_TYPES loaded into a SectionTable when none are given."""
+
+UNIT_ID = 'unit_id'
+"""Key of the column containing the index of the unit for each row."""
+
+OPERATORS = uf.COMPARISON_OPERATORS
+"""Comparison operators that can be used with SectionTable.where()."""
+
+
+class SectionTable(object):
+    """Columnar table of section rows across a DatCollection.
+
+    Columns are keyed by ROW_DATA_TYPES (e.g. rdt.ELEVATION) plus the UNIT_ID
+    column, which holds the position of the row's unit in self.units. The rows
+    for unit u are self.offsets[u] to self.offsets[u + 1].
+
+    The table is a snapshot of the units when it was built. Use setValue() to
+    change values so that the units are kept in sync. If the units are updated
+    directly staleUnits() will report which ones have changed and rebuild()
+    can be used to reload the table.
+
+    Example::
+
+        table = dat.sectionTable()
+        min_bed = table.minByUnit(rdt.ELEVATION)
+        rough = table.unitsWhere(rdt.ROUGHNESS, '>', 0.1)
+    """
+
+    def __init__(self, dat_collection, **kwargs):
+        """Constructor.
+
+        Args:
+            dat_collection(DatCollection): the collection to load from.
+            **kwargs:
+                unit_types(list): AUnit.UNIT_TYPE's to include. Default is
+                    ['river'].
+                columns(list): ROW_DATA_TYPES to load. Default is
+                    DEFAULT_COLUMNS.
+                units(list): only load these units rather than all of the
+                    units in the collection. They are still filtered by
+                    unit_types.
+        """
+        self.dat_collection = dat_collection
+        self.unit_types = kwargs.get('unit_types', ['river'])
+        self.column_keys = list(kwargs.get('columns', DEFAULT_COLUMNS))
+        self._only_units = kwargs.get('units', None)
+        self.rebuild()
+
+    def __len__(self):
+        return self.numberOfRows()
+
+    def rebuild(self):
+        """Load the table from the units in the DatCollection."""
+        self.units = []
+        self.offsets = [0]
+        self._columns = dict((k, []) for k in self.column_keys)
+        self._columns[UNIT_ID] = []
+        self._sources = []
+
+        units = self._only_units
+        if units is None:
+            units = self.dat_collection.units
+        for unit in units:
+            if not unit.unit_type in self.unit_types:
+                continue
+            try:
+                rows = unit.row_data['main']
+                objs = [rows.dataObject(k) for k in self.column_keys]
+            except KeyError:
+                continue
+
+            unit_id = len(self.units)
+            self.units.append(unit)
+            self._sources.append([(o, o.change_count) for o in objs])
+            if rows.has_dummy:
+                nrows = 0
+            else:
+                nrows = rows.numberOfRows()
+                for k, o in zip(self.column_keys, objs):
+                    self._columns[k].extend(o.data_collection)
+                self._columns[UNIT_ID].extend([unit_id] * nrows)
+            self.offsets.append(self.offsets[-1] + nrows)
+
+    def numberOfRows(self):
+        """Get the total number of rows in the table.
+
+        Return:
+            int - number of rows.
+        """
+        return self.offsets[-1]
+
+    def column(self, key):
+        """Get all of the values in a column.
+
+        The returned list is the one held by the table, it should not be
+        changed directly. Use setValue() instead.
+
+        Args:
+            key: a ROW_DATA_TYPES value or UNIT_ID.
+
+        Return:
+            list - of the column values.
+
+        Raises:
+            KeyError: if the column was not loaded.
+        """
+        return self._columns[key]
+
+    def unitRows(self, unit_id):
+        """Get the row indices for a unit.
+
+        Args:
+            unit_id(int): the index of the unit in self.units.
+
+        Return:
+            range - of row indices.
+        """
+        return range(self.offsets[unit_id], self.offsets[unit_id + 1])
+
+    def unitValues(self, key, unit_id):
+        """Get the values in a column for one unit.
+
+        Return:
+            list - of the unit's values.
+        """
+        return self._columns[key][self.offsets[unit_id]:self.offsets[unit_id + 1]]
+
+    def unitId(self, unit):
+        """Get the unit_id of a unit.
+
+        Raises:
+            ValueError: if the unit is not in the table.
+        """
+        for i, u in enumerate(self.units):
+            if u is unit:
+                return i
+        raise ValueError('Unit %s is not in the table' % unit.name)
+
+    def where(self, key, op, value):
+        """Find the rows where a column compares to a value.
+
+        Args:
+            key: the column to check.
+            op(str): one of '<', '<=', '>', '>=', '==' or '!='.
+            value: the value to compare against.
+
+        Return:
+            list - of row indices.
+
+        Raises:
+            ValueError: if op is not recognised.
+        """
+        if not op in OPERATORS:
+            raise ValueError('Unknown operator: %s' % op)
+        func = OPERATORS[op]
+        return [i for i, v in enumerate(self._columns[key]) if func(v, value)]
+
+    def filter(self, key, predicate):
+        """Find the rows where predicate(value) is True.
+
+        Return:
+            list - of row indices.
+        """
+        return [i for i, v in enumerate(self._columns[key]) if predicate(v)]
+
+    def rowUnits(self, rows):
+        """Get the units that the given rows belong to.
+
+        Args:
+            rows(list): row indices, e.g. from where() or filter().
+
+        Return:
+            list - of unique units in the order they appear in the table.
+        """
+        unit_ids = self._columns[UNIT_ID]
+        ids = sorted(set(unit_ids[r] for r in rows))
+        return [self.units[i] for i in ids]
+
+    def unitsWhere(self, key, op, value):
+        """Get the units with at least one row matching where().
+
+        Return:
+            list - of units.
+        """
+        return self.rowUnits(self.where(key, op, value))
+
+    def aggregate(self, key, func, empty=None):
+        """Apply a function to the values of each unit in a column.
+
+        Args:
+            key: the column to aggregate.
+            func(callable): called with the list of values for each unit.
+            empty=None: value to use for units without any rows.
+
+        Return:
+            list - containing the result for each unit in self.units.
+        """
+        col = self._columns[key]
+        offs = self.offsets
+        out = []
+        for i in range(len(self.units)):
+            if offs[i] == offs[i + 1]:
+                out.append(empty)
+            else:
+                out.append(func(col[offs[i]:offs[i + 1]]))
+        return out
+
+    def minByUnit(self, key):
+        """Get the minimum value of a column for each unit."""
+        return self.aggregate(key, min)
+
+    def maxByUnit(self, key):
+        """Get the maximum value of a column for each unit."""
+        return self.aggregate(key, max)
+
+    def setValue(self, key, row, value):
+        """Update a value in the table and the unit that it belongs to.
+
+        The value is set through the unit's data object, so all of the usual
+        type conversion and checks (e.g. increasing chainage) are applied.
+
+        Args:
+            key: the column to update.
+            row(int): the row index in the table.
+            value: the new value.
+
+        Raises:
+            KeyError: if the column is UNIT_ID or was not loaded.
+            ValueError: if the data object rejects the value.
+        """
+        if key == UNIT_ID or not key in self.column_keys:
+            raise KeyError('Column %s can not be updated' % key)
+        unit_id = self._columns[UNIT_ID][row]
+        local = row - self.offsets[unit_id]
+        col_index = self.column_keys.index(key)
+        obj, count = self._sources[unit_id][col_index]
+
+        obj[local] = value
+        self._columns[key][row] = obj[local]
+        # Only mark as current if nothing else changed it
+        if obj.change_count == count + 1:
+            self._sources[unit_id][col_index] = (obj, obj.change_count)
+
+    def setValues(self, key, rows, values):
+        """Update a list of values. See setValue().
+
+        Args:
+            key: the column to update.
+            rows(list): row indices to update.
+            values(list): new values; the same length as rows.
+        """
+        if len(rows) != len(values):
+            raise ValueError('rows and values must be the same length')
+        for r, v in zip(rows, values):
+            self.setValue(key, r, v)
+
+    def staleUnits(self):
+        """Find the units that have changed since the table was built.
+
+        Return:
+            list - of unit_id's for units whose data objects have been changed
+                other than through setValue().
+        """
+        stale = []
+        for unit_id, sources in enumerate(self._sources):
+            unit_rows = self.units[unit_id].row_data['main']
+            for k, (obj, count) in zip(self.column_keys, sources):
+                if obj.change_count != count or not unit_rows.dataObject(k) is obj:
+                    stale.append(unit_id)
+                    break
+        return stale
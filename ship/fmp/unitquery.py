@@ -0,0 +1,283 @@
+"""
+
+ Summary:
+     Composable queries for selecting units from a DatCollection.
+
+     The UnitIndex holds lookups from unit_type, unit_category, name and reach
+     number to the positions of the units in the collection. A UnitQuery uses
+     these to narrow down the candidate units before any head_data predicates
+     or custom filters are evaluated, and returns the matching units lazily in
+     the order that they appear in the collection.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import bisect
+import fnmatch
+import re
+
+from ship.fmp.headdata import HeadDataItem
+from ship.utils import utilfunctions as uf
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class UnitIndex(object):
+    """Lookups from unit attributes to positions in a list of units.
+
+    All of the position lists are in ascending order.
+    """
+
+    def __init__(self, units):
+        """Constructor.
+
+        Args:
+            units(list): the AUnit's to index.
+        """
+        self.by_type = {}
+        self.by_category = {}
+        self.by_name = {}
+        self.by_reach = {}
+        for i, u in enumerate(units):
+            self._add(self.by_type, u.unit_type, i)
+            self._add(self.by_category, u.unit_category, i)
+            self._add(self.by_name, u.name, i)
+            reach = getattr(u, 'reach_number', None)
+            if reach is not None:
+                self._add(self.by_reach, reach, i)
+        self.names = sorted(self.by_name.keys())
+        self.size = len(units)
+
+    def _add(self, lookup, key, i):
+        if not key in lookup:
+            lookup[key] = []
+        lookup[key].append(i)
+
+    def namePositions(self, pattern, regex=False):
+        """Get the positions of the units with a name matching a pattern.
+
+        Glob patterns with a literal prefix (e.g. 'RIV_*') only check the
+        names that start with the prefix.
+
+        Args:
+            pattern(str): the name, glob pattern or regular expression.
+            regex=False(bool): if True pattern is a regular expression that
+                must match the start of the name (re.match).
+
+        Return:
+            list - of positions.
+        """
+        if regex:
+            compiled = re.compile(pattern)
+            names = [n for n in self.names if compiled.match(n)]
+        else:
+            prefix = re.split(r'[\*\?\[]', pattern, 1)[0]
+            if prefix == pattern:
+                names = [pattern] if pattern in self.by_name else []
+            else:
+                start = bisect.bisect_left(self.names, prefix)
+                names = []
+                for n in self.names[start:]:
+                    if not n.startswith(prefix):
+                        break
+                    if fnmatch.fnmatchcase(n, pattern):
+                        names.append(n)
+
+        positions = []
+        for n in names:
+            positions.extend(self.by_name[n])
+        positions.sort()
+        return positions
+
+
+class UnitQuery(object):
+    """Composable selection of units from a DatCollection.
+
+    Each method returns a new UnitQuery with the extra condition added, so
+    queries can be built up and reused. Nothing is evaluated until the query
+    is iterated over.
+
+    Example::
+
+        low_spills = dat.query().type('spill').where('weir_coef', '<', 1.5)
+        for spill in low_spills:
+            print(spill.name)
+
+        bridges = dat.query().category('bridge').name('BR_*').where(
+            'calibration_coef', '!=', 1.0).all()
+    """
+
+    def __init__(self, dat_collection):
+        """Constructor.
+
+        Args:
+            dat_collection(DatCollection): the collection to query.
+        """
+        self.dat_collection = dat_collection
+        self._types = None
+        self._categories = None
+        self._names = []
+        self._reaches = None
+        self._predicates = []
+
+    def _copy(self):
+        q = UnitQuery(self.dat_collection)
+        q._types = self._types
+        q._categories = self._categories
+        q._names = list(self._names)
+        q._reaches = self._reaches
+        q._predicates = list(self._predicates)
+        return q
+
+    def type(self, *unit_types):
+        """Only include units of the given AUnit.UNIT_TYPE's."""
+        q = self._copy()
+        q._types = set(unit_types) if q._types is None else q._types & set(unit_types)
+        return q
+
+    def category(self, *categories):
+        """Only include units in the given AUnit.UNIT_CATEGORY's."""
+        q = self._copy()
+        q._categories = set(categories) if q._categories is None else q._categories & set(categories)
+        return q
+
+    def name(self, pattern, regex=False):
+        """Only include units with a name matching pattern.
+
+        Args:
+            pattern(str): a unit name or glob pattern (e.g. 'RIV_0*').
+            regex=False(bool): treat pattern as a regular expression. It
+                must match from the start of the name.
+        """
+        q = self._copy()
+        q._names.append((pattern, regex))
+        return q
+
+    def reach(self, *reach_numbers):
+        """Only include units with one of the given reach_number's."""
+        q = self._copy()
+        q._reaches = set(reach_numbers) if q._reaches is None else q._reaches & set(reach_numbers)
+        return q
+
+    def where(self, key, op, value):
+        """Only include units where a head_data value compares to value.
+
+        Units that don't have the head_data key, or where the value can't be
+        compared (e.g. a blank string against a float), are excluded.
+
+        Args:
+            key(str): the head_data key.
+            op(str): one of '<', '<=', '>', '>=', '==' or '!='.
+            value: the value to compare against.
+
+        Raises:
+            ValueError: if op is not recognised.
+        """
+        if not op in uf.COMPARISON_OPERATORS:
+            raise ValueError('Unknown operator: %s' % op)
+        func = uf.COMPARISON_OPERATORS[op]
+
+        def predicate(unit):
+            item = unit.head_data.get(key, None)
+            if item is None:
+                return False
+            if isinstance(item, HeadDataItem):
+                item = item.value
+            try:
+                return func(item, value)
+            except TypeError:
+                return False
+
+        return self.filter(predicate)
+
+    def filter(self, predicate):
+        """Only include units where predicate(unit) returns True."""
+        q = self._copy()
+        q._predicates.append(predicate)
+        return q
+
+    def __iter__(self):
+        """Lazily yield the matching units in collection order."""
+        units = self.dat_collection.units
+        for i in self._candidates():
+            u = units[i]
+            if self._matches(u) and all(p(u) for p in self._predicates):
+                yield u
+
+    def all(self):
+        """Get all of the matching units.
+
+        Return:
+            list - of AUnit's.
+        """
+        return list(self)
+
+    def first(self):
+        """Get the first matching unit.
+
+        Return:
+            AUnit - or None if no units match.
+        """
+        for u in self:
+            return u
+        return None
+
+    def count(self):
+        """Get the number of matching units."""
+        return sum(1 for u in self)
+
+    def _candidates(self):
+        """Get the positions of the units matching the indexed conditions."""
+        index = self.dat_collection.unitIndex()
+        sets = []
+        if self._types is not None:
+            sets.append(self._lookup(index.by_type, self._types))
+        if self._categories is not None:
+            sets.append(self._lookup(index.by_category, self._categories))
+        if self._reaches is not None:
+            sets.append(self._lookup(index.by_reach, self._reaches))
+        for pattern, regex in self._names:
+            sets.append(index.namePositions(pattern, regex))
+
+        if not sets:
+            return range(index.size)
+        sets.sort(key=len)
+        result = sets[0]
+        for s in sets[1:]:
+            if not result:
+                break
+            s = set(s)
+            result = [i for i in result if i in s]
+        return result
+
+    def _lookup(self, lookup, keys):
+        positions = []
+        for k in keys:
+            positions.extend(lookup.get(k, []))
+        positions.sort()
+        return positions
+
+    def _matches(self, unit):
+        """Check the indexed conditions against the unit itself.
+
+        Guards against the index being out of date with reach_number changes.
+        """
+        if self._reaches is not None and not getattr(unit, 'reach_number', None) in self._reaches:
+            return False
+        return True
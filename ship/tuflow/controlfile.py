@@ -33,13 +33,15 @@ from __future__ import unicode_literals
 
 import uuid
 import os
+from collections import OrderedDict
 
 import logging
 logger = logging.getLogger(__name__)
 """logging references with a __name__ set to this module."""
 
 from ship.tuflow.tuflowfilepart import TuflowPart, TuflowFile, TuflowLogic, \
-    TuflowVariable, ModelFile, UnknownPart
+    TuflowVariable, ModelFile, UnknownPart, placeholderResolver, keyOwner
+from ship.tuflow.pathchecker import PathChecker
 from ship.utils import filetools
 
 
@@ -51,6 +53,7 @@ class ControlFile(object):
         self.logic = LogicHolder(remove_callback=self.removeLogicPart,
                                  add_callback=self.addLogicPart)
         self.control_files = []
+        self.activation = PartActivation(self)
 
     def files(self, filepart_type=None, no_duplicates=True, se_vals=None,
               **kwargs):
@@ -157,11 +160,14 @@ class ControlFile(object):
         elif not isinstance(filepart_type, list):
             filepart_type = [filepart_type]
 
-        duplicate_list = []
+        duplicates = set()
         fetch_sibling = False
         vars = []
         parents = {}
-        for part in self.parts:
+        candidates = self.parts.select(instance_type,
+                                       filepart_type if filepart_type else None)
+        in_logic = self._activeParts(se_vals)
+        for part in candidates:
             if active_only and not part.active:
                 continue
             if not isinstance(part, instance_type):
@@ -171,16 +177,14 @@ class ControlFile(object):
             if part.filepart_type in exclude:
                 continue
 
-            if se_vals is not None:
-                if not self.checkPartLogic(part, se_vals):
-                    continue
+            if in_logic is not None and not part.hash in in_logic:
+                continue
 
             if no_duplicates:
-                if part.duplicate_comparison in duplicate_list and not fetch_sibling:
+                if part.duplicate_comparison in duplicates and not fetch_sibling:
                     continue
                 else:
-                    if not part.duplicate_comparison in duplicate_list:
-                        duplicate_list.append(part.duplicate_comparison)
+                    duplicates.add(part.duplicate_comparison)
                     # If a part has a sibling note that here so that it doesn't
                     # get missed by the duplicate_list check
                     if part.associates.sibling_next is not None:
@@ -292,13 +296,19 @@ class ControlFile(object):
         by_parent = kwargs.get('by_parent', False)
         exclude = kwargs.get('exclude', [])
         user_vars = kwargs.get('user_vars', None)
+        if user_vars:
+            user_vars = placeholderResolver(user_vars)
         if filepart_type is None:
             filepart_type = []
         elif not isinstance(filepart_type, list):
             filepart_type = [filepart_type]
         paths = []
+        seen = set()
         parents = {}
-        for part in self.parts:
+        candidates = self.parts.select(TuflowFile,
+                                       filepart_type if filepart_type else None)
+        in_logic = self._activeParts(se_vals)
+        for part in candidates:
             if active_only and not part.active:
                 continue
             p = None
@@ -308,16 +318,15 @@ class ControlFile(object):
                 continue
             if part.filepart_type in exclude:
                 continue
-            if se_vals is not None:
-                if not self.checkPartLogic(part, se_vals):
-                    continue
+            if in_logic is not None and not part.hash in in_logic:
+                continue
 
             if absolute:
                 p = part.absolutePath(user_vars)
             else:
                 p = part.filenameAndExtension(user_vars)
 
-            if no_duplicates and p in paths:
+            if no_duplicates and p in seen:
                 continue
             if no_blanks and p.strip() == '':
                 continue
@@ -328,6 +337,7 @@ class ControlFile(object):
                     parents[part.associates.parent.filenameAndExtension()].append(p)
                 else:
                     paths.append(p)
+                    seen.add(p)
 
         if by_parent:
             return parents
@@ -337,7 +347,9 @@ class ControlFile(object):
     def checkPartLogic(self, part, se_vals):
         """Check that the part or it's parents are inside the current logic terms.
 
-        See TuflowPart isInSeVals method for further information.
+        See TuflowPart isInSeVals method for further information. Parts in
+        this ControlFile are checked with self.activation, which caches the
+        results for each set of se_vals.
 
         Args:
             part(TuflowPart): the part to check logic terms for.
@@ -346,29 +358,67 @@ class ControlFile(object):
         Return:
             bool - True if it's in the logic terms, or False otherwise.
         """
-        output = part.isInSeVals(se_vals)
+        output = self.activation.isActive(part, se_vals)
         return output
 
+    def _activeParts(self, se_vals):
+        """Get the hashes of the parts active for se_vals, or None if not given."""
+        if se_vals is None:
+            return None
+        return self.activation.activeParts(se_vals)
+
     def checkPathsExist(self, se_vals=None, **kwargs):
         """Check that all of the TuflowFile type's absolute paths exist.
 
+        The paths are checked with a PathChecker (see pathchecker module), so
+        each distinct path is only checked once.
+
         Args:
             se_vals=None(dict): to select only those TuflowFile's that are 
                 within certain scenario and event clauses.
+            **kwargs:
+                active_only=True(bool): if True only the parts with 'active'
+                    status set to True will be checked.
+                all_types=False(bool): if True all of the files in
+                    TuflowFile.all_types will be checked (e.g. .shx and .dbf
+                    as well as .shp).
+                user_vars(dict): placeholder variables to resolve in the
+                    paths.
+                checker(PathChecker): an existing checker to use. This will
+                    take precedence over all_types and user_vars.
 
         Return:
             list - containing all TuflowFile's that failed the check.
         """
+        kwargs.setdefault('all_types', False)
+        return [m.part for m in self.missingFiles(se_vals, **kwargs)]
+
+    def missingFiles(self, se_vals=None, **kwargs):
+        """Get the details of the TuflowFile paths that don't exist.
+
+        Takes the same arguments as checkPathsExist(), except that all_types
+        defaults to True.
+
+        Return:
+            list - of pathchecker.MissingFile, containing the part, missing
+                paths and missing extensions, for every TuflowFile that failed
+                the check.
+        """
         active_only = kwargs.get('active_only', True)
-        failed = []
-        for part in self.parts:
+        checker = kwargs.get('checker', None)
+        if checker is None:
+            checker = PathChecker(all_types=kwargs.get('all_types', True),
+                                  user_vars=kwargs.get('user_vars', None))
+
+        in_logic = self._activeParts(se_vals)
+        parts = []
+        for part in self.parts.select(TuflowFile):
             if active_only and not part.active:
                 continue
-            if not isinstance(part, TuflowFile):
+            if in_logic is not None and not part.hash in in_logic:
                 continue
-            if not os.path.exists(part.absolutePath()):
-                failed.append(part)
-        return failed
+            parts.append(part)
+        return checker.check(parts)
 
     def updateRoot(self, root, must_exist=True):
         """Update the root variable of all TuflowPart's.
@@ -409,9 +459,12 @@ class ControlFile(object):
 
         active_only = kwargs.get('active_only', True)
         parents = kwargs.get('parents', self.control_files)
+        control_files = set(self.control_files)
         for p in parents:
-            if not p in self.control_files:
+            if not p in control_files:
                 raise ValueError("All 'parents' must be in self.control_files'")
+        parents = set(parents)
+        in_logic = self._activeParts(se_vals)
 
         logic_stack = {}
         logic_group = {}
@@ -434,8 +487,7 @@ class ControlFile(object):
             part_active = False
             if active_only and p.active:
                 part_active = True
-            if se_vals is None or (se_vals is not None and
-                                   self.checkPartLogic(p, se_vals)):
+            if in_logic is None or p.hash in in_logic:
                 part_active = True
 
             # Get any logic clauses that appear above this part
@@ -518,8 +570,8 @@ class ControlFile(object):
             raise IndexError('last_part (%s) does not exist in PartHolder' % last_part.hash)
 
         self.parts.remove(remove_part)
-        if last_index + 1 >= len(self.parts.parts):
-            self.parts.parts.append(remove_part)
+        if last_index + 1 >= len(self.parts):
+            self.parts.append(remove_part)
         else:
             # It's not last_index + 1 becuase we lost an index when removing
             # the old one
@@ -582,13 +634,14 @@ class ControlFile(object):
         active_only = kwargs.get('active_only', True)
         exact = kwargs.get('exact', False)
         results = []
-        for part in self.parts:
+        in_logic = self._activeParts(se_vals)
+        for part in self._containsCandidates(command, variable, filename,
+                                             parent_filename, exact):
             out = None
             if active_only and not part.active:
                 continue
-            if se_vals is not None:
-                if not self.checkPartLogic(part, se_vals):
-                    continue
+            if in_logic is not None and not part.hash in in_logic:
+                continue
 
             if parent_filename:
                 try:
@@ -640,6 +693,45 @@ class ControlFile(object):
 
         return results
 
+    def _containsCandidates(self, command, variable, filename, parent_filename,
+                            exact):
+        """Use the PartHolder indexes to find the parts contains() must check.
+
+        When not exact every search term given must match, so only parts with
+        a matching command and parent are needed. When exact any of the terms
+        can match, so the indexes can only be used for a single term.
+        """
+        parents = None
+        if parent_filename:
+            parents = []
+            for p in self.parts.indexKeys('parent'):
+                pname = getattr(p, 'filename', None)
+                if pname is None:
+                    continue
+                pname = pname.upper()
+                if (exact and parent_filename == pname) or \
+                        (not exact and parent_filename in pname):
+                    parents.append(p)
+        commands = None
+        if command:
+            if exact:
+                commands = [command]
+            else:
+                commands = [c for c in self.parts.indexKeys('command')
+                            if c is not None and command in c]
+
+        if not exact:
+            if commands is None and parents is None:
+                return self.parts
+            return self.parts.select(command=commands, parent=parents)
+        if variable or filename or (commands is not None and parents is not None):
+            return self.parts
+        if commands is not None:
+            return self.parts.select(command=commands)
+        if parents is not None:
+            return self.parts.select(parent=parents)
+        return self.parts
+
     def allParentHashes(self, parent_hash, iterator):
         """Get all of the TuflowParts with a specific parent in their heirachy.
 
@@ -650,7 +742,7 @@ class ControlFile(object):
         This method checks to see if a certain hash is in the returned list.
 
         Args:
-            parent_hash(uuid4): hash to check against.
+            parent_hash(int): hash to check against.
             iterator(list or Iterator): containing TuflowPart's to fetch the
                 parents from.
 
@@ -798,12 +890,12 @@ class ControlFile(object):
 
         if after is not None:
             indices = self.controlFileIndices(after, end=True)
-            self.parts.parts[indices['end_part']: indices['end_part']] = control_file.parts
+            self.parts.insertParts(indices['end_part'], control_file.parts)
             self.logic.parts[indices['end_logic']: indices['end_logic']] = control_file.logic
             self.control_files[indices['end_cfile']: indices['end_cfile']] = control_file.control_files
         elif before is not None:
             indices = self.controlFileIndices(before, start=True)
-            self.parts.parts[indices['start_part']: indices['start_part']] = control_file.parts
+            self.parts.insertParts(indices['start_part'], control_file.parts)
             self.logic.parts[indices['start_logic']: indices['start_logic']] = control_file.logic
             self.control_files[indices['start_cfile']: indices['start_cfile']] = control_file.control_files
 
@@ -824,7 +916,36 @@ class ControlFile(object):
         self.removeControlFile(replace_modelfile)
 
 
+PART_INDEXES = ('filepart_type', 'part_class', 'command', 'parent')
+"""The names of the indexes kept by the PartHolder. See PartHolder.select()."""
+
+
 class PartHolder(object):
+    """Ordered list of the TuflowPart's in a ControlFile.
+
+    The position of every part and the last part belonging to each parent
+    are indexed, so checking whether a part is in the holder, finding its
+    index and adding a part after the others with the same parent don't
+    need to search the whole list.
+
+    Inserting or removing a part before the end of the list moves the parts
+    after it. Rather than updating all of their positions each insert and
+    remove is logged; when a position is next looked up it's moved along by
+    the changes made since it was stored. The log is cleared by reindexing
+    once it's longer than the list.
+
+    The parts are also indexed by filepart_type, class, upper cased command
+    and parent so that select() only has to look at the parts that match.
+    If the command or parent of one of the parts is changed (see
+    TuflowPart.key_changes) everything is reindexed the next time it's
+    used. Only the counters of the parents of the parts in this holder are
+    checked, so changes to other models don't cause a reindex. The parts
+    returned should still be checked by the caller.
+
+    The indexes are kept up to date by all of the methods here. If self.parts
+    is changed directly reindex() must be called afterwards; changes to the
+    length of the list are detected and will trigger a reindex automatically.
+    """
 
     def __init__(self):
         self.parts = []
@@ -832,12 +953,49 @@ class PartHolder(object):
         self._max = len(self.parts)
         self._current = 0
 
+        self._positions = {}
+        """{part.hash: [index, length of self._shifts when stored]}."""
+
+        self._shifts = []
+        """(index, +1 or -1) for each insert or remove before the end."""
+
+        self._counts = {}
+        """{part.hash: number of times the part is in self.parts}."""
+
+        self._parent_last = {}
+        """{parent.hash: last part in self.parts with that parent}."""
+
+        self._indexes = dict((k, {}) for k in PART_INDEXES)
+        """{index name: {key: set of parts}} for each of PART_INDEXES."""
+
+        self._index_keys = {}
+        """{part.hash: keys the part was indexed with}."""
+
+        self._key_owners = {}
+        """{owner.hash: [owner, owner.key_changes when indexed]}. See keyOwner()."""
+
+        self._length = 0
+
+        self.version = 0
+        """Incremented every time the parts or their order changes."""
+
     def __iter__(self):
         """Return an iterator for the units list"""
         return iter(self.parts)
 
+    def __len__(self):
+        return len(self.parts)
+
+    def __contains__(self, filepart):
+        self._checkLength()
+        return isinstance(filepart, TuflowPart) and filepart.hash in self._counts
+
     def __delitem__(self, key):
-        del self.parts[key]
+        if isinstance(key, slice):
+            del self.parts[key]
+            self.reindex()
+        else:
+            self._pop(key)
         self._max -= 1
 
     def __next__(self):
@@ -869,7 +1027,13 @@ class PartHolder(object):
         """
         if not isinstance(value, TuflowPart):
             raise ValueError('Item must be of type TuflowPart')
-        self.parts[key] = value
+        self._checkLength()
+        if key < 0:
+            key += len(self.parts)
+        if key < 0 or key >= len(self.parts):
+            raise IndexError('list assignment index out of range')
+        self._pop(key)
+        self._insert(key, value)
 
     def append(self, filepart):
         """Adds part to the end of the parts list. 
@@ -881,7 +1045,8 @@ class PartHolder(object):
         """
         if not isinstance(filepart, TuflowPart):
             raise ValueError('filepart must be TuflowPart type')
-        self.parts.append(filepart)
+        self._checkLength()
+        self._insert(len(self.parts), filepart)
 
     def add(self, filepart, **kwargs):
         """
@@ -892,74 +1057,166 @@ class PartHolder(object):
         before = kwargs.get('before', None)
         suppress_add_same = kwargs.get('suppress_add_same', False)
 
-        if filepart in self.parts:
+        if filepart in self:
             if not suppress_add_same:
                 raise ValueError('filepart %s already exists.' % filepart.hash)
 
         # Insert after the after filepart
         if after is not None:
             index = self.index(after)
-            if index == len(self.parts):
-                filepart.associates.logic = after.associates.logic
-                self.parts.append(filepart)
-            else:
-                filepart.associates.logic = after.associates.logic
-                self.parts.insert(index + 1, filepart)
+            filepart.associates.logic = after.associates.logic
+            self._insert(index + 1, filepart)
 
         # Insert before the before filepart
         elif before is not None:
             index = self.index(before)
             filepart.associates.logic = before.associates.logic
-            self.parts.insert(index, filepart)
+            self._insert(index, filepart)
         else:
             # insert in the list after the last instance of filepart.parent
-            found_parent = False
-            if not self.parts:
-                self.parts.append(filepart)
+            index = self.lastIndexOfParent(filepart.associates.parent)
+            if index == -1:
+                self._insert(len(self.parts), filepart)
             else:
-                index = self.lastIndexOfParent(filepart.associates.parent)
-                if index == -1 or index + 1 >= len(self.parts):
-                    self.parts.append(filepart)
-                else:
-                    self.parts.insert(index + 1, filepart)
+                self._insert(index + 1, filepart)
+
+    def insertParts(self, index, parts):
+        """Insert a sequence of TuflowPart's at index.
+
+        Uses slice assignment, so index may be negative as with a list.
+        """
+        self.parts[index:index] = parts
+        self.reindex()
 
     def replace(self, part, replace_part):
         """
         """
-        index = self.parts.index(replace_part)
+        index = self.index(replace_part)
         if index == -1:
             raise ValueError('part does not exist in collection')
 
         part.associates.logic = replace_part.associates.logic
-        self.parts.pop(index)
-        self.parts.insert(index, part)
+        self._pop(index)
+        self._insert(index, part)
+
+    def move(self, part, **kwargs):
+        """Move a part to before or after another part.
 
-    def move(self, part, **kwargs):  # after):
-        after = kwargs('after', None)
-        before = kwargs('before', None)
+        **kwargs:
+            'after': the part to move it after.
+            'before': the part to move it before.
+            'take_logic'(bool): if True (the default) the part takes the
+                logic of the part it's moved next to.
+
+        Raises:
+            AttributeError: if neither before or after is given.
+            ValueError: if either part is not in the holder.
+        """
+        after = kwargs.get('after', None)
+        before = kwargs.get('before', None)
         if after is None and before is None:
             raise AttributeError('Either before or after part must be given')
-        take_logic = kwargs('take_logic', True)
+        take_logic = kwargs.get('take_logic', True)
+        other = after if after is not None else before
 
         pindex = self.index(part)
-        aindex = self.index(after)
-        self.parts.insert(aindex, self.parts.pop(pindex))
+        if pindex == -1 or self.index(other) == -1:
+            raise ValueError('part does not exist in collection')
+        self._pop(pindex)
+        index = self.index(other)
+        if after is not None:
+            index += 1
+        if take_logic:
+            part.associates.logic = other.associates.logic
+        self._insert(index, part)
 
     def index(self, part):
         if not isinstance(part, TuflowPart):
             raise ValueError('part must be TuflowPart type')
-        try:
-            return self.parts.index(part)
-        except ValueError:
+        self._checkLength()
+        count = self._counts.get(part.hash, 0)
+        if count == 0:
             return -1
+        if count > 1:
+            # Added more than once, so make sure the first is found
+            return self.parts.index(part)
+
+        return self._position(part.hash)
 
     def lastIndexOfParent(self, parent):
-        index = -1
-        for i, p in enumerate(self.parts):
-            if p.associates.parent == parent:
-                index = i
-        return index
+        self._checkLength()
+        return self._lastIndex(parent.hash if parent is not None else None)
+
+    def select(self, instance_type=None, filepart_type=None, command=None,
+               parent=None):
+        """Get the parts matching the given index values, in order.
 
+        Each arg may be a single value or a list, in which case parts matching
+        any of the values are included. Parts must match all of the args that
+        are not None. If all are None every part is returned.
+
+        Args:
+            instance_type=None(class): TuflowPart class or tuple of classes;
+                subclasses also match.
+            filepart_type=None: FILEPART_TYPES value(s).
+            command=None(str): upper cased command(s).
+            parent=None(ModelFile): parent part(s). None parents can't be
+                selected.
+
+        Return:
+            list - of the matching TuflowPart's.
+        """
+        self._checkLength()
+        lookups = []
+        if instance_type is not None:
+            lookups.append(('part_class', [c for c in self._indexes['part_class']
+                                           if issubclass(c, instance_type)]))
+        for name, values in (('filepart_type', filepart_type), ('command', command),
+                             ('parent', parent)):
+            if values is not None:
+                if not isinstance(values, (list, tuple, set)):
+                    values = [values]
+                lookups.append((name, values))
+        if not lookups:
+            return list(self.parts)
+
+        found = None
+        for name, values in lookups:
+            index = self._indexes[name]
+            matches = set()
+            for v in values:
+                matches.update(index.get(v, ()))
+            found = matches if found is None else found & matches
+            if not found:
+                return []
+        return self._inOrder(found)
+
+    def indexKeys(self, index_name):
+        """Get the values held in one of the PART_INDEXES.
+
+        Return:
+            list - of the keys in the index.
+        """
+        self._checkLength()
+        return list(self._indexes[index_name].keys())
+
+    def reindex(self):
+        """Rebuild all of the indexes from self.parts."""
+        self._positions = {}
+        self._counts = {}
+        self._parent_last = {}
+        self._indexes = dict((k, {}) for k in PART_INDEXES)
+        self._index_keys = {}
+        self._shifts = []
+        self._key_owners = {}
+        self.version += 1
+        for i, p in enumerate(self.parts):
+            if not p.hash in self._positions:
+                self._positions[p.hash] = [i, 0]
+                self._addToIndexes(p)
+            self._counts[p.hash] = self._counts.get(p.hash, 0) + 1
+            self._parent_last[_parentKey(p)] = p
+        self._length = len(self.parts)
 
 #     def get(self, filepart, filepart_type=None):
 #         """
@@ -972,9 +1229,353 @@ class PartHolder(object):
         """
         """
         index = self.index(filepart)
-        fpart = self.parts[index]
-        del self.parts[index]
-        return fpart
+        return self._pop(index)
+
+    def _checkLength(self):
+        """Reindex if self.parts, or the part commands or parents, changed."""
+        if len(self.parts) != self._length or \
+                any(o.key_changes != c for o, c in self._key_owners.values()):
+            self.reindex()
+
+    def _position(self, part_hash):
+        """Get the current index of a part that is in the list once."""
+        entry = self._positions[part_hash]
+        pos = entry[0]
+        for index, change in self._shifts[entry[1]:]:
+            if change > 0:
+                if index <= pos:
+                    pos += 1
+            elif index < pos:
+                pos -= 1
+
+        if pos < len(self.parts) and self.parts[pos].hash == part_hash:
+            entry[0] = pos
+            entry[1] = len(self._shifts)
+            return pos
+        self.reindex()
+        return self._positions[part_hash][0]
+
+    def _logShift(self, index, change):
+        """Record an insert or remove that moved the parts after index."""
+        self._shifts.append((index, change))
+        if len(self._shifts) > max(64, len(self.parts)):
+            self.reindex()
+
+    def _insert(self, index, part):
+        """Insert a part and update the indexes."""
+        length = len(self.parts)
+        if index < 0:
+            index = max(length + index, 0)
+        index = min(index, length)
+
+        # Will the part be after the current last part with this parent
+        parent_key = _parentKey(part)
+        is_last = self._lastIndex(parent_key) < index
+
+        self.parts.insert(index, part)
+        self._length = length + 1
+        self.version += 1
+        self._counts[part.hash] = self._counts.get(part.hash, 0) + 1
+        if self._counts[part.hash] == 1:
+            self._addToIndexes(part)
+        if is_last:
+            self._parent_last[parent_key] = part
+        if index < length:
+            self._logShift(index, 1)
+        self._positions[part.hash] = [index, len(self._shifts)]
+
+    def _pop(self, index):
+        """Remove the part at index and update the indexes."""
+        self._checkLength()
+        if index < 0:
+            index += len(self.parts)
+        part = self.parts.pop(index)
+        self._length -= 1
+        self.version += 1
+
+        count = self._counts[part.hash] - 1
+        if count:
+            self._counts[part.hash] = count
+        else:
+            del self._counts[part.hash]
+            self._positions.pop(part.hash, None)
+            self._removeFromIndexes(part)
+        if index < len(self.parts):
+            self._logShift(index, -1)
+        if count == 1:
+            self._positions[part.hash] = [self.parts.index(part), len(self._shifts)]
+
+        # If it was the last part with its parent find the one before it
+        parent_key = _parentKey(part)
+        if count:
+            self._findLast(parent_key, len(self.parts))
+        elif self._parent_last.get(parent_key) is part:
+            self._findLast(parent_key, index)
+        return part
+
+    def _lastIndex(self, parent_key):
+        """Get the index of the last part with the given parent key."""
+        last = self._parent_last.get(parent_key)
+        if last is None:
+            return -1
+        if self._counts[last.hash] > 1:
+            for i in range(len(self.parts) - 1, -1, -1):
+                if self.parts[i] is last:
+                    return i
+        return self.index(last)
+
+    def _findLast(self, parent_key, end):
+        """Search back from end for the last part with the given parent key."""
+        self._parent_last.pop(parent_key, None)
+        for i in range(end - 1, -1, -1):
+            if _parentKey(self.parts[i]) == parent_key:
+                self._parent_last[parent_key] = self.parts[i]
+                break
+
+
+    def _addToIndexes(self, part):
+        owner = keyOwner(part)
+        if not owner.hash in self._key_owners:
+            self._key_owners[owner.hash] = [owner, owner.key_changes]
+        keys = _indexKeys(part)
+        self._index_keys[part.hash] = keys
+        for name, key in zip(PART_INDEXES, keys):
+            self._indexes[name].setdefault(key, set()).add(part)
+
+    def _removeFromIndexes(self, part):
+        keys = self._index_keys.pop(part.hash)
+        for name, key in zip(PART_INDEXES, keys):
+            index = self._indexes[name]
+            index[key].discard(part)
+            if not index[key]:
+                del index[key]
+
+    def _inOrder(self, found):
+        """Put a set of parts from the holder into list order."""
+        if len(found) * 4 > len(self.parts) or \
+                any(self._counts[p.hash] > 1 for p in found):
+            return [p for p in self.parts if p in found]
+        # Moving every position along the shift log could cost more than
+        # starting again
+        if len(self._shifts) * len(found) > len(self.parts):
+            self.reindex()
+        return sorted(found, key=lambda p: self._position(p.hash))
+
+
+def _indexKeys(part):
+    """Get the keys a part is stored under for each of PART_INDEXES."""
+    command = getattr(part, 'command', None)
+    if command is not None:
+        command = command.upper()
+    return (part.filepart_type, type(part), command, part.associates.parent)
+
+
+def _parentKey(part):
+    """Get the key used for a part's parent in the PartHolder indexes."""
+    parent = part.associates.parent
+    return parent.hash if parent is not None else None
+
+
+class PartActivation(object):
+    """Scenario and event activation of the parts in a ControlFile.
+
+    Whether a part is active for some se_vals depends only on the logic
+    clause group of the part, or of the first of its parents that is in a
+    logic clause (see TuflowPart.isInSeVals()). The parts are compiled into
+    groups sharing the same (logic, clause group) once. For each se_vals
+    every clause group is checked once and the set of active part hashes is
+    cached, so later queries with the same se_vals are a lookup.
+
+    The compiled groups are checked against the PartHolder version and the
+    version, terms and commands of all the logic used by the parts before
+    each query and rebuilt if anything has changed. Changes made directly to
+    TuflowLogic.group_parts aren't seen; call clear() after making them.
+    """
+
+    def __init__(self, control_file, maxsize=64):
+        """Constructor.
+
+        Args:
+            control_file(ControlFile): the parts to check.
+            maxsize=64(int): the number of se_vals results to cache.
+        """
+        self.control_file = control_file
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._signature = None
+        self._part_groups = {}
+        self._groups = {}
+        self._cache = OrderedDict()
+        self._by_states = OrderedDict()
+
+    def clear(self):
+        """Throw away the compiled groups and cached results."""
+        self._signature = None
+        self._part_groups = {}
+        self._groups = {}
+        self._cache.clear()
+        self._by_states.clear()
+
+    def activeParts(self, se_vals):
+        """Get the hashes of the parts that are active for se_vals.
+
+        Args:
+            se_vals(dict): containing scenario and event values.
+
+        Return:
+            frozenset - of the TuflowPart.hash of the active parts.
+        """
+        self._update()
+        key = seValsKey(se_vals)
+        active = self._cache.get(key)
+        if active is not None:
+            self.hits += 1
+            self._cache.pop(key)
+            self._cache[key] = active
+            return active
+
+        self.misses += 1
+        states = self._groupStates(se_vals)
+        active = self._by_states.get(states)
+        if active is None:
+            active = set()
+            for state, hashes in zip(states, self._groups.values()):
+                if state:
+                    active.update(hashes)
+            active = frozenset(active)
+            self._by_states[states] = active
+            while len(self._by_states) > self.maxsize:
+                self._by_states.popitem(last=False)
+        self._cache[key] = active
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return active
+
+    def groupStates(self, se_vals):
+        """Get whether each of the compiled groups is active for se_vals.
+
+        se_vals with the same group states have the same active parts, so
+        this can be used to share work between them.
+
+        Return:
+            tuple - of bools, in the same order as groups().
+        """
+        self._update()
+        return self._groupStates(se_vals)
+
+    def _groupStates(self, se_vals):
+        return tuple(group_key is None or group_key[0].isGroupInTerms(group_key[1], se_vals)
+                     for group_key in self._groups)
+
+    def isActive(self, part, se_vals):
+        """Check whether a part is active for se_vals.
+
+        Parts that aren't in the ControlFile are checked directly.
+        """
+        self._update()
+        if not part.hash in self._part_groups:
+            return part.isInSeVals(se_vals)
+        return part.hash in self.activeParts(se_vals)
+
+    def groups(self):
+        """Get the compiled clause groups.
+
+        Return:
+            dict - {(TuflowLogic, group index) or None: list of part hashes}.
+                Parts under the None key are not in any logic.
+        """
+        self._update()
+        return self._groups
+
+    def _update(self):
+        """Compile the groups again if the parts or logic have changed."""
+        signature = self._makeSignature()
+        if signature == self._signature:
+            return
+        self._cache.clear()
+        self._by_states.clear()
+        self._part_groups = {}
+        self._groups = {}
+        chains = {}
+        for part in self.control_file.parts:
+            group_key = _logicGroup(part, chains)
+            self._part_groups[part.hash] = group_key
+            self._groups.setdefault(group_key, []).append(part.hash)
+        self._signature = signature
+
+    def _makeSignature(self):
+        """Get a value that changes whenever the activation could change."""
+        holder = self.control_file.parts
+        logics = dict((l.hash, l) for l in self.control_file.logic)
+        for group_key in self._groups:
+            if group_key is not None:
+                logics[group_key[0].hash] = group_key[0]
+        chains = []
+        for parent in holder.indexKeys('parent'):
+            chain = []
+            while parent is not None:
+                logic = parent.associates.logic
+                if logic is not None:
+                    logics[logic.hash] = logic
+                    chain.append((parent.hash, logic.hash))
+                parent = parent.associates.parent
+            chains.append(tuple(chain))
+
+        logic_state = []
+        for lhash in sorted(logics):
+            logic = logics[lhash]
+            logic_state.append((
+                lhash, logic.version, logic.check_sevals, tuple(logic.commands),
+                tuple(tuple(t) for t in logic.terms)
+            ))
+        return (holder.version, tuple(sorted(chains)), tuple(logic_state))
+
+
+def seValsKey(se_vals):
+    """Get a hashable key for the scenario and event values in se_vals.
+
+    Only the scenario and event values are used when checking logic, and the
+    order of the terms doesn't matter.
+    """
+    key = []
+    for name in ('scenario', 'event'):
+        if not name in se_vals:
+            key.append((name, None))
+            continue
+        vals = se_vals[name]
+        if isinstance(vals, (list, tuple, set, frozenset)):
+            key.append((name, frozenset(vals)))
+        else:
+            key.append((name, vals))
+    return tuple(key)
+
+
+def _logicGroup(part, chains):
+    """Get the (logic, group) that decides whether a part is active.
+
+    Follows the same steps as TuflowPart.isInSeVals(). chains is used to
+    store the result for each parent as it's found.
+    """
+    p = part
+    visited = []
+    while True:
+        logic = p.associates.logic
+        if logic is not None:
+            result = (logic, logic.getGroup(p))
+            break
+        parent = p.associates.parent
+        if parent is None:
+            result = None
+            break
+        if parent.hash in chains:
+            result = chains[parent.hash]
+            break
+        visited.append(parent.hash)
+        p = parent
+    for h in visited:
+        chains[h] = result
+    return result
 
 
 class LogicHolder(object):
@@ -1052,6 +1653,7 @@ class TcfControlFile(ControlFile):
         self.parts = PartHolder()
         self.logic = LogicHolder()
         self.control_files = []
+        self.activation = PartActivation(self)
         self._mainfile = mainfile
         self.remove_callback = remove_callback
         self.replace_callback = replace_callback
@@ -0,0 +1,177 @@
+"""
+
+ Summary:
+     Check that the files referenced by TuflowFile parts exist.
+
+     A PathChecker resolves the absolute paths of all of the parts first,
+     removes any duplicates and then checks the remaining paths concurrently
+     in a ThreadPool. The result of every check is cached for the life of the
+     checker, so files that are referenced by more than one part, or by more
+     than one control file, are only looked up once.
+
+     When all_types is set every file in TuflowFile.all_types is checked (e.g.
+     the .shx and .dbf files that go with a .shp), not just the main file.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import os
+from multiprocessing.pool import ThreadPool
+
+from ship.tuflow.tuflowfilepart import placeholderResolver
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class MissingFile(object):
+    """The missing files of a TuflowFile part.
+
+    Attributes:
+        part(TuflowFile): the part that was checked.
+        paths(list): the absolute paths that don't exist.
+        extensions(list): the file extensions of the paths that don't exist.
+    """
+
+    def __init__(self, part, paths):
+        self.part = part
+        self.paths = paths
+        self.extensions = [_extension(p) for p in paths]
+
+    def __repr__(self):
+        return 'MissingFile(%s, %s)' % (self.part.filenameAndExtension(), self.extensions)
+
+
+class PathChecker(object):
+    """Checks whether the paths of TuflowFile parts exist.
+
+    Example::
+
+        checker = PathChecker(all_types=True)
+        for missing in checker.check(control_file.files()):
+            print(missing.part.filename, missing.extensions)
+    """
+
+    def __init__(self, threads=8, all_types=True, user_vars=None):
+        """Constructor.
+
+        Args:
+            threads=8(int): the number of threads to check the paths with. If
+                less than 2 the paths are checked one at a time.
+            all_types=True(bool): if True all of the files in
+                TuflowFile.all_types are checked, otherwise only the file
+                referenced in the control file.
+            user_vars=None(dict): placeholder variables to resolve in the paths.
+                See TuflowPart.resolvePlaceholder() for more information.
+        """
+        self.threads = threads
+        self.all_types = all_types
+        self.user_vars = placeholderResolver(user_vars) if user_vars else None
+        self._exists = {}
+        self._roots = {}
+
+    def clear(self):
+        """Forget all of the cached results."""
+        self._exists = {}
+        self._roots = {}
+
+    def exists(self, path):
+        """Check whether a single path exists, using the cache if possible."""
+        if not path:
+            return False
+        if not path in self._exists:
+            self._exists[path] = os.path.exists(path)
+        return self._exists[path]
+
+    def paths(self, part):
+        """Get the absolute paths that will be checked for a part.
+
+        Args:
+            part(TuflowFile): the part to get the paths for.
+
+        Return:
+            list - of absolute paths. A path will be False if it can't be
+                worked out (see PathHolder.absolutePath()).
+        """
+        roots = self._relativeRoots(part)
+        if self.all_types and part.all_types:
+            return part.absolutePathAllTypes(self.user_vars, relative_roots=roots)
+        return [part.absolutePath(self.user_vars, relative_roots=roots)]
+
+    def check(self, parts):
+        """Check the paths of the given parts.
+
+        Args:
+            parts(list): the TuflowFile parts to check.
+
+        Return:
+            list - of MissingFile for every part with paths that don't exist,
+                in the same order as parts.
+        """
+        part_paths = [(part, self.paths(part)) for part in parts]
+
+        unchecked = []
+        seen = set()
+        for part, paths in part_paths:
+            for p in paths:
+                if p and not p in self._exists and not p in seen:
+                    seen.add(p)
+                    unchecked.append(p)
+        self._stat(unchecked)
+
+        missing = []
+        for part, paths in part_paths:
+            failed = [p for p in paths if not self.exists(p)]
+            if failed:
+                missing.append(MissingFile(part, failed))
+        return missing
+
+    def _stat(self, paths):
+        """Check the paths exist and add the results to the cache."""
+        if self.threads < 2 or len(paths) < 2:
+            results = [os.path.exists(p) for p in paths]
+        else:
+            pool = ThreadPool(min(self.threads, len(paths)))
+            try:
+                results = pool.map(os.path.exists, paths)
+            finally:
+                pool.close()
+                pool.join()
+        self._exists.update(zip(paths, results))
+        logger.debug('Checked %d paths' % len(paths))
+
+    def _relativeRoots(self, part):
+        """Get the relative roots of a part, caching those of its parents."""
+        parent = part.associates.parent
+        roots = list(self._parentRoots(parent)) if parent is not None else []
+        if part.relative_root:
+            roots.append(part.relative_root)
+        return roots
+
+    def _parentRoots(self, parent):
+        roots = self._roots.get(parent.hash)
+        if roots is None:
+            roots = parent.getRelativeRoots([])
+            self._roots[parent.hash] = roots
+        return roots
+
+
+def _extension(path):
+    if not path:
+        return ''
+    return os.path.splitext(path)[1][1:]
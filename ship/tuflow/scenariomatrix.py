@@ -0,0 +1,264 @@
+"""
+
+ Summary:
+     Resolve the files used by a tuflow model for every scenario and event.
+
+     A ScenarioMatrix enumerates the scenario/event combinations of a
+     TuflowModel, either from the terms of the If Scenario, If Event and
+     Define Event logic in the model or from the values given, and finds the
+     TuflowFile paths that are active for each one.
+
+     Which parts are active only depends on which logic clause groups are
+     active (see ControlFile.activation). Combinations that activate the same
+     groups in every control file share the same paths, so they are only
+     worked out once. The results are held as a list of the distinct path
+     sets and the index of the set used by each combination.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import itertools
+
+from ship.tuflow.tuflowfilepart import TuflowFile
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class ScenarioMatrix(object):
+    """The active file paths of a TuflowModel for each scenario and event.
+
+    After resolve() has been called:
+
+        combinations: list of (scenarios, events) tuples, each a tuple of
+            values.
+        path_sets: list of the distinct lists of paths found.
+        set_index: the index in path_sets of the paths for each combination.
+
+    Example::
+
+        matrix = ScenarioMatrix(tuflow_model)
+        matrix.resolve()
+        for (scenarios, events), paths in matrix.items():
+            print(scenarios, events, len(paths))
+
+        paths = matrix.paths(['DEV'], ['Q100'])
+    """
+
+    def __init__(self, tuflow_model, **kwargs):
+        """Constructor.
+
+        Args:
+            tuflow_model(TuflowModel): the loaded model.
+            **kwargs:
+                scenarios(list): the scenario values to use. Each entry can be
+                    a single value or a list of values that are used together
+                    (e.g. ['s1val', 's2val'] for a run with two scenarios).
+                    Default is every scenario term in the model logic.
+                events(list): the same as scenarios for the events.
+                user_vars(dict): placeholder variables to resolve in the paths
+                    (see TuflowPart.resolvePlaceholder()). If given, s1 - sN
+                    and e1 - eN are set to the values of each combination.
+                filepart_type: FILEPART_TYPES value, or list of values, to
+                    restrict the files to.
+                absolute(bool): if True (the default) absolute paths are
+                    returned, otherwise the filename and extension.
+        """
+        self.tuflow_model = tuflow_model
+        self.user_vars = kwargs.get('user_vars', None)
+        self.filepart_type = kwargs.get('filepart_type', None)
+        self.absolute = kwargs.get('absolute', True)
+
+        scenario_terms, event_terms = modelTerms(tuflow_model)
+        scenarios = kwargs.get('scenarios', scenario_terms)
+        events = kwargs.get('events', event_terms)
+        self.scenarios = [_asTuple(s) for s in scenarios] if scenarios else [()]
+        self.events = [_asTuple(e) for e in events] if events else [()]
+
+        self.combinations = []
+        self.path_sets = []
+        self.set_index = []
+
+    def __len__(self):
+        return len(self.combinations)
+
+    def resolve(self):
+        """Find the active paths for every combination.
+
+        Return:
+            list - of the combinations that were resolved.
+        """
+        control_files = list(self.tuflow_model.control_files.values())
+        has_placeholders = self.user_vars is not None and \
+            _hasPlaceholders(control_files)
+
+        self.combinations = list(itertools.product(self.scenarios, self.events))
+        self.path_sets = []
+        self.set_index = []
+        found = {}
+        for scenarios, events in self.combinations:
+            se_vals = {'scenario': list(scenarios), 'event': list(events)}
+            key = tuple(c.activation.groupStates(se_vals) for c in control_files)
+            user_vars = None
+            if self.user_vars is not None:
+                user_vars = combinationVariables(self.user_vars, scenarios, events)
+                if has_placeholders:
+                    key = (key, tuple(sorted(user_vars.items())))
+
+            index = found.get(key)
+            if index is None:
+                index = len(self.path_sets)
+                found[key] = index
+                self.path_sets.append(self._findPaths(control_files, se_vals,
+                                                     user_vars))
+            self.set_index.append(index)
+
+        logger.debug('Resolved %d combinations into %d path sets' % (
+            len(self.combinations), len(self.path_sets)))
+        return self.combinations
+
+    def paths(self, scenarios, events):
+        """Get the paths for a combination.
+
+        Args:
+            scenarios: a scenario value or list of values.
+            events: an event value or list of values.
+
+        Return:
+            list - of the active paths.
+
+        Raises:
+            KeyError: if the combination isn't in the matrix.
+        """
+        combination = (_asTuple(scenarios), _asTuple(events))
+        for i, c in enumerate(self.combinations):
+            if c == combination:
+                return self.path_sets[self.set_index[i]]
+        raise KeyError('Combination %s is not in the matrix' % (combination,))
+
+    def items(self):
+        """Get ((scenarios, events), paths) for each combination."""
+        return [(c, self.path_sets[i]) for c, i in zip(self.combinations, self.set_index)]
+
+    def allPaths(self):
+        """Get every path used by at least one combination, in order found."""
+        out = []
+        seen = set()
+        for paths in self.path_sets:
+            for p in paths:
+                if not p in seen:
+                    seen.add(p)
+                    out.append(p)
+        return out
+
+    def table(self):
+        """Get the matrix as a table of paths against combinations.
+
+        Return:
+            tuple - (list of paths, list of rows). Each row is a list of
+                bools, one for each combination, True where the path is used.
+        """
+        paths = self.allPaths()
+        set_members = [set(s) for s in self.path_sets]
+        rows = []
+        for p in paths:
+            used = [p in s for s in set_members]
+            rows.append([used[i] for i in self.set_index])
+        return paths, rows
+
+    def _findPaths(self, control_files, se_vals, user_vars):
+        """Get the paths from all the control files for one combination."""
+        out = []
+        seen = set()
+        for c in control_files:
+            for p in c.filepaths(self.filepart_type, self.absolute, se_vals=se_vals,
+                                 user_vars=user_vars):
+                if not p in seen:
+                    seen.add(p)
+                    out.append(p)
+        return out
+
+
+def modelTerms(tuflow_model):
+    """Get all of the scenario and event terms in the model logic.
+
+    Only logic that checks scenario and event values is included. The type
+    of each clause is taken from its command, so 'If Scenario' and
+    'Else If Scenario' terms are scenarios and 'If Event' and 'Define Event'
+    terms are events.
+
+    Return:
+        tuple - (scenario terms, event terms) as lists in the order found.
+    """
+    scenarios = []
+    events = []
+    seen = set()
+    for c in tuflow_model.control_files.values():
+        for group_key in c.activation.groups():
+            if group_key is None or group_key[0].hash in seen:
+                continue
+            logic = group_key[0]
+            seen.add(logic.hash)
+            if not logic.check_sevals:
+                continue
+            for command, terms in zip(logic.commands, logic.terms):
+                command = command.upper()
+                if 'SCENARIO' in command:
+                    found = scenarios
+                elif 'EVENT' in command:
+                    found = events
+                else:
+                    continue
+                for t in terms:
+                    if not t in found:
+                        found.append(t)
+    return scenarios, events
+
+
+def combinationVariables(user_vars, scenarios, events):
+    """Get the placeholder variables for a scenario/event combination.
+
+    Args:
+        user_vars(dict): the model variables.
+        scenarios(tuple): the scenario values.
+        events(tuple): the event values.
+
+    Return:
+        dict - a copy of user_vars with s1 - sN and e1 - eN set.
+    """
+    out = dict(user_vars)
+    for i, s in enumerate(scenarios):
+        out['s%d' % (i + 1)] = s
+    for i, e in enumerate(events):
+        out['e%d' % (i + 1)] = e
+    return out
+
+
+def _asTuple(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+def _hasPlaceholders(control_files):
+    """Check whether any of the TuflowFile paths contain a placeholder."""
+    for c in control_files:
+        for part in c.parts.select(TuflowFile):
+            if '<<' in (part.path_as_read or '') or '<<' in (part.root or ''):
+                return True
+    return False
@@ -4,7 +4,7 @@ import logging
 import os
 import copy
 
-from ship.tuflow.tuflowmodel import TuflowFilepartTypes
+from ship.tuflow.tuflowmodel import filepartTypes
 from ship.tuflow import FILEPART_TYPES as fpt
 from ship.tuflow import tuflowfilepart as tuflowpart
 from ship.utils import utilfunctions as uf
@@ -18,7 +18,7 @@ class TuflowFactory(object):
     @classmethod
     def getTuflowPart(cls, line, parent, part_type=None, logic=None):
 
-        filepart_types = TuflowFilepartTypes()
+        filepart_types = filepartTypes()
         line = line.strip()
         upline = line.upper()
         if part_type is None:
@@ -21,8 +21,10 @@
 from __future__ import unicode_literals
 
 import copy
-import uuid
+import itertools
 import os
+import re
+from collections import OrderedDict
 
 from ship.utils.filetools import PathHolder
 from ship.tuflow import FILEPART_TYPES as fpt
@@ -34,6 +36,133 @@ logger = logging.getLogger(__name__)
 """logging references with a __name__ set to this module."""
 
 
+_part_hashes = itertools.count(1)
+"""Source of the TuflowPart.hash values. Shared by the whole process."""
+
+
+def newPartHash():
+    """Get a new TuflowPart.hash.
+
+    The hashes are ints taken from a process wide counter, so they are unique
+    within a process and much cheaper to create, hash and compare than a
+    uuid. They are not unique across processes; parts that are unpickled
+    should be given a new hash.
+
+    Return:
+        int - a hash that hasn't been used before in this process.
+    """
+    return next(_part_hashes)
+
+
+def keyOwner(part):
+    """Get the part that counts the command and parent changes of a part.
+
+    This is the parent of the part, or the part itself if it doesn't have
+    one. See TuflowPart.key_changes.
+    """
+    parent = part.associates.parent
+    return parent if parent is not None else part
+
+
+class PlaceholderResolver(object):
+    """Replaces variable placeholders using a fixed set of user_vars.
+
+    All of the placeholders are compiled into a single regular expression,
+    so each string is only scanned once however many variables there are.
+    The resolved strings are stored, so resolving the same string again is
+    just a lookup.
+
+    If any of the names or values contain '<' or '>' the variables are
+    replaced one after the other instead, in the same way as they always
+    have been, because replacing one could then create another placeholder.
+
+    Don't change user_vars after creating the resolver. Use
+    placeholderResolver() to get one for a dict, which reuses the resolver
+    for the same variables.
+    """
+
+    def __init__(self, user_vars):
+        """Constructor.
+
+        Args:
+            user_vars(dict): see UserVariables.variablesTodict().
+        """
+        self.user_vars = dict(user_vars)
+        self._resolved = {}
+        self._pattern = None
+        self._nested = any('<' in v or '>' in v for v in
+                           itertools.chain(self.user_vars.keys(), self.user_vars.values()))
+        if self.user_vars and not self._nested:
+            keys = sorted(self.user_vars.keys(), key=len, reverse=True)
+            self._pattern = re.compile(
+                '<<(' + '|'.join(re.escape(k) for k in keys) + ')>>')
+
+    def __len__(self):
+        return len(self.user_vars)
+
+    def resolve(self, value):
+        """Replace any placeholders in value.
+
+        See TuflowPart.resolvePlaceholder() for more information.
+        """
+        if not self.user_vars or not '<<' in value:
+            return value
+        try:
+            return self._resolved[value]
+        except KeyError:
+            pass
+
+        if self._nested:
+            resolved = value
+            for vkey in self.user_vars.keys():
+                temp = '<<' + vkey + '>>'
+                if vkey in resolved:
+                    resolved = resolved.replace(temp, self.user_vars[vkey])
+        elif self._pattern is not None:
+            resolved = self._pattern.sub(self._replace, value)
+        else:
+            resolved = value
+        self._resolved[value] = resolved
+        return resolved
+
+    def _replace(self, match):
+        return self.user_vars[match.group(1)]
+
+
+_resolvers = OrderedDict()
+"""The most recently used PlaceholderResolver's. See placeholderResolver()."""
+
+_RESOLVER_CACHE_SIZE = 16
+
+
+def placeholderResolver(user_vars):
+    """Get a PlaceholderResolver for user_vars.
+
+    The resolvers for the most recently used sets of variables are kept, so
+    they are only compiled once for each state of the variables.
+
+    Args:
+        user_vars(dict | PlaceholderResolver): the variables. If this is
+            already a PlaceholderResolver it's returned as it is.
+
+    Return:
+        PlaceholderResolver
+    """
+    if isinstance(user_vars, PlaceholderResolver):
+        return user_vars
+    key = tuple(user_vars.items())
+    resolver = _resolvers.get(key)
+    if resolver is None:
+        resolver = PlaceholderResolver(user_vars)
+        _resolvers[key] = resolver
+        if len(_resolvers) > _RESOLVER_CACHE_SIZE:
+            _resolvers.popitem(last=False)
+    else:
+        _resolvers.pop(key)
+        _resolvers[key] = resolver
+    return resolver
+
+
 class AssociatedParts(object):
     """Stores associate TuflowPart references.
 
@@ -50,6 +179,19 @@ class AssociatedParts(object):
 
         self.notify_active_changed = kwargs.get('notify_active', None)
 
+    def __getstate__(self):
+        """Leave out notify_active_changed when pickling.
+
+        It's a bound method of the owning TuflowPart, which can't be pickled
+        on Python 2. It must be set again after unpickling.
+        """
+        state = self.__dict__.copy()
+        state['notify_active_changed'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     @property
     def parent(self):
         return self._parent
@@ -58,6 +200,8 @@ class AssociatedParts(object):
     def parent(self, value):
         if self._parent is not None:
             self._parent.observers.remove(self)
+            if value is not self._parent:
+                self._parent.key_changes += 1
 
         self._parent = value
         if value is not None:
@@ -89,11 +233,20 @@ class TuflowPart(object):
 
     def __init__(self, parent, obj_type, **kwargs):
         self.TOP_CLASS = 'part'
-        self.hash = uuid.uuid4()
+        self.hash = newPartHash()
         self.obj_type = obj_type
         self._active = kwargs.get('active', True)
         self.filepart_type = kwargs.get('filepart_type', None)
 
+        self.key_changes = 0
+        """Number of times the command or parent of a child part has changed.
+
+        Setting the command, or replacing the parent, of a part adds one to
+        this on its parent, or on the part itself if it doesn't have one (see
+        keyOwner()). It's used to find out whether anything that parts are
+        looked up by has changed (see controlfile.PartHolder).
+        """
+
         self.associates = AssociatedParts(parent, notify_active=self._parentActiveChanged)
         if 'logic' in kwargs.keys() and kwargs['logic'] is not None:
             self.associates.logic = kwargs['logic']
@@ -115,6 +268,16 @@ class TuflowPart(object):
         """Called when self.associated observedActiveChanged is called."""
         self.active = status
 
+    @property
+    def command(self):
+        return self._command
+
+    @command.setter
+    def command(self, value):
+        if '_command' in self.__dict__ and value != self._command:
+            keyOwner(self).key_changes += 1
+        self._command = value
+
     @property
     def active(self):
         return self._active
@@ -239,18 +402,20 @@ class TuflowPart(object):
             Read Materials File == '..\Materials_scen1.tmf
             Timestep == <<unknownvar>>
 
+        All of the placeholders are replaced in a single pass. When resolving
+        a lot of values with the same variables it's quicker to get a
+        PlaceholderResolver once with placeholderResolver() and pass that in
+        as user_vars.
+
         Args:
             value: the value to check for a placeholder and replace.
-            user_vars(dict): see UserVariables.variablesTodict().
+            user_vars(dict | PlaceholderResolver): see
+                UserVariables.variablesTodict().
 
         Return:
             the value, updated if found or the same if not.
         """
-        for vkey in user_vars.keys():
-            temp = '<<' + vkey + '>>'
-            if vkey in value:
-                value = value.replace(temp, user_vars[vkey])
-        return value
+        return placeholderResolver(user_vars).resolve(value)
 
     def getPrintableContents(self, **kwargs):
         """
@@ -266,19 +431,49 @@ class TuflowPart(object):
     def __eq__(self, other):
         return isinstance(other, TuflowPart) and other.hash == self.hash
 
-    @classmethod
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.hash)
+
     def copy(self, **kwargs):
-        new_version = copy.deepcopy(self)
+        """Get a copy of this TuflowPart with a new hash.
+
+        The copy shares the parent, logic and siblings of this part rather
+        than copying them and has no observers of its own.
+
+        **kwargs:
+            strip_unique=True(bool): remove the siblings and comment from the
+                copy.
+            keep_logic=False(bool): if strip_unique is True also keep the
+                logic reference.
 
-        new_version.hash = uuid.uuid4()
-        strip_unique = kwargs('strip_unique', True)
-        keep_logic = kwargs('keep_logic', False)
+        Return:
+            TuflowPart - the copy.
+        """
+        strip_unique = kwargs.get('strip_unique', True)
+        keep_logic = kwargs.get('keep_logic', False)
+        assoc = self.associates
+        memo = {id(self.observers): []}
+        for other in (assoc.parent, assoc.logic, assoc.sibling_prev, assoc.sibling_next):
+            if other is not None:
+                memo[id(other)] = other
+        new_version = copy.deepcopy(self, memo)
+        new_version.hash = newPartHash()
+
+        new_assoc = new_version.associates
+        new_assoc.notify_active_changed = new_version._parentActiveChanged
         if strip_unique:
-            new_version.sibling_next = None
-            new_version.sibling_prev = None
+            new_assoc.sibling_next = None
+            new_assoc.sibling_prev = None
             new_version.comment = ''
             if not keep_logic:
-                new_version.logic = None
+                new_assoc._logic = None
+        if new_assoc.parent is not None:
+            new_assoc.parent.observers.append(new_assoc)
+        if new_assoc.logic is not None:
+            new_assoc.logic.observers.append(new_assoc)
 
         return new_version
 
@@ -486,7 +681,7 @@ class TuflowFile(TuflowPart, PathHolder):
     def duplicate_comparison(self):
         return self.command + self.filename
 
-    def absolutePathAllTypes(self, user_vars=None):
+    def absolutePathAllTypes(self, user_vars=None, relative_roots=None):
         """Get the absolute paths for all_types.
 
         If the file has other file types in all_types (e.g. .shp, shx, .dbf)
@@ -496,8 +691,14 @@ class TuflowFile(TuflowPart, PathHolder):
             user_vars(dict): a dict containing variable placeholder values as
                 keys and the actual values as values. See
                 TuflowPart.resolvePlaceholder() method for more information.
+            relative_roots=None(list): the result of getRelativeRoots() if
+                it's already known.
         """
-        rel_roots = self.getRelativeRoots([])
+        if relative_roots is None:
+            relative_roots = self.getRelativeRoots([])
+        rel_roots = relative_roots
+        if user_vars:
+            user_vars = placeholderResolver(user_vars)
         paths = []
         if self.all_types:
             all_types = self.all_types
@@ -518,19 +719,22 @@ class TuflowFile(TuflowPart, PathHolder):
             paths.append(fpath)
         return paths
 
-    def absolutePath(self, user_vars=None):
+    def absolutePath(self, user_vars=None, relative_roots=None):
         """Get the absolute path of this object.
 
         Args:
             user_vars(dict): a dict containing variable placeholder values as
                 keys and the actual values as values. See
                 TuflowPart.resolvePlaceholder() method for more information.
+            relative_roots=None(list): the result of getRelativeRoots() if
+                it's already known.
         """
         if self.has_own_root:
             abs_path = PathHolder.absolutePath(self)
         else:
-            rel_roots = self.getRelativeRoots([])
-            abs_path = PathHolder.absolutePath(self, relative_roots=rel_roots)
+            if relative_roots is None:
+                relative_roots = self.getRelativeRoots([])
+            abs_path = PathHolder.absolutePath(self, relative_roots=relative_roots)
 
         # Replace any variable placeholders if given
         if user_vars:
@@ -718,6 +922,9 @@ class TuflowLogic(TuflowPart):
         self.END_CLAUSE = 'End'
         """Override with with whatever the end statement is (e.g. 'End If')"""
 
+        self.version = 0
+        """Incremented when a part or clause is added or removed."""
+
     def addPart(self, part, group=-1, **kwargs):
         """Add a new TuflowPart.
 
@@ -735,6 +942,7 @@ class TuflowLogic(TuflowPart):
         part.associates.logic = self
         self.parts.append(part.hash)
         self.group_parts[group].append(part)
+        self.version += 1
         if not skip_callback:
             self.add_callback(part, self.group_parts[group][-1])
 
@@ -757,6 +965,7 @@ class TuflowLogic(TuflowPart):
         new_part.associates.logic = self
         self.parts.append(new_part.hash)
         self.group_parts[g].insert(index, new_part)
+        self.version += 1
         self.add_callback(new_part, adjacent_part)
 
     def removePart(self, part):
@@ -779,6 +988,7 @@ class TuflowLogic(TuflowPart):
                 if val == part:
                     del self.group_parts[i][j]
                     break
+        self.version += 1
 
         if self.group_parts and self.group_parts[-1]:
             last_part = self.group_parts[-1][-1]
@@ -834,10 +1044,10 @@ class TuflowLogic(TuflowPart):
 
     def isTuflowPart(self, part):
         """Internal function."""
-        if isinstance(part, uuid.UUID):
-            return False
-        elif isinstance(part, TuflowPart):
+        if isinstance(part, TuflowPart):
             return True
+        elif isinstance(part, int):
+            return False
         else:
             raise TypeError('filepart must be either TuflowPart or TuflowPart.hash')
 
@@ -866,6 +1076,25 @@ class TuflowLogic(TuflowPart):
             out.extend(terms)
         return out
 
+    def termsType(self):
+        """Get the se_vals key that the terms of this logic are checked against.
+
+        This is taken from the first command, so 'If Scenario' logic is
+        checked against the scenarios and 'If Event' or 'Define Event' logic
+        against the events.
+
+        Return:
+            str - 'scenario', 'event' or None if the command doesn't say.
+        """
+        if not self.commands:
+            return None
+        command = self.commands[0].upper()
+        if 'SCENARIO' in command:
+            return 'scenario'
+        elif 'EVENT' in command:
+            return 'event'
+        return None
+
     def isInTerms(self, part, se_vals):
         """Checks to see if the clause terms associated with part match se_vals.
 
@@ -882,24 +1111,48 @@ class TuflowLogic(TuflowPart):
         """
         if not self.check_sevals:
             return True
-        
+        return self.isGroupInTerms(self.getGroup(part), se_vals)
+
+    def isGroupInTerms(self, group, se_vals):
+        """Checks to see if the clause terms of a group match se_vals.
+
+        This is the test done by isInTerms() once the group of the part has
+        been found. It allows the result to be shared by all of the parts in
+        a group.
+
+        Args:
+            group(int): index of the clause group, or -1 if the part wasn't
+                found.
+            se_Vals(dict): in format {'scenario': [list, of]. 'event': [terms]}.
+
+        Return:
+            bool - True if the group is within the given se_vals, otherwise False.
+        """
+        if not self.check_sevals:
+            return True
+
         retval = False
-        group = self.getGroup(part)
         if group == -1:
             return False
         terms = self.terms[group]
         command = self.commands[group]
         se_keys = se_vals.keys()
+        terms_type = self.termsType()
 
         '''
         If 'Else' we need to check if it's NOT in any of the terms. So check
         all of the terms and compare against the se_vals. If there's no
-        match then we set retval to True.
+        match then we set retval to True. Only the se_vals of the type that
+        the logic tests are used (see termsType()), so an Else in an
+        'If Event' block isn't decided by the scenarios.
         '''
         if command.upper() == 'ELSE':
             all_terms = self.allTerms()
             found = True
-            if 'scenario' in se_keys:
+            if terms_type is not None:
+                if terms_type in se_keys:
+                    found = set(all_terms).isdisjoint(set(se_vals[terms_type]))
+            elif 'scenario' in se_keys:
                 found = set(all_terms).isdisjoint(set(se_vals['scenario']))
             elif 'event' in se_keys:
                 found = set(all_terms).isdisjoint(set(se_vals['event']))
@@ -1029,6 +1282,7 @@ class IfLogic(TuflowLogic):
             self.terms.append([])
         self.comments.append(comment)
         self.group_parts.append([])
+        self.version += 1
 
 
 class BlockLogic(TuflowLogic):
@@ -30,7 +30,10 @@ from __future__ import unicode_literals
 
 from itertools import chain
 
-from ship.tuflow.tuflowfilepart import TuflowFile, TuflowKeyValue, TuflowUserVariable, TuflowModelVariable
+from ship.tuflow.tuflowfilepart import TuflowFile, TuflowKeyValue, TuflowUserVariable, TuflowModelVariable, \
+    placeholderResolver
+from ship.tuflow.scenariomatrix import ScenarioMatrix
+from ship.tuflow.pathchecker import PathChecker
 from ship.tuflow import FILEPART_TYPES as fpt
 from ship.utils import utilfunctions as uf
 
@@ -79,12 +82,42 @@ class TuflowModel(object):
         self._root = value
         self.updateRoot(value)
 
-    def checkPathsExist(self):
-        """Test that all of the filepaths in the TuflowModel exist."""
-        failed = []
+    def checkPathsExist(self, se_vals=None, **kwargs):
+        """Test that all of the filepaths in the TuflowModel exist.
+
+        All of the control files are checked with the same PathChecker, so
+        files used in more than one control file are only checked once.
+
+        Args:
+            se_vals=None(dict): to select only those TuflowFile's that are
+                within certain scenario and event clauses.
+            **kwargs: see ControlFile.checkPathsExist().
+
+        Return:
+            list - containing all TuflowFile's that failed the check.
+        """
+        kwargs.setdefault('all_types', False)
+        return [m.part for m in self.missingFiles(se_vals, **kwargs)]
+
+    def missingFiles(self, se_vals=None, **kwargs):
+        """Get the details of the filepaths in the TuflowModel that don't exist.
+
+        Args:
+            se_vals=None(dict): to select only those TuflowFile's that are
+                within certain scenario and event clauses.
+            **kwargs: see ControlFile.missingFiles().
+
+        Return:
+            list - of pathchecker.MissingFile for every TuflowFile that failed
+                the check.
+        """
+        if kwargs.get('checker', None) is None:
+            kwargs['checker'] = PathChecker(all_types=kwargs.get('all_types', True),
+                                            user_vars=kwargs.get('user_vars', None))
+        missing = []
         for file_type, file in self.control_files.items():
-            failed.extend(file.checkPathsExist())
-        return failed
+            missing.extend(file.missingFiles(se_vals, **kwargs))
+        return missing
 
     def updateRoot(self, root):
         """Update the root variable in all TuflowFile's in the model.
@@ -103,6 +136,18 @@ class TuflowModel(object):
         for c in self.control_files.values():
             c.updateRoot(root)
 
+    def scenarioMatrix(self, **kwargs):
+        """Get the active file paths for every scenario and event combination.
+
+        All kwargs are passed onto ScenarioMatrix. See there for more details.
+
+        Return:
+            ScenarioMatrix - that has been resolved.
+        """
+        matrix = ScenarioMatrix(self, **kwargs)
+        matrix.resolve()
+        return matrix
+
     def customPartSearch(self, control_callback, tuflow_callback=None,
                          include_unknown=False):
         """Return TuflowPart's based on the return value of the callbacks.
@@ -384,6 +429,17 @@ class UserVariables(object):
             out[vkey] = vval.variable
         return out
 
+    def resolver(self):
+        """Get a PlaceholderResolver for the current variables.
+
+        The resolver is only compiled again when the variables change. See
+        tuflowfilepart.placeholderResolver().
+
+        Return:
+            PlaceholderResolver - that can be used as user_vars.
+        """
+        return placeholderResolver(self.variablesToDict())
+
     def seValsToDict(self):
         """Get the values of the scenario and event variables.
 
@@ -439,6 +495,84 @@ class UserVariables(object):
             return self.variable[key]
 
 
+class KeywordMatcher(object):
+    """Prefix tree for finding the keywords that a line starts with.
+
+    Each keyword is stored with a priority and a key. Looking up a line
+    walks the tree one character at a time, so the cost depends on the
+    length of the longest keyword rather than on how many keywords there
+    are.
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, word, priority, key):
+        """Add a keyword.
+
+        Args:
+            word(str): the keyword. Lines match if they start with it.
+            priority: sortable value; the lowest priority match is returned
+                by first().
+            key: value returned with the keyword when it matches.
+        """
+        node = self._root
+        for c in word:
+            node = node.setdefault(c, {})
+        node.setdefault(None, []).append((priority, word, key))
+
+    def matches(self, line):
+        """Get all of the keywords that the line starts with.
+
+        Return:
+            list - of (priority, word, key) tuples.
+        """
+        found = []
+        node = self._root
+        for c in line:
+            node = node.get(c)
+            if node is None:
+                break
+            if None in node:
+                found.extend(node[None])
+        return found
+
+    def first(self, line):
+        """Get the highest priority keyword that the line starts with.
+
+        Return:
+            tuple - (word, key) or None if no keyword matches.
+        """
+        found = self.matches(line)
+        if not found:
+            return None
+        _, word, key = min(found, key=lambda m: m[0])
+        return word, key
+
+    def keys(self, line):
+        """Get the keys of all of the keywords that the line starts with."""
+        return set(m[2] for m in self.matches(line))
+
+
+_filepart_types = None
+"""The shared TuflowFilepartTypes instance. See filepartTypes()."""
+
+
+def filepartTypes():
+    """Get the TuflowFilepartTypes shared by the loaders and factory.
+
+    The lookup tables and keyword matcher are only built the first time this
+    is called.
+
+    Return:
+        TuflowFilepartTypes
+    """
+    global _filepart_types
+    if _filepart_types is None:
+        _filepart_types = TuflowFilepartTypes()
+    return _filepart_types
+
+
 class TuflowFilepartTypes(object):
     """Contains key words from Tuflow files for lookup.
 
@@ -511,6 +645,18 @@ class TuflowFilepartTypes(object):
             'BC EVENT SOURCE', 
         ]
         self.types[fpt.MODEL_VARIABLE] = ['MODEL SCENARIOS', 'MODEL EVENTS', ]
+        self.compile()
+
+    def compile(self):
+        """Build the keyword matcher from the ambiguous and types tables.
+
+        Called by the constructor. Must be called again if the types or
+        ambiguous tables are changed after construction.
+        """
+        self._matcher = KeywordMatcher()
+        for category, (key, words) in enumerate(self.types.items()):
+            for order, word in enumerate(words):
+                self._matcher.add(word, (category, order), key)
 
     def find(self, find_val, file_type='*'):
         """Checks if the given value is known or not.
@@ -528,6 +674,12 @@ class TuflowFilepartTypes(object):
         dealt with by secondary check to see if the next character is '=' or
         not.
 
+        The lookup is done with a precompiled KeywordMatcher, so the cost
+        depends on the length of the command rather than the number of known
+        keywords. Where a value starts with keywords from more than one type
+        the type that comes first in self.types wins, and within a type the
+        keyword that comes first in its list.
+
         Args:
             find_val (str): the value attempt to find in the lookup table.
             file_type (int): Optional - reduce the lookup time by providing 
@@ -540,17 +692,15 @@ class TuflowFilepartTypes(object):
         """
         find_val = find_val.upper()
         if file_type == '*':
-            for key, part_type in self.types.items():
-                found = [i for i in part_type if find_val.startswith(i)]
-                if found:
-                    retval = key
-                    if found[0] in self.ambiguous_keys:
-                        retval = self._checkAmbiguity(found[0], find_val, key)
-                    return True, retval
+            match = self._matcher.first(find_val)
+            if match is not None:
+                word, retval = match
+                if word in self.ambiguous_keys:
+                    retval = self._checkAmbiguity(word, find_val, retval)
+                return True, retval
             return (False, None)
         else:
-            found = [i for i in self.types[file_type] if find_val.startswith(i)]
-            if found:
+            if file_type in self._matcher.keys(find_val):
                 return True, file_type
             return (False, None)
 
@@ -0,0 +1,252 @@
+"""
+
+ Summary:
+     Cache of parsed tuflow control files for the TuflowLoader.
+
+     Loading the same model for several scenario/event combinations parses
+     every control file again each time. A ControlFileCache stores the parts
+     and logic read from each control file, keyed by the absolute path of
+     the file and the model root, and checked against the modification time
+     and size of the file. Files that haven't changed are rebuilt from the
+     cache rather than being read and parsed.
+
+     Entries are stored pickled, with the ModelFile that the parts belong to
+     left out, so every load gets its own copy of the parts attached to its
+     own ModelFile. If a cache_dir is given the entries are also written to
+     disk so that they can be used by other processes.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import os
+import pickle
+from collections import OrderedDict
+
+from ship.tuflow.tuflowfilepart import newPartHash
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+CACHE_VERSION = 4
+"""Stored with the disk entries. Entries with a different version are ignored."""
+
+_CONTROL_PART_ID = 'control_part'
+
+
+class ControlFileCache(object):
+    """Parsed control file contents keyed by path, root, mtime and size.
+
+    Example::
+
+        cache = ControlFileCache(cache_dir='c:/temp/tuflow_cache')
+        loader = FileLoader()
+        for scenario in scenarios:
+            model = loader.loadFile(tcf_path, {'scenario': scenario,
+                                               'cache': cache})
+    """
+
+    def __init__(self, cache_dir=None, maxsize=512):
+        """Constructor.
+
+        Args:
+            cache_dir=None(str): folder to write the entries to. If None the
+                entries are only held in memory.
+            maxsize=512(int): largest number of entries held in memory.
+        """
+        self.cache_dir = cache_dir
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if cache_dir is not None and not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries from memory and from the cache_dir."""
+        self._entries.clear()
+        if self.cache_dir is not None:
+            for f in os.listdir(self.cache_dir):
+                if f.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, f))
+
+    def contains(self, path, root):
+        """Check whether there is an up to date entry for a control file."""
+        stamp = fileStamp(path)
+        return stamp is not None and self._load(path, root, stamp) is not None
+
+    def get(self, path, root, control_part):
+        """Get the parsed contents of a control file.
+
+        Args:
+            path(str): absolute path of the control file.
+            root(str): root of the model it's being loaded into.
+            control_part(ModelFile): the part that the contents will belong
+                to.
+
+        Return:
+            tuple - (contents, logic) as returned by
+                TuflowLoader._readControlFile(), or None if there isn't an up
+                to date entry.
+        """
+        stamp = fileStamp(path)
+        data = self._load(path, root, stamp) if stamp is not None else None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return restoreParts(data, control_part)
+
+    def put(self, path, root, control_part, contents, logic):
+        """Store the parsed contents of a control file.
+
+        Args:
+            See get().
+            contents(list): the TuflowPart's read from the file.
+            logic(list): the TuflowLogic's read from the file.
+        """
+        stamp = fileStamp(path)
+        if stamp is None:
+            return
+        try:
+            data = storeParts(contents, logic, control_part)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            logger.warning('Unable to cache control file %s: %s' % (path, err))
+            return
+
+        key = (path, root)
+        self._entries.pop(key, None)
+        self._entries[key] = (stamp, data)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        if self.cache_dir is not None:
+            try:
+                with open(self._diskPath(path, root), 'wb') as f:
+                    pickle.dump((CACHE_VERSION, path, root, stamp, data), f,
+                                pickle.HIGHEST_PROTOCOL)
+            except (IOError, OSError) as err:
+                logger.warning('Unable to write cache file for %s: %s' % (path, err))
+
+    def _load(self, path, root, stamp):
+        """Get the stored data for a file if it has the same stamp."""
+        key = (path, root)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == stamp:
+                return entry[1]
+            del self._entries[key]
+
+        if self.cache_dir is None:
+            return None
+        disk_path = self._diskPath(path, root)
+        if not os.path.exists(disk_path):
+            return None
+        try:
+            with open(disk_path, 'rb') as f:
+                version, dpath, droot, dstamp, data = pickle.load(f)
+        except Exception as err:
+            logger.warning('Unable to read cache file %s: %s' % (disk_path, err))
+            return None
+        if version != CACHE_VERSION or dpath != path or droot != root or dstamp != stamp:
+            return None
+        self._entries[key] = (stamp, data)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return data
+
+    def _diskPath(self, path, root):
+        name = hashlib.sha1(('%s|%s' % (path, root)).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + '.pkl')
+
+
+def fileStamp(path):
+    """Get the (modification time, size) of a file, or None if it's missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime, st.st_size)
+
+
+class _PartPickler(pickle.Pickler):
+    """Pickler that leaves out the ModelFile the parts belong to."""
+
+    def __init__(self, f, control_part):
+        pickle.Pickler.__init__(self, f, pickle.HIGHEST_PROTOCOL)
+        self.control_part = control_part
+
+    def persistent_id(self, obj):
+        if obj is self.control_part:
+            return _CONTROL_PART_ID
+        return None
+
+
+class _PartUnpickler(pickle.Unpickler):
+    """Unpickler that attaches the parts to a new ModelFile."""
+
+    def __init__(self, f, control_part):
+        pickle.Unpickler.__init__(self, f)
+        self.control_part = control_part
+
+    def persistent_load(self, pid):
+        if pid == _CONTROL_PART_ID:
+            return self.control_part
+        raise pickle.UnpicklingError('Unknown persistent id: %s' % pid)
+
+
+def storeParts(contents, logic, control_part):
+    """Pickle the contents of a control file without its ModelFile.
+
+    Return:
+        bytes - the pickled (contents, logic).
+    """
+    f = io.BytesIO()
+    _PartPickler(f, control_part).dump((contents, logic))
+    return f.getvalue()
+
+
+def restoreParts(data, control_part):
+    """Unpickle the contents of a control file onto a ModelFile.
+
+    Every part is given a new hash and is registered as an observer of the
+    control_part, as it would be if it had just been created. The hashes
+    stored in TuflowLogic.parts are updated to match and the
+    AssociatedParts.notify_active_changed callback, which isn't pickled, is
+    set back to the part that owns it.
+
+    Return:
+        tuple - (contents, logic).
+    """
+    contents, logic = _PartUnpickler(io.BytesIO(data), control_part).load()
+    new_hashes = {}
+    for part in contents + logic:
+        new_hash = newPartHash()
+        new_hashes[part.hash] = new_hash
+        part.hash = new_hash
+        part.associates.notify_active_changed = part._parentActiveChanged
+        if part.associates.parent is control_part:
+            control_part.observers.append(part.associates)
+    for l in logic:
+        l.parts = [new_hashes.get(h, h) for h in l.parts]
+    return contents, logic
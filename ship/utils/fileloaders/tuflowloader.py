@@ -3,10 +3,11 @@ from __future__ import unicode_literals
 import logging
 import os
 import uuid
+from multiprocessing.pool import ThreadPool
 
 from ship.tuflow import FILEPART_TYPES as fpt
 from ship.utils import utilfunctions as uf
-from ship.tuflow.tuflowmodel import TuflowModel, TuflowFilepartTypes, UserVariables
+from ship.tuflow.tuflowmodel import TuflowModel, UserVariables, filepartTypes
 from ship.tuflow import controlfile as control
 from ship.tuflow import tuflowfilepart as tuflowpart
 from ship.utils.fileloaders.loader import ALoader
@@ -18,9 +19,24 @@ logger = logging.getLogger(__name__)
 
 class TuflowLoader(ALoader):
 
-    def __init__(self):
+    def __init__(self, read_threads=1, cache=None):
+        """Constructor.
+
+        Args:
+            read_threads=1(int): number of threads used to read the control
+                files. If greater than 1 each control file is read in the
+                background as soon as it is found, while the files before it
+                are still being parsed. Can be overridden with the
+                'read_threads' key in the loadModel() arg_dict.
+            cache=None(ControlFileCache): cache of parsed control files. If
+                given, control files that haven't changed since they were
+                cached are not read or parsed again. Can be overridden with
+                the 'cache' key in the loadModel() arg_dict.
+        """
         super(TuflowLoader, self).__init__()
-        self.types = TuflowFilepartTypes()
+        self.types = filepartTypes()
+        self.read_threads = read_threads
+        self.cache = cache
 
         self.user_variables = UserVariables()
         """Any event values that are passed through."""
@@ -42,6 +58,9 @@ class TuflowLoader(ALoader):
 #         self.event_vals = {}
         self.tuflow_model = None
         self._control_files = []
+        self._read_pool = None
+        self._reads = {}
+        self._cache = self.cache
 
     def loadFile(self, tcf_path, arg_dict={}):
         """Main loader function defined by the ALoader interface.
@@ -53,8 +72,19 @@ class TuflowLoader(ALoader):
         return self.loadModel(tcf_path, arg_dict)
 
     def loadModel(self, tcf_path, arg_dict={}):
-        """Load a full tuflow model from the given tcf path."""
+        """Load a full tuflow model from the given tcf path.
+
+        Args:
+            tcf_path(str): path to the tcf file.
+            arg_dict={}(dict): may contain:
+                'scenario': dict of scenario values, e.g. {'s1': 'scen1'}.
+                'event': dict of event values.
+                'read_threads': number of threads used to read the control
+                    files. See __init__.
+                'cache': ControlFileCache to use. See __init__.
+        """
         self._resetLoader()
+        self._cache = arg_dict.get('cache', self.cache)
 
         if 'scenario' in arg_dict.keys():
             self._has_scenario = True
@@ -93,7 +123,7 @@ class TuflowLoader(ALoader):
         self._file_queue.enqueue(main_file)
 
         # Read the control files and their contents into memory
-        self._fetchTuflowModel(root)
+        self._fetchTuflowModel(root, arg_dict.get('read_threads', self.read_threads))
 
         # Order the input and create the actual ControlFile objects
         self._orderModel(tcf_path)
@@ -119,7 +149,7 @@ class TuflowLoader(ALoader):
         self._resetLoader()
         root = model_file.root
         self._file_queue.enqueue(model_file)
-        self._fetchTuflowModel(root)
+        self._fetchTuflowModel(root, self.read_threads)
         _load_list = self._load_list[path]
         model = self._file_list[path]
         mtype = model_file.model_type
@@ -182,16 +212,47 @@ class TuflowLoader(ALoader):
         #
     '''
 
-    def _fetchTuflowModel(self, root):
+    def _fetchTuflowModel(self, root, read_threads=1):
         """Read all of the control files into memory.
+
+        The control files are always parsed one at a time in queue order, so
+        the result is the same however many read_threads are used. With more
+        than one thread the file reads are started in a ThreadPool as soon as
+        the ModelFile parts referencing them are created (see _enqueue()), so
+        reading the later files overlaps with parsing the earlier ones.
         """
         self.missing_model_files = []
+        if read_threads > 1:
+            self._read_pool = ThreadPool(read_threads)
+            for control_part in self._file_queue.items:
+                self._prefetch(control_part)
+
+        try:
+            self._parseQueue(root)
+        finally:
+            if self._read_pool is not None:
+                self._read_pool.close()
+                self._read_pool.join()
+                self._read_pool = None
+            self._reads = {}
+        del self._file_queue
 
+    def _parseQueue(self, root):
+        """Parse the control files in the queue until it's empty."""
         # Keep processing control files until there are none left in the queue
         while not self._file_queue.isEmpty():
             control_part = self._file_queue.dequeue()
             cpath = control_part.absolutePath()
-            raw_contents = self.getFile(cpath)
+            if self._cache is not None:
+                cached = self._cache.get(cpath, root, control_part)
+                if cached is not None:
+                    self._addContents(cpath, control_part, *cached)
+                    continue
+
+            if cpath in self._reads:
+                raw_contents = self._reads[cpath].get()
+            else:
+                raw_contents = self.getFile(cpath)
 
             # If we couldn't load the file add it to the missing list
             if raw_contents == False:
@@ -199,11 +260,39 @@ class TuflowLoader(ALoader):
                 continue
 
             contents, logic = self._readControlFile(raw_contents, root, control_part)
-            self._load_list[cpath] = contents
-            self._logic_list[cpath] = logic
-            self._file_list[cpath] = control_part
+            if self._cache is not None:
+                self._cache.put(cpath, root, control_part, contents, logic)
+            self._addContents(cpath, control_part, contents, logic)
 
-        del self._file_queue
+    def _addContents(self, cpath, control_part, contents, logic):
+        """Store the parsed contents of a control file.
+
+        Queues any control files that it references and adds any user and
+        model variables to self.user_variables.
+        """
+        for p in contents:
+            if isinstance(p, tuflowpart.ModelFile):
+                self._enqueue(p)
+            elif isinstance(p, tuflowpart.TuflowModelVariable):
+                if not self.user_variables.has_cmd_args:
+                    self.user_variables.add(p)
+            elif isinstance(p, tuflowpart.TuflowUserVariable):
+                self.user_variables.add(p)
+        self._load_list[cpath] = contents
+        self._logic_list[cpath] = logic
+        self._file_list[cpath] = control_part
+
+    def _enqueue(self, control_part):
+        """Add a ModelFile to the queue of control files to load."""
+        self._file_queue.enqueue(control_part)
+        if self._read_pool is not None:
+            self._prefetch(control_part)
+
+    def _prefetch(self, control_part):
+        """Start reading a control file in the background."""
+        cpath = control_part.absolutePath()
+        if not cpath in self._reads:
+            self._reads[cpath] = self._read_pool.apply_async(self.getFile, (cpath,))
 
     def _readControlFile(self, raw_contents, root, control_part):
         """Load the content of a control file.
@@ -281,16 +370,6 @@ class TuflowLoader(ALoader):
             # All other FilePart types
             else:
                 parts = factory.getTuflowPart(line, control_part, key, current_logic)
-                if key == fpt.MODEL:
-                    for p in parts:
-                        self._file_queue.enqueue(p)
-                if key == fpt.MODEL_VARIABLE:
-                    for p in parts:
-                        if not self.user_variables.has_cmd_args:
-                            self.user_variables.add(p)
-                if key == fpt.USER_VARIABLE:
-                    for p in parts:
-                        self.user_variables.add(p)
 
             for p in parts:
                 contents.append(p)
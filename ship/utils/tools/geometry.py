@@ -4,6 +4,10 @@
      Contains tools used to calculate geoemtric properties, such as polygon
      area and perimiter.
 
+     The batch functions work on many polygons (or lines) at once, passed as
+     flat lists of x and y values plus a list of offsets, so that the caller
+     doesn't need to build a list of tuples for every polygon.
+
  Author:  
      Duncan Runnacles
 
@@ -19,6 +23,10 @@
 
 """
 
+from __future__ import division
+
+import math
+
 
 def polygonArea(xy_vals):
     """Calculate the area of an irregular polygon.
@@ -38,3 +46,291 @@ def polygonArea(xy_vals):
         area -= xy_vals[j][0] * xy_vals[i][1]
     area = abs(area) / 2.0
     return area
+
+
+def pointInPolygon(x, y, xy_vals):
+    """Check whether a point lies inside an irregular polygon.
+
+    Uses the ray casting (even-odd) rule. Points lying exactly on an edge may
+    be reported as either inside or outside.
+
+    Args:
+        x(float): the x coordinate of the point.
+        y(float): the y coordinate of the point.
+        xy_vals(list): containing a tuple in each element with the x and y 
+            values for the polygon vertices. The polygon does not need to be
+            closed (first vertex repeated at the end).
+
+    Return:
+        bool - True if the point is inside the polygon or False otherwise.
+    """
+    inside = False
+    n = len(xy_vals)
+    j = n - 1
+    for i in range(n):
+        xi, yi = xy_vals[i][0], xy_vals[i][1]
+        xj, yj = xy_vals[j][0], xy_vals[j][1]
+        if (yi > y) != (yj > y):
+            if x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+        j = i
+    return inside
+
+
+def flattenPolygons(polygons):
+    """Convert a list of polygons to flat coordinate lists and offsets.
+
+    The batch functions below take many polygons (or lines) at once as a
+    list of x values, a list of y values and a list of offsets. The vertices
+    of polygon i are xs[offsets[i]:offsets[i + 1]], so there is one more
+    offset than there are polygons.
+
+    Args:
+        polygons(list): containing a list of (x, y) tuples for each polygon.
+
+    Return:
+        tuple - (xs, ys, offsets) lists.
+    """
+    xs = []
+    ys = []
+    offsets = [0]
+    for poly in polygons:
+        for p in poly:
+            xs.append(p[0])
+            ys.append(p[1])
+        offsets.append(len(xs))
+    return xs, ys, offsets
+
+
+def polygonAreas(xs, ys, offsets):
+    """Calculate the area of many polygons at once.
+
+    Args:
+        xs(list): x values of all of the polygons. See flattenPolygons().
+        ys(list): y values of all of the polygons.
+        offsets(list): start index of each polygon plus the total length.
+
+    Return:
+        list - the area of each polygon.
+    """
+    return [abs(a) for a in _signedAreas(xs, ys, offsets)]
+
+
+def polygonCentroids(xs, ys, offsets):
+    """Calculate the centroid of many polygons at once.
+
+    Polygons with no area use the mean of their vertices. Polygons with no
+    vertices give None.
+
+    Args:
+        See polygonAreas().
+
+    Return:
+        list - of (x, y) tuples.
+    """
+    out = []
+    areas = _signedAreas(xs, ys, offsets)
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        if start == end:
+            out.append(None)
+            continue
+        a = areas[i]
+        if a == 0:
+            n = float(end - start)
+            out.append((sum(xs[start:end]) / n, sum(ys[start:end]) / n))
+            continue
+        cx = cy = 0.0
+        for k in range(start, end):
+            j = k + 1 if k + 1 < end else start
+            cross = xs[k] * ys[j] - xs[j] * ys[k]
+            cx += (xs[k] + xs[j]) * cross
+            cy += (ys[k] + ys[j]) * cross
+        out.append((cx / (6.0 * a), cy / (6.0 * a)))
+    return out
+
+
+def polygonPerimeters(xs, ys, offsets, closed=True):
+    """Calculate the perimeter of many polygons at once.
+
+    Args:
+        See polygonAreas().
+        closed=True(bool): include the edge from the last vertex back to the
+            first. Set to False to get the length of lines.
+
+    Return:
+        list - the perimeter of each polygon.
+    """
+    out = []
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        total = 0.0
+        for k in range(start + 1, end):
+            total += math.hypot(xs[k] - xs[k - 1], ys[k] - ys[k - 1])
+        if closed and end - start > 2:
+            total += math.hypot(xs[start] - xs[end - 1], ys[start] - ys[end - 1])
+        out.append(total)
+    return out
+
+
+def clipPolygonsAtLevel(xs, ys, offsets, levels, below=True):
+    """Clip many polygons at a horizontal level.
+
+    Uses Sutherland-Hodgman clipping against the half plane y <= level (or
+    y >= level if below is False). Polygons that are entirely on the wrong
+    side of the level are returned with no vertices.
+
+    Args:
+        See polygonAreas().
+        levels(float | list): a single level for all polygons or a level for
+            each polygon.
+        below=True(bool): keep the part below the level if True or above it
+            if False.
+
+    Return:
+        tuple - (xs, ys, offsets) of the clipped polygons.
+    """
+    levels = _perPolygon(levels, offsets)
+    out_x = []
+    out_y = []
+    out_offsets = [0]
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        level = levels[i]
+        for k in range(start, end):
+            j = k - 1 if k > start else end - 1
+            x0, y0, x1, y1 = xs[j], ys[j], xs[k], ys[k]
+            in0 = y0 <= level if below else y0 >= level
+            in1 = y1 <= level if below else y1 >= level
+            if in0 != in1:
+                out_x.append(x0 + (x1 - x0) * (level - y0) / (y1 - y0))
+                out_y.append(level)
+            if in1:
+                out_x.append(x1)
+                out_y.append(y1)
+        out_offsets.append(len(out_x))
+    return out_x, out_y, out_offsets
+
+
+def clipLinesAtLevel(xs, ys, offsets, levels):
+    """Cap many lines at a horizontal level.
+
+    Any y values above the level are set to the level and a point is added
+    wherever a line crosses it, so that the capped line still follows the
+    original shape.
+
+    Args:
+        See polygonAreas().
+        levels(float | list): a single level for all lines or a level for
+            each line.
+
+    Return:
+        tuple - (xs, ys, offsets) of the capped lines.
+    """
+    levels = _perPolygon(levels, offsets)
+    out_x = []
+    out_y = []
+    out_offsets = [0]
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        level = levels[i]
+        for k in range(start, end):
+            if k > start:
+                y0, y1 = ys[k - 1], ys[k]
+                if (y0 - level) * (y1 - level) < 0:
+                    f = (level - y0) / (y1 - y0)
+                    out_x.append(xs[k - 1] + f * (xs[k] - xs[k - 1]))
+                    out_y.append(level)
+            out_x.append(xs[k])
+            out_y.append(min(ys[k], level))
+        out_offsets.append(len(out_x))
+    return out_x, out_y, out_offsets
+
+
+def areasBetween(bed_x, bed_y, xs, ys, offsets):
+    """Calculate the area between a bed line and many lines above it.
+
+    For each of the upper lines only the parts where it is above the bed are
+    included and only between its first and last x values. The bed is
+    extended flat past its end points if needed. All lines must have
+    increasing x values, although repeated x values (vertical sections) are
+    allowed.
+
+    This can be used for the flow area of a section below a stage (an upper
+    line flat at the stage) or the area of bridge openings.
+
+    Args:
+        bed_x(list): bed x values.
+        bed_y(list): bed y values.
+        xs(list): x values of all of the upper lines. See flattenPolygons().
+        ys(list): y values of all of the upper lines.
+        offsets(list): start index of each line plus the total length.
+
+    Return:
+        list - the area under each upper line.
+    """
+    out = []
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        if len(bed_x) < 1 or end - start < 2:
+            out.append(0.0)
+            continue
+        lo_x = min(bed_x[0], xs[start])
+        hi_x = max(bed_x[-1], xs[end - 1])
+        bx = [lo_x] + list(bed_x) + [hi_x]
+        by = [bed_y[0]] + list(bed_y) + [bed_y[-1]]
+
+        area = 0.0
+        b = 0
+        t = start
+        while b < len(bx) - 1 and t < end - 1:
+            lo = max(bx[b], xs[t])
+            hi = min(bx[b + 1], xs[t + 1])
+            if hi > lo:
+                d0 = _lineAt(xs, ys, t, lo) - _lineAt(bx, by, b, lo)
+                d1 = _lineAt(xs, ys, t, hi) - _lineAt(bx, by, b, hi)
+                area += _positiveArea(d0, d1, hi - lo)
+            if bx[b + 1] < xs[t + 1]:
+                b += 1
+            else:
+                t += 1
+        out.append(area)
+    return out
+
+
+def _signedAreas(xs, ys, offsets):
+    """Shoelace signed area of each polygon."""
+    out = []
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        area = 0.0
+        for k in range(start, end):
+            j = k + 1 if k + 1 < end else start
+            area += xs[k] * ys[j] - xs[j] * ys[k]
+        out.append(area / 2.0)
+    return out
+
+
+def _perPolygon(values, offsets):
+    """Expand a single value to a list with one for each polygon."""
+    if isinstance(values, (list, tuple)):
+        return values
+    return [values] * (len(offsets) - 1)
+
+
+def _lineAt(xs, ys, k, x):
+    """Get the value of segment k of a line at x."""
+    x0, x1 = xs[k], xs[k + 1]
+    if x1 == x0:
+        return ys[k + 1]
+    return ys[k] + (ys[k + 1] - ys[k]) * (x - x0) / (x1 - x0)
+
+
+def _positiveArea(d0, d1, width):
+    """Area of the positive part of a linear depth between two points."""
+    if d0 >= 0 and d1 >= 0:
+        return (d0 + d1) * width / 2.0
+    if d0 <= 0 and d1 <= 0:
+        return 0.0
+    pos = max(d0, d1)
+    return pos * pos * width / (2.0 * (pos - min(d0, d1)))
@@ -0,0 +1,303 @@
+"""
+
+ Summary:
+     Contains a simple uniform grid spatial index for point data.
+
+     The GridIndex stores points against a key (e.g. the unit or file that
+     the points belong to) and supports bounding box, radius and nearest-k
+     queries without needing to check every point. Points can be added and
+     removed by key at any time, so the index can be kept up to date
+     incrementally rather than rebuilt.
+
+ Author:
+     Duncan Runnacles
+
+  Created:
+     19 Oct 2026
+
+ Copyright:
+     Duncan Runnacles 2026
+
+ TODO:
+
+ Updates:
+
+"""
+
+from __future__ import unicode_literals
+
+import math
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class GridIndex(object):
+    """Uniform grid spatial index for points.
+
+    Each point is stored as a (key, x, y, data) tuple in the grid cell that
+    it falls in. The key groups points together so that they can be removed
+    or reported as a single item (for example all of the points in a cross
+    section). The data can be anything useful to the caller, such as the row
+    index of the point.
+
+    The cell_size should be roughly the same size as the spacing between the
+    groups of points being indexed. Very small cells will use more memory and
+    very large cells will need more points checking for each query.
+    """
+
+    def __init__(self, cell_size=50.0):
+        """Constructor.
+
+        Args:
+            cell_size=50.0(float): the width and height of the grid cells in
+                the same units as the coordinates.
+
+        Raises:
+            ValueError: if cell_size is not greater than zero.
+        """
+        if not cell_size > 0:
+            raise ValueError('cell_size must be greater than zero')
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._key_cells = {}
+        self._count = 0
+        self._bounds = None
+        self._bounds_dirty = False
+
+    def __len__(self):
+        """Return the number of points stored in the index."""
+        return self._count
+
+    def __contains__(self, key):
+        """Check whether any points are stored against key."""
+        return key in self._key_cells
+
+    def keys(self):
+        """Get the keys that have points stored in the index.
+
+        Return:
+            list - of keys.
+        """
+        return list(self._key_cells.keys())
+
+    def cell(self, x, y):
+        """Get the grid cell that a coordinate falls in.
+
+        Args:
+            x(float): x coordinate.
+            y(float): y coordinate.
+
+        Return:
+            tuple - (column, row) of the cell.
+        """
+        return (int(math.floor(x / self.cell_size)),
+                int(math.floor(y / self.cell_size)))
+
+    def insert(self, key, x, y, data=None):
+        """Add a point to the index.
+
+        Args:
+            key: hashable value to store the point against.
+            x(float): x coordinate.
+            y(float): y coordinate.
+            data=None: any additional data to return with the point.
+        """
+        c = self.cell(x, y)
+        if not c in self._cells:
+            self._cells[c] = []
+        self._cells[c].append((key, x, y, data))
+        if not key in self._key_cells:
+            self._key_cells[key] = set()
+        self._key_cells[key].add(c)
+        self._count += 1
+
+        if self._bounds is not None and not self._bounds_dirty:
+            b = self._bounds
+            self._bounds = (min(b[0], c[0]), min(b[1], c[1]),
+                            max(b[2], c[0]), max(b[3], c[1]))
+        elif self._bounds is None and self._count == 1:
+            self._bounds = (c[0], c[1], c[0], c[1])
+            self._bounds_dirty = False
+
+    def remove(self, key):
+        """Remove all of the points stored against key.
+
+        Args:
+            key: the key used when inserting the points.
+
+        Return:
+            int - the number of points removed.
+        """
+        cells = self._key_cells.pop(key, None)
+        if cells is None:
+            return 0
+
+        removed = 0
+        for c in cells:
+            entries = self._cells[c]
+            keep = [e for e in entries if e[0] != key]
+            removed += len(entries) - len(keep)
+            if keep:
+                self._cells[c] = keep
+            else:
+                del self._cells[c]
+        self._count -= removed
+        self._bounds_dirty = True
+        return removed
+
+    def clear(self):
+        """Remove all points from the index."""
+        self._cells = {}
+        self._key_cells = {}
+        self._count = 0
+        self._bounds = None
+        self._bounds_dirty = False
+
+    def bounds(self):
+        """Get the extent of the occupied cells.
+
+        Return:
+            tuple - (min column, min row, max column, max row) of the cells
+                containing points, or None if the index is empty.
+        """
+        if self._bounds_dirty:
+            if not self._cells:
+                self._bounds = None
+            else:
+                cols = [c[0] for c in self._cells]
+                rows = [c[1] for c in self._cells]
+                self._bounds = (min(cols), min(rows), max(cols), max(rows))
+            self._bounds_dirty = False
+        return self._bounds
+
+    def box(self, xmin, ymin, xmax, ymax):
+        """Find all points within a bounding box.
+
+        Args:
+            xmin(float): minimum x coordinate of the box.
+            ymin(float): minimum y coordinate of the box.
+            xmax(float): maximum x coordinate of the box.
+            ymax(float): maximum y coordinate of the box.
+
+        Return:
+            list - of (key, x, y, data) tuples for the points found.
+        """
+        if xmin > xmax:
+            xmin, xmax = xmax, xmin
+        if ymin > ymax:
+            ymin, ymax = ymax, ymin
+        c0 = self.cell(xmin, ymin)
+        c1 = self.cell(xmax, ymax)
+
+        found = []
+        ncells = (c1[0] - c0[0] + 1) * (c1[1] - c0[1] + 1)
+        if ncells > len(self._cells):
+            # Cheaper to check the occupied cells than the whole range
+            cells = [c for c in self._cells
+                     if c0[0] <= c[0] <= c1[0] and c0[1] <= c[1] <= c1[1]]
+        else:
+            cells = [(i, j) for i in range(c0[0], c1[0] + 1)
+                     for j in range(c0[1], c1[1] + 1)]
+
+        for c in cells:
+            entries = self._cells.get(c)
+            if entries is None:
+                continue
+            for e in entries:
+                if xmin <= e[1] <= xmax and ymin <= e[2] <= ymax:
+                    found.append(e)
+        return found
+
+    def radius(self, x, y, radius):
+        """Find all points within a distance of a coordinate.
+
+        Args:
+            x(float): x coordinate of the centre.
+            y(float): y coordinate of the centre.
+            radius(float): the search distance.
+
+        Return:
+            list - of (key, x, y, data) tuples for the points found.
+        """
+        r2 = radius * radius
+        return [e for e in self.box(x - radius, y - radius, x + radius, y + radius)
+                if (e[1] - x) ** 2 + (e[2] - y) ** 2 <= r2]
+
+    def nearest(self, x, y, k=1, distinct=False):
+        """Find the k points closest to a coordinate.
+
+        The search works outwards from the cell containing the coordinate one
+        ring of cells at a time and stops as soon as no unchecked cell could
+        contain a closer point.
+
+        Args:
+            x(float): x coordinate to search from.
+            y(float): y coordinate to search from.
+            k=1(int): the number of points to return.
+            distinct=False(bool): if True only the closest point for each key
+                will be considered, so k different keys will be returned.
+
+        Return:
+            list - of (distance, (key, x, y, data)) tuples sorted with the
+                closest first. May be shorter than k if there are not enough
+                points in the index.
+        """
+        bounds = self.bounds()
+        if bounds is None or k < 1:
+            return []
+
+        qi, qj = self.cell(x, y)
+        # Rings closer than this can't contain any occupied cells
+        start_ring = max(0, bounds[0] - qi, qi - bounds[2],
+                         bounds[1] - qj, qj - bounds[3])
+        max_ring = max(abs(qi - bounds[0]), abs(qi - bounds[2]),
+                       abs(qj - bounds[1]), abs(qj - bounds[3]))
+
+        best = {}
+        ring = start_ring
+        while ring <= max_ring:
+            for c in self._ringCells(qi, qj, ring):
+                entries = self._cells.get(c)
+                if entries is None:
+                    continue
+                for e in entries:
+                    d = math.hypot(e[1] - x, e[2] - y)
+                    if distinct:
+                        current = best.get(e[0])
+                        if current is None or d < current[0]:
+                            best[e[0]] = (d, e)
+                    else:
+                        best[len(best)] = (d, e)
+
+            if len(best) >= k:
+                found = sorted(best.values(), key=lambda b: b[0])
+                # Anything in the next ring is at least this far away
+                if found[k - 1][0] <= ring * self.cell_size:
+                    return found[:k]
+            ring += 1
+
+        return sorted(best.values(), key=lambda b: b[0])[:k]
+
+    def _ringCells(self, qi, qj, ring):
+        """Get the cells on the square ring at a distance from a cell.
+
+        Args:
+            qi(int): the column of the centre cell.
+            qj(int): the row of the centre cell.
+            ring(int): the number of cells out from the centre.
+
+        Return:
+            list - of (column, row) tuples.
+        """
+        if ring == 0:
+            return [(qi, qj)]
+        cells = []
+        for i in range(qi - ring, qi + ring + 1):
+            cells.append((i, qj - ring))
+            cells.append((i, qj + ring))
+        for j in range(qj - ring + 1, qj + ring):
+            cells.append((qi - ring, j))
+            cells.append((qi + ring, j))
+        return cells
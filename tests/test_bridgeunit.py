@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+import math
 import unittest
 
 from ship.fmp.datunits import bridgeunit
@@ -237,3 +238,36 @@ class BridgeUnitTests(unittest.TestCase):
 
         output = b.getData()
         self.assertListEqual(test_output, output)
+
+    def test_area(self):
+        """Check the opening areas are calculated correctly."""
+        b = bridgeunit.BridgeUnitArch()
+        b.readUnitData(self.arch_unitdata, 0)
+        areas = b.area(arch_segments=1000)
+        self.assertEqual(sorted(areas.keys()), ['1', 'total'])
+        self.assertAlmostEqual(areas['total'], 11.963, places=3)
+        self.assertAlmostEqual(b.area(stage=34.0)['1'], 2.382671)
+
+        # Flat topped openings are exact
+        b = bridgeunit.BridgeUnitUsbpr()
+        b.readUnitData(self.usbpr_unitdata, 0)
+        self.assertAlmostEqual(b.area()['total'], 4.455904)
+
+        b = bridgeunit.BridgeUnitArch()
+        b.readUnitData(['BRIDGE Two openings',
+                        'ARCH',
+                        'BU          BD',
+                        'MANNING',
+                        '     1.000     0.000     0.000     0.000',
+                        '         3',
+                        '     0.000     2.000     0.040',
+                        '     1.000     0.000     0.040',
+                        '    10.000     0.000     0.040',
+                        '         2',
+                        '     0.000     4.000     1.000     1.000',
+                        '     6.000     8.000     1.000     2.000'], 0)
+        areas = b.area(stage=0.5, arch_segments=1000)
+        self.assertAlmostEqual(areas['1'], 1.5625)
+        self.assertAlmostEqual(areas['2'], 1.0)
+        self.assertAlmostEqual(b.area(arch_segments=1000)['2'], 2.0 + math.pi / 2, places=4)
+        self.assertEqual(bridgeunit.BridgeUnitArch().area(), {'total': 0.0})
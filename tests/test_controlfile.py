@@ -0,0 +1,215 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.tuflow import tuflowfilepart as tfp
+from ship.tuflow import tuflowfactory as f
+from ship.tuflow.controlfile import PartHolder, ControlFile, seValsKey
+
+
+class PartHolderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tgc = tfp.ModelFile(None, **{'path': 'model.tgc', 'command': 'Geometry Control File',
+                                          'comment': None, 'model_type': 'TGC', 'root': '/root'})
+        self.tbc = tfp.ModelFile(None, **{'path': 'model.tbc', 'command': 'BC Control File',
+                                          'comment': None, 'model_type': 'TBC', 'root': '/root'})
+
+    def _part(self, parent, name):
+        return tfp.TuflowVariable(parent, **{'command': name, 'variable': '1', 'comment': ''})
+
+    def test_add(self):
+        holder = PartHolder()
+        g1 = self._part(self.tgc, 'g1')
+        b1 = self._part(self.tbc, 'b1')
+        g2 = self._part(self.tgc, 'g2')
+        b2 = self._part(self.tbc, 'b2')
+        for p in (g1, b1, g2, b2):
+            holder.add(p)
+
+        # Parts are added after the last part with the same parent
+        self.assertEqual([p.command for p in holder], ['g1', 'g2', 'b1', 'b2'])
+        self.assertEqual(holder.lastIndexOfParent(self.tgc), 1)
+        self.assertEqual(holder.lastIndexOfParent(self.tbc), 3)
+        self.assertEqual(holder.index(b1), 2)
+        self.assertTrue(g2 in holder)
+        self.assertRaises(ValueError, holder.add, g2)
+
+        g0 = self._part(self.tgc, 'g0')
+        holder.add(g0, before=g1)
+        b3 = self._part(self.tbc, 'b3')
+        holder.add(b3, after=b1)
+        self.assertEqual([p.command for p in holder], ['g0', 'g1', 'g2', 'b1', 'b3', 'b2'])
+        self.assertEqual(holder.index(b2), 5)
+        self.assertEqual(holder.lastIndexOfParent(self.tgc), 2)
+
+    def test_removeReplace(self):
+        holder = PartHolder()
+        parts = [self._part(self.tgc, 'g%d' % i) for i in range(4)]
+        for p in parts:
+            holder.add(p)
+
+        removed = holder.remove(parts[3])
+        self.assertTrue(removed is parts[3])
+        self.assertFalse(parts[3] in holder)
+        self.assertEqual(holder.index(parts[3]), -1)
+        self.assertEqual(holder.lastIndexOfParent(self.tgc), 2)
+
+        new_part = self._part(self.tgc, 'new')
+        holder.replace(new_part, parts[0])
+        self.assertEqual(holder.index(new_part), 0)
+        self.assertEqual(holder.index(parts[2]), 2)
+        self.assertRaises(ValueError, holder.replace, parts[0], parts[3])
+
+        holder.move(new_part, after=parts[2])
+        self.assertEqual([p.command for p in holder], ['g1', 'g2', 'new'])
+        self.assertEqual(holder.index(parts[1]), 0)
+
+    def test_directChanges(self):
+        holder = PartHolder()
+        parts = [self._part(self.tgc, 'g%d' % i) for i in range(3)]
+        for p in parts:
+            holder.add(p)
+
+        # Changes to the list length are picked up automatically
+        extra = self._part(self.tbc, 'b1')
+        holder.parts.insert(0, extra)
+        self.assertEqual(holder.index(parts[2]), 3)
+        self.assertEqual(holder.lastIndexOfParent(self.tbc), 0)
+
+        holder.insertParts(1, [self._part(self.tbc, 'b2')])
+        self.assertEqual(holder.lastIndexOfParent(self.tbc), 1)
+        self.assertEqual(holder.index(parts[0]), 2)
+
+    def test_select(self):
+        holder = PartHolder()
+        g1 = self._part(self.tgc, 'Cell Size')
+        g2 = self._part(self.tgc, 'Timestep')
+        b1 = self._part(self.tbc, 'Timestep')
+        gis = tfp.GisFile(self.tgc, **{'path': 'gis/zpts.shp', 'command': 'Read GIS Z Shape',
+                                       'comment': '', 'root': '/root'})
+        for p in (g1, b1, g2, gis):
+            holder.add(p)
+
+        self.assertEqual(holder.select(command='TIMESTEP'), [g2, b1])
+        self.assertEqual(holder.select(command='TIMESTEP', parent=self.tbc), [b1])
+        self.assertEqual(holder.select(parent=[self.tgc, self.tbc]), [g1, g2, gis, b1])
+        self.assertEqual(holder.select(tfp.TuflowFile), [gis])
+        self.assertEqual(holder.select(tfp.TuflowPart, parent=self.tgc), [g1, g2, gis])
+        self.assertEqual(holder.select(command='MISSING'), [])
+        self.assertEqual(holder.select(), [g1, g2, gis, b1])
+        self.assertTrue('CELL SIZE' in holder.indexKeys('command'))
+
+        # The indexes follow changes to the holder
+        holder.remove(g2)
+        g3 = self._part(self.tgc, 'Timestep')
+        holder.add(g3, before=g1)
+        self.assertEqual(holder.select(command='TIMESTEP'), [g3, b1])
+        holder.parts.append(self._part(self.tbc, 'Timestep'))
+        self.assertEqual(len(holder.select(command='TIMESTEP', parent=self.tbc)), 2)
+
+    def test_keyChanges(self):
+        control = ControlFile('TGC')
+        var = f.TuflowFactory.getTuflowPart('Set Variable MYVAR == 5', self.tgc)[0]
+        g1 = self._part(self.tgc, 'Timestep')
+        for p in (g1, var):
+            control.parts.add(p)
+        self.assertEqual(control.contains(command='MYVAR'), [var])
+
+        # Changing the command or parent of a part updates the indexes
+        var.variable_name = 'NEWNAME'
+        self.assertEqual(control.contains(command='MYVAR'), [])
+        self.assertEqual(control.contains(command='NEWNAME'), [var])
+        self.assertEqual(control.contains(command='Set Variable NEWNAME', exact=True), [var])
+        g1.command = 'Cell Size'
+        self.assertEqual(control.parts.select(command='CELL SIZE'), [g1])
+        self.assertEqual(control.parts.select(command='TIMESTEP'), [])
+        g1.associates.parent = self.tbc
+        self.assertEqual(control.parts.select(parent=self.tbc), [g1])
+        self.assertEqual(control.parts.lastIndexOfParent(self.tbc), 0)
+
+        # Changes to parts in another holder don't reindex this one
+        other_tgc = tfp.ModelFile(None, **{'path': 'other.tgc', 'command': 'Geometry Control File',
+                                           'comment': None, 'model_type': 'TGC', 'root': '/root'})
+        other = ControlFile('TGC')
+        other_part = self._part(other_tgc, 'Timestep')
+        other.parts.add(other_part)
+        version = control.parts.version
+        other_part.command = 'Cell Size'
+        other_part.associates.parent = self.tgc
+        self.assertEqual(control.parts.select(command='CELL SIZE'), [g1])
+        self.assertEqual(control.parts.version, version)
+        self.assertEqual(other.parts.select(command='CELL SIZE', parent=self.tgc), [other_part])
+
+
+class PartActivationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tcf = tfp.ModelFile(None, **{'path': 'model.tcf', 'command': None,
+                                          'comment': None, 'model_type': 'TCF', 'root': '/root'})
+        self.tgc = f.TuflowFactory.getTuflowPart('Geometry Control File == model.tgc', self.tcf)[0]
+        self.tgc_logic = f.TuflowFactory.createIfLogic(self.tcf, ['If Event'], [['evt1']], [''])
+        self._noCallbacks(self.tgc_logic)
+        self.tgc_logic.addPart(self.tgc, 0)
+
+        self.control = ControlFile('TGC')
+        self.gis = f.TuflowFactory.getTuflowPart('Read GIS Z Shape == gis/z.shp', self.tgc)[0]
+        self.var = f.TuflowFactory.getTuflowPart('Timestep == 2', self.tgc)[0]
+        self.gis2 = f.TuflowFactory.getTuflowPart('Read GIS Z Shape == gis/z2.shp', self.tgc)[0]
+        self.iflogic = f.TuflowFactory.createIfLogic(self.tgc, ['If Scenario', 'Else'],
+                                                     [['scen1', 'scen2'], []], ['', ''])
+        self._noCallbacks(self.iflogic)
+        self.iflogic.addPart(self.gis, 0)
+        self.iflogic.addPart(self.gis2, 1)
+        for p in (self.gis, self.var, self.gis2):
+            self.control.parts.add(p)
+        self.control.logic.add([self.iflogic])
+
+    def _noCallbacks(self, logic):
+        logic.add_callback = lambda new_part, old_part: None
+        logic.remove_callback = lambda new_part, old_part: None
+
+    def test_activeParts(self):
+        activation = self.control.activation
+        se_vals = {'scenario': ['scen1'], 'event': ['evt1']}
+        self.assertEqual(activation.activeParts(se_vals),
+                         frozenset([self.gis.hash, self.var.hash]))
+        se_vals = {'scenario': ['other'], 'event': ['evt1']}
+        self.assertEqual(activation.activeParts(se_vals),
+                         frozenset([self.gis2.hash, self.var.hash]))
+
+        # Parts that aren't in any logic use the logic of their parent
+        se_vals = {'scenario': ['scen1'], 'event': ['evt2']}
+        self.assertEqual(activation.activeParts(se_vals), frozenset([self.gis.hash]))
+
+        for scen in ('scen1', 'scen2', 'other'):
+            for evt in ('evt1', 'evt2'):
+                se_vals = {'scenario': [scen], 'event': [evt]}
+                for p in (self.gis, self.var, self.gis2):
+                    self.assertEqual(self.control.checkPartLogic(p, se_vals),
+                                     p.isInSeVals(se_vals))
+
+    def test_cache(self):
+        activation = self.control.activation
+        se_vals = {'scenario': ['scen1', 'scen2'], 'event': ['evt1']}
+        files = self.control.files(se_vals=se_vals)
+        self.assertEqual(files, [self.gis])
+        self.assertEqual(activation.misses, 1)
+        self.control.filepaths(se_vals={'event': ['evt1'], 'scenario': ['scen2', 'scen1']})
+        self.assertEqual(activation.misses, 1)
+        self.assertEqual(activation.hits, 1)
+
+        # Changes to the logic are picked up. The removed part is moved to
+        # after the logic clause
+        self.iflogic.removePart(self.gis)
+        self.assertEqual(self.control.files(se_vals={'scenario': ['other'], 'event': ['evt1']}),
+                         [self.gis2, self.gis])
+        self.tgc_logic.terms[0] = ['evt2']
+        self.assertEqual(self.control.files(se_vals=se_vals), [])
+        self.assertEqual(activation.misses, 3)
+
+    def test_seValsKey(self):
+        self.assertEqual(seValsKey({'scenario': ['a', 'b'], 'event': ['c']}),
+                         seValsKey({'event': ('c',), 'scenario': ['b', 'a'], 'variable': {}}))
+        self.assertNotEqual(seValsKey({'scenario': ['a']}),
+                            seValsKey({'scenario': ['a'], 'event': []}))
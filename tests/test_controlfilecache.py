@@ -0,0 +1,151 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from ship.tuflow import tuflowfilepart as tfp
+from ship.tuflow import tuflowfactory as f
+from ship.utils.fileloaders import controlfilecache as cfc
+from ship.utils.fileloaders.tuflowloader import TuflowLoader
+
+# filetools.getFile() opens files with mode 'rU', which was removed in 3.11
+CAN_LOAD = sys.version_info < (3, 11)
+
+
+class ControlFileCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.tcf_path = os.path.join(self.folder, 'model.tcf')
+        with open(self.tcf_path, 'w') as tcf:
+            tcf.write('Timestep == 2\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _modelFile(self):
+        return tfp.ModelFile(None, **{'path': 'model.tcf', 'command': None,
+                                      'comment': None, 'model_type': 'TCF',
+                                      'root': self.folder})
+
+    def _parse(self, control_part):
+        contents = f.TuflowFactory.getTuflowPart('Timestep == 2', control_part)
+        contents += f.TuflowFactory.getTuflowPart(
+            'Geometry Control File == model.tgc ! geometry', control_part)
+        return contents, []
+
+    def test_restoreParts(self):
+        tcf = self._modelFile()
+        contents, logic = self._parse(tcf)
+        data = cfc.storeParts(contents, logic, tcf)
+
+        new_tcf = self._modelFile()
+        restored, restored_logic = cfc.restoreParts(data, new_tcf)
+        self.assertEqual(len(restored), 2)
+        self.assertEqual(restored_logic, [])
+        self.assertEqual(restored[0].variable, '2')
+        self.assertEqual(restored[1].comment, 'geometry')
+        for old, new in zip(contents, restored):
+            self.assertTrue(new.associates.parent is new_tcf)
+            self.assertTrue(new.associates in new_tcf.observers)
+            self.assertNotEqual(old.hash, new.hash)
+
+        # The original parts are untouched
+        self.assertTrue(contents[0].associates.parent is tcf)
+        self.assertFalse(contents[0].associates in new_tcf.observers)
+
+    def test_restoreActiveCallback(self):
+        tcf = self._modelFile()
+        contents, logic = self._parse(tcf)
+        data = cfc.storeParts(contents, logic, tcf)
+
+        # Changing the active status of the parent is passed on to the parts
+        new_tcf = self._modelFile()
+        restored, _ = cfc.restoreParts(data, new_tcf)
+        new_tcf.active = False
+        self.assertEqual([p.active for p in restored], [False, False])
+        self.assertEqual([p.active for p in contents], [True, True])
+        new_tcf.active = True
+        self.assertEqual([p.active for p in restored], [True, True])
+
+    def test_restoreLogic(self):
+        tcf = self._modelFile()
+        contents, _ = self._parse(tcf)
+        logic = f.TuflowFactory.createIfLogic(tcf, ['If Scenario'], [['scen1']], [''])
+        for part in contents:
+            logic.parts.append(part.hash)
+            logic.group_parts[0].append(part)
+        data = cfc.storeParts(contents, [logic], tcf)
+
+        restored, restored_logic = cfc.restoreParts(data, self._modelFile())
+        restored_logic = restored_logic[0]
+        self.assertEqual(restored_logic.getAllParts(hash_only=True),
+                         [p.hash for p in restored])
+
+        # The restored logic can still be edited
+        restored_logic.add_callback = lambda new_part, old_part: None
+        restored_logic.remove_callback = lambda new_part, old_part: None
+        new_part = f.TuflowFactory.getTuflowPart('Cell Size == 5', restored[0].associates.parent)[0]
+        restored_logic.insertPart(new_part, restored[1])
+        self.assertEqual(restored_logic.group_parts[0], [restored[0], new_part, restored[1]])
+        restored_logic.removePart(restored[0])
+        self.assertEqual(sorted(restored_logic.getAllParts(hash_only=True)),
+                         sorted([new_part.hash, restored[1].hash]))
+
+    @unittest.skipUnless(CAN_LOAD, "filetools.getFile() can't read files on this Python")
+    def test_loadCachedModel(self):
+        with open(self.tcf_path, 'w') as tcf:
+            tcf.write('Geometry Control File == model.tgc\n')
+        with open(os.path.join(self.folder, 'model.tgc'), 'w') as tgc:
+            tgc.write('Read GIS Z Shape == gis\\base.shp\n'
+                      'If Scenario == DEV\n'
+                      '    Read GIS Z Shape == gis\\dev1.shp\n'
+                      '    Read GIS Z Shape == gis\\dev2.shp\n'
+                      'Else\n'
+                      '    Read GIS Z Shape == gis\\exg.shp\n'
+                      'End If\n')
+        cache = cfc.ControlFileCache(cache_dir=os.path.join(self.folder, 'cache'))
+        TuflowLoader(cache=cache).loadFile(self.tcf_path)
+        model = TuflowLoader(cache=cache).loadFile(self.tcf_path)
+        self.assertEqual(cache.hits, 2)
+
+        control = model.control_files['TGC']
+        logic = control.logic[0]
+        hashes = [p.hash for g in logic.group_parts for p in g]
+        self.assertEqual(sorted(logic.getAllParts(hash_only=True)), sorted(hashes))
+
+        # Editing the logic of a cached model works as it does for a new one
+        dev1, dev2 = logic.group_parts[0]
+        new_part = f.TuflowFactory.getTuflowPart('Read GIS Z Shape == gis\\dev0.shp',
+                                                 dev1.associates.parent)[0]
+        logic.insertPart(new_part, dev1)
+        self.assertEqual(logic.group_parts[0], [new_part, dev1, dev2])
+        self.assertTrue(new_part in control.parts)
+        logic.removePart(dev2)
+        self.assertFalse(dev2.hash in logic.getAllParts(hash_only=True))
+        self.assertEqual(logic.getGroup(dev2), -1)
+
+    def test_getPut(self):
+        cache = cfc.ControlFileCache(cache_dir=os.path.join(self.folder, 'cache'))
+        tcf = self._modelFile()
+        self.assertTrue(cache.get(self.tcf_path, self.folder, tcf) is None)
+        cache.put(self.tcf_path, self.folder, tcf, *self._parse(tcf))
+        self.assertTrue(cache.contains(self.tcf_path, self.folder))
+        self.assertFalse(cache.contains(self.tcf_path, 'another_root'))
+
+        contents, _ = cache.get(self.tcf_path, self.folder, self._modelFile())
+        self.assertEqual(len(contents), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Read back from disk by a new cache
+        disk_cache = cfc.ControlFileCache(cache_dir=cache.cache_dir)
+        self.assertFalse(disk_cache.get(self.tcf_path, self.folder, self._modelFile()) is None)
+
+        # Changing the file invalidates the entry
+        with open(self.tcf_path, 'a') as tcf_file:
+            tcf_file.write('End Time == 3\n')
+        self.assertTrue(cache.get(self.tcf_path, self.folder, self._modelFile()) is None)
+        self.assertTrue(disk_cache.get(self.tcf_path, self.folder, self._modelFile()) is None)
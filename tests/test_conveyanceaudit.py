@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp.conveyanceaudit import auditConveyance
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class ConveyanceAuditTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+
+        # Simple channel and one with a wide flat berm just above bank level
+        self._river('riv1', [0.0, 1.0, 2.0, 3.0], [3.0, 0.0, 0.0, 3.0])
+        self._river('riv2', [0.0, 1.0, 2.0, 3.0, 100.0, 101.0],
+                    [3.0, 0.0, 0.0, 2.0, 2.0, 4.0])
+        self._river('riv3', [0.0, 1.0, 2.0, 3.0], [3.0, 0.5, 0.5, 3.0])
+
+    def _river(self, name, x, y):
+        rows = {'main': []}
+        for c, e in zip(x, y):
+            rows['main'].append({rdt.CHAINAGE: c, rdt.ELEVATION: e})
+        unit = iuf.FmpUnitFactory.createUnit('river', name=name, row_data=rows)
+        self.dat.addUnit(unit)
+
+    def test_auditConveyance(self):
+        # Serial by default
+        audit = auditConveyance(self.dat, interpolate_space=0.1)
+        self.assertEqual([r.name for r in audit], ['riv1', 'riv2', 'riv3'])
+        self.assertEqual([r.name for r in audit.negatives()], ['riv2'])
+
+        result = audit.negatives()[0]
+        self.assertTrue(result.negative_count > 0)
+        self.assertTrue(0.0 < result.max_relative_drop < 1.0)
+        self.assertAlmostEqual(result.stage, 2.0)
+        self.assertFalse(audit.passed())
+        self.assertTrue(audit.passed(threshold=1.0))
+
+        report = audit.report().split('\n')
+        self.assertEqual(len(report), 2)
+        self.assertTrue(report[1].startswith('riv2'))
+
+    def test_processPool(self):
+        serial = auditConveyance(self.dat, interpolate_space=0.1, processes=1)
+        pooled = self.dat.auditConveyance(interpolate_space=0.1, processes=2,
+                                          chunksize=1)
+        self.assertEqual([(r.name, r.has_negative, r.max_drop) for r in serial],
+                         [(r.name, r.has_negative, r.max_drop) for r in pooled])
+
+
+if __name__ == '__main__':
+    unittest.main()
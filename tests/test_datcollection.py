@@ -305,3 +305,60 @@ class IsisUnitCollectionTest(unittest.TestCase):
         self.assertEqual(links3.main_unit, riv6)
         self.assertEqual(links3.us_unit, riv5)
         self.assertEqual(links3.ds_unit, riv7)
+
+    def test_fingerprint(self):
+        '''Check the unit and model fingerprints track changes to the contents.'''
+        # Same contents, different names
+        self.assertNotEqual(self.riv1.fingerprint(), self.riv2.fingerprint())
+        self.assertEqual(self.riv1.fingerprint(), self.riv1.copy().fingerprint())
+        self.riv2.name = 'riv1'
+        self.riv2.head_data['distance'].value = 10
+        self.assertEqual(self.riv1.fingerprint(), self.riv2.fingerprint())
+
+        # Row data and head data changes are picked up
+        fp = self.riv1.fingerprint()
+        self.riv1.row_data['main'].dataObject(rdt.ROUGHNESS)[2] = 0.05
+        self.assertNotEqual(self.riv1.fingerprint(), fp)
+        fp = self.riv1.fingerprint()
+        self.riv1.head_data['slope'].value = 0.001
+        self.assertNotEqual(self.riv1.fingerprint(), fp)
+
+        # Model fingerprint changes when units are moved
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(self.riv3)
+        fp = self.dat.fingerprint()
+        self.assertEqual(self.dat.fingerprint(), fp)
+        self.dat.units[-2], self.dat.units[-1] = self.dat.units[-1], self.dat.units[-2]
+        self.assertNotEqual(self.dat.fingerprint(), fp)
+
+    def test_diff(self):
+        '''Check added, removed, moved and modified units are found.'''
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(self.riv2)
+        self.dat.addUnit(self.riv3)
+        other = DatCollection.initialisedDat(self.fake_path)
+        other.units = [u.copy() for u in self.dat.units]
+
+        diff = self.dat.diff(other)
+        self.assertFalse(diff.hasChanges())
+
+        # Move riv1 to the end, change riv2, remove riv3 and add brg1
+        riv1 = other.units.pop(2)
+        other.units.append(riv1)
+        other.units[2].row_data['main'].dataObject(rdt.ELEVATION)[1] = 9.0
+        other.units[2].head_data['distance'].value = 20
+        del other.units[3]
+        other.units.append(self.brg1)
+
+        diff = self.dat.diff(other)
+        self.assertEqual([(c.name, c.old_index, c.new_index) for c in diff.removed()],
+                         [('riv3', 4, None)])
+        self.assertEqual([(c.name, c.old_index, c.new_index) for c in diff.added()],
+                         [('brg1', None, 5)])
+        self.assertEqual([c.name for c in diff.moved()], ['riv1'])
+        modified = diff.modified()
+        self.assertEqual(len(modified), 1)
+        self.assertEqual(modified[0].name, 'riv2')
+        fields = [(f.group, f.field) for f in modified[0].fields]
+        self.assertEqual(fields, [('head_data', 'distance'), ('main', rdt.ELEVATION)])
+        self.assertEqual(modified[0].fields[1].new_value, [20.0, 9.0, 10.0, 10.0, 20.0])
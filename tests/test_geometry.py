@@ -0,0 +1,78 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.utils.tools import geometry
+
+
+class GeometryTests(unittest.TestCase):
+
+    def setUp(self):
+        square = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+        triangle = [(0.0, 0.0), (4.0, 0.0), (0.0, 3.0)]
+        self.xs, self.ys, self.offsets = geometry.flattenPolygons([square, triangle, []])
+
+    def test_flattenPolygons(self):
+        self.assertEqual(self.offsets, [0, 4, 7, 7])
+        self.assertEqual(self.xs[4:7], [0.0, 4.0, 0.0])
+
+    def test_polygonAreas(self):
+        areas = geometry.polygonAreas(self.xs, self.ys, self.offsets)
+        self.assertEqual(areas, [4.0, 6.0, 0.0])
+        self.assertEqual(areas[0], geometry.polygonArea(
+            list(zip(self.xs[0:4], self.ys[0:4]))))
+
+    def test_polygonCentroids(self):
+        centroids = geometry.polygonCentroids(self.xs, self.ys, self.offsets)
+        self.assertEqual(centroids[0], (1.0, 1.0))
+        self.assertAlmostEqual(centroids[1][0], 4.0 / 3.0)
+        self.assertAlmostEqual(centroids[1][1], 1.0)
+        self.assertEqual(centroids[2], None)
+
+    def test_polygonPerimeters(self):
+        perimeters = geometry.polygonPerimeters(self.xs, self.ys, self.offsets)
+        self.assertEqual(perimeters, [8.0, 12.0, 0.0])
+        lines = geometry.polygonPerimeters(self.xs, self.ys, self.offsets, closed=False)
+        self.assertEqual(lines[1], 9.0)
+
+    def test_clipPolygonsAtLevel(self):
+        xs, ys, offsets = geometry.clipPolygonsAtLevel(
+            self.xs, self.ys, self.offsets, [1.0, 1.5, 0.0])
+        self.assertEqual(geometry.polygonAreas(xs, ys, offsets), [2.0, 4.5, 0.0])
+        xs, ys, offsets = geometry.clipPolygonsAtLevel(
+            self.xs, self.ys, self.offsets, 1.5, below=False)
+        self.assertEqual(geometry.polygonAreas(xs, ys, offsets), [1.0, 1.5, 0.0])
+
+    def test_areasBetween(self):
+        bed_x = [0.0, 0.0, 2.0, 4.0, 4.0]
+        bed_y = [3.0, 0.0, 2.0, 0.0, 3.0]
+        xs, ys, offsets = geometry.flattenPolygons([
+            [(0.0, 1.0), (4.0, 1.0)],
+            [(1.0, 3.0), (3.0, 3.0)],
+            [(0.0, 0.0), (4.0, 4.0)],
+        ])
+        areas = geometry.areasBetween(bed_x, bed_y, xs, ys, offsets)
+        self.assertAlmostEqual(areas[0], 1.0)
+        self.assertAlmostEqual(areas[1], 3.0)
+        self.assertAlmostEqual(areas[2], 4.0)
+
+    def test_clipLinesAtLevel(self):
+        xs, ys, offsets = geometry.clipLinesAtLevel(
+            [0.0, 2.0, 4.0], [0.0, 2.0, 0.0], [0, 3], 1.0)
+        self.assertEqual(xs, [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(ys, [0.0, 1.0, 1.0, 1.0, 0.0])
+
+    def test_integerInputs(self):
+        # Integer values mustn't be truncated by floor division
+        xs, ys, offsets = geometry.clipLinesAtLevel([0, 3], [0, 2], [0, 2], 1)
+        self.assertEqual(xs, [0, 1.5, 3])
+        xs, ys, offsets = geometry.clipPolygonsAtLevel([0, 3, 3], [0, 0, 2], [0, 3], 1)
+        self.assertEqual(xs[:2], [1.5, 0])
+        centroids = geometry.polygonCentroids([0, 1, 2], [0, 1, 2], [0, 3])
+        self.assertEqual(centroids, [(1.0, 1.0)])
+        areas = geometry.areasBetween([0, 0, 3, 3], [2, 0, 0, 2], [0, 3], [1, 1], [0, 2])
+        self.assertAlmostEqual(areas[0], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
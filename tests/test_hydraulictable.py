@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.fmp.hydraulictable import HydraulicTable, HydraulicTableCache, stageGrid
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class HydraulicTableTests(unittest.TestCase):
+
+    def setUp(self):
+        # Rectangular channel 10m wide and 5m deep
+        self.x = [0.0, 0.0, 10.0, 10.0]
+        self.y = [5.0, 0.0, 0.0, 5.0]
+
+    def test_stageGrid(self):
+        self.assertEqual(stageGrid([2.0, 0.0, 0.75, 2.0], 0.5),
+                         [0.0, 0.5, 0.75, 1.0, 1.5, 2.0])
+        self.assertEqual(stageGrid([], 0.5), [])
+
+    def test_value(self):
+        table = HydraulicTable(self.x, self.y, n_vals=0.04, stage_step=1.0)
+        self.assertEqual(table.stages, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(table.value('area', -1.0), 0.0)
+        self.assertAlmostEqual(table.value('area', 2.5), 25.0)
+        self.assertAlmostEqual(table.value('wp', 2.5), 15.0)
+        self.assertAlmostEqual(table.value('top_width', 4.0), 10.0)
+
+        # Above the grid is calculated directly
+        self.assertAlmostEqual(table.value('area', 6.0), 60.0)
+
+        props = table.at(3.0)
+        self.assertAlmostEqual(props['hydraulic_radius'], 30.0 / 16.0)
+        self.assertEqual(table.valuesAt('area', [1.0, 2.0]), [10.0, 20.0])
+
+
+class HydraulicTableCacheTests(unittest.TestCase):
+
+    def _river(self, name, depth=5.0):
+        rows = {'main': []}
+        for c, e in zip([0.0, 0.0, 10.0, 10.0], [depth, 0.0, 0.0, depth]):
+            rows['main'].append({rdt.CHAINAGE: c, rdt.ELEVATION: e})
+        return iuf.FmpUnitFactory.createUnit('river', name=name, row_data=rows)
+
+    def test_table(self):
+        cache = HydraulicTableCache(maxsize=2, stage_step=0.5)
+        riv1 = self._river('riv1')
+        riv2 = self._river('riv2')
+        table = cache.table(riv1)
+        self.assertTrue(cache.table(riv1) is table)
+
+        # Identical geometry shares a table
+        self.assertTrue(cache.table(riv2) is table)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertAlmostEqual(cache.at(riv1, 1.0)['area'], 10.0)
+
+        # Changing the rows gives a new table
+        riv1.row_data['main'].dataObject(rdt.ELEVATION)[1] = -1.0
+        new_table = cache.table(riv1)
+        self.assertFalse(new_table is table)
+        self.assertAlmostEqual(new_table.value('area', 0.0), 5.0)
+        self.assertEqual(len(cache), 2)
+
+        # Least recently used is dropped
+        cache.table(self._river('riv3', depth=8.0))
+        self.assertEqual(len(cache), 2)
+        cache.table(riv2)
+        self.assertEqual(cache.misses, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
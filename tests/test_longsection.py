@@ -0,0 +1,102 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp.longsection import LongSection, sectionValues
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class LongSectionTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+        self.dat.addUnit(self._river('riv1', 1, 100.0, 5.0))
+        self.dat.addUnit(self._river('riv2', 1, 50.0, 4.0))
+        self.dat.addUnit(self._river('riv3', 1, 0.0, 3.0))
+        self.dat.addUnit(self._river('riv4', 2, 0.0, 2.0))
+
+    def _river(self, name, reach, distance, bed):
+        rows = {'main': [
+            {rdt.CHAINAGE: 0.0, rdt.ELEVATION: bed + 4.0},
+            {rdt.CHAINAGE: 2.0, rdt.ELEVATION: bed + 3.0, rdt.DEACTIVATION: 'LEFT',
+             rdt.BANKMARKER: 'LEFT'},
+            {rdt.CHAINAGE: 5.0, rdt.ELEVATION: bed},
+            {rdt.CHAINAGE: 8.0, rdt.ELEVATION: bed + 2.0, rdt.BANKMARKER: 'RIGHT'},
+            {rdt.CHAINAGE: 9.0, rdt.ELEVATION: bed + 2.5, rdt.DEACTIVATION: 'RIGHT'},
+            {rdt.CHAINAGE: 10.0, rdt.ELEVATION: bed - 1.0},
+        ]}
+        unit = iuf.FmpUnitFactory.createUnit('river', name=name, row_data=rows,
+                                             head_data={'distance': distance})
+        unit.reach_number = reach
+        return unit
+
+    def test_sectionValues(self):
+        values = sectionValues([0.0, 1.0, 2.0, 3.0], [3.0, 1.0, 0.5, 2.0],
+                               ['', '', '', ''], ['LEFT', '', 'RIGHT', ''])
+        self.assertEqual(values, (1.0, 3.0, 1.0, 0.0, 1.0))
+        self.assertEqual(sectionValues([], [], [], []), (None,) * 5)
+
+    def test_reaches(self):
+        reaches = LongSection(self.dat).reaches()
+        self.assertEqual([r.reach_number for r in reaches], [1, 2])
+        reach = reaches[0]
+        self.assertEqual(reach.names(), ['riv1', 'riv2', 'riv3'])
+        self.assertEqual(reach.chainage, [0.0, 100.0, 150.0])
+        self.assertEqual(reach.bed, [5.0, 4.0, 3.0])
+        self.assertEqual(reach.left_bank, [8.0, 7.0, 6.0])
+        self.assertEqual(reach.right_bank, [7.0, 6.0, 5.0])
+        self.assertEqual(reach.activeWidths(), [6.0, 6.0, 6.0])
+        self.assertEqual(reaches[1].chainage, [0.0])
+
+    def test_activeWidths(self):
+        # The active extents are the same as RiverUnit.width(active_only=True)
+        reach = LongSection(self.dat).reaches()[0]
+        self.assertEqual(reach.activeWidths(),
+                         [u.width(active_only=True) for u in reach.units])
+        extents = self.dat.sectionExtents()
+        self.assertEqual(reach.activeWidths(), extents.active_width[:3])
+
+        # No active rows
+        values = sectionValues([0.0, 1.0, 2.0], [3.0, 1.0, 2.0], ['', '', ''],
+                               ['', 'RIGHT', 'LEFT'])
+        self.assertEqual(values, (1.0, 3.0, 2.0, None, None))
+
+    def test_interpolates(self):
+        # The distance of units between the river sections is included
+        interp = iuf.FmpUnitFactory.createUnit('interpolate', name='int1',
+                                               head_data={'distance': 30.0})
+        self.dat.addUnit(interp, index=self.dat.index(self.dat.unit('riv1')) + 1)
+        self.dat.unit('riv1').head_data['distance'].value = 20.0
+        reaches = LongSection(self.dat).reaches()
+        self.assertEqual(reaches[0].names(), ['riv1', 'riv2', 'riv3'])
+        self.assertEqual(reaches[0].chainage, [0.0, 50.0, 100.0])
+        self.assertEqual(reaches[1].chainage, [0.0])
+
+    def test_cache(self):
+        long_section = LongSection(self.dat)
+        long_section.reaches()
+        self.assertEqual(long_section.last_updated, 4)
+        long_section.reaches()
+        self.assertEqual(long_section.last_updated, 0)
+
+        riv2 = long_section.reach(1).units[1]
+        riv2.row_data['main'].dataObject(rdt.ELEVATION)[3] = 1.0
+        reach = long_section.reach(1)
+        self.assertEqual(long_section.last_updated, 1)
+        self.assertEqual(reach.bed, [5.0, 1.0, 3.0])
+
+        reach.units[0].head_data['distance'].value = 10.0
+        reach = long_section.reach(1)
+        self.assertEqual(long_section.last_updated, 1)
+        self.assertEqual(reach.chainage, [0.0, 10.0, 60.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.utils.tools import openchannel
+
+
+class OpenChannelTests(unittest.TestCase):
+
+    def setUp(self):
+        self.x = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0]
+        self.y = [5.0, 3.5, 1.0, 0.5, 0.5, 2.0, 2.0, 5.5]
+        self.n = [0.05, 0.05, 0.03, 0.03, 0.03, 0.06, 0.06, 0.06]
+        self.panels = [False, False, True, False, False, True, False, False]
+
+    def assertSameConveyance(self, **kwargs):
+        slow, slow_neg = openchannel.calcConveyance(self.x, self.y, self.panels,
+                                                    self.n, **kwargs)
+        fast, fast_neg = openchannel.calcConveyanceFast(self.x, self.y, self.panels,
+                                                        self.n, **kwargs)
+        self.assertEqual(slow_neg, fast_neg)
+        self.assertEqual(len(slow), len(fast))
+        for s, f in zip(slow, fast):
+            self.assertAlmostEqual(s[0], f[0], places=6)
+            self.assertEqual(s[1], f[1])
+            self.assertEqual(s[2], f[2])
+        return fast, fast_neg
+
+    def test_calcConveyanceFast(self):
+        self.assertSameConveyance()
+        self.assertSameConveyance(no_panels=True)
+        self.assertSameConveyance(interpolate_space=0.25)
+        self.assertSameConveyance(interpolate_space=0.25, tolerance=1.0)
+
+    def test_integerInputs(self):
+        fast, _ = openchannel.calcConveyanceFast([0, 1, 2, 3, 4], [5, 2, 1, 2, 5], n_vals=0.03)
+        self.x = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self.y = [5.0, 2.0, 1.0, 2.0, 5.0]
+        self.n = 0.03
+        self.panels = []
+        slow, _ = self.assertSameConveyance()
+        for s, f in zip(slow, fast):
+            self.assertAlmostEqual(s[0], f[0], places=6)
+
+    def test_negativeConveyance(self):
+        # A wide flat berm just above bank level causes a drop in conveyance
+        self.x = [0.0, 1.0, 2.0, 3.0, 100.0, 101.0]
+        self.y = [3.0, 0.0, 0.0, 2.0, 2.0, 4.0]
+        self.n = 0.04
+        self.panels = []
+        results, has_negative = self.assertSameConveyance(interpolate_space=0.1)
+        self.assertTrue(has_negative)
+
+    def test_sectionProperties(self):
+        x = [0.0, 0.0, 10.0, 10.0]
+        y = [5.0, 0.0, 0.0, 5.0]
+        props = openchannel.sectionProperties(x, y, [2.0, 0.0, 1.0], n_vals=0.04)
+        self.assertEqual(props['depth'], [2.0, 0.0, 1.0])
+        self.assertAlmostEqual(props['area'][0], 20.0)
+        self.assertAlmostEqual(props['area'][2], 10.0)
+        self.assertAlmostEqual(props['wp'][0], 14.0)
+        self.assertAlmostEqual(props['top_width'][0], 10.0)
+        self.assertAlmostEqual(props['hydraulic_radius'][2], 10.0 / 12.0)
+        self.assertEqual(props['conveyance'][1], 0)
+
+        # Manning's conveyance for a rectangular channel
+        k = (1.0 / 0.04) * 20.0 * (20.0 / 14.0) ** (2.0 / 3.0)
+        self.assertAlmostEqual(props['conveyance'][0], k)
+
+        # Relative path length reduces the panel conveyance
+        props = openchannel.sectionProperties(x, y, [2.0], n_vals=0.04,
+                                              rpl_vals=[4.0, 1.0, 1.0, 1.0])
+        self.assertAlmostEqual(props['conveyance'][0], k / 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
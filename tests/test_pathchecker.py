@@ -0,0 +1,80 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ship.tuflow import tuflowfilepart as tfp
+from ship.tuflow import tuflowfactory as f
+from ship.tuflow.controlfile import ControlFile
+from ship.tuflow.tuflowmodel import TuflowModel
+from ship.tuflow.pathchecker import PathChecker
+
+
+class PathCheckerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.root, 'gis'))
+        for name in ('z.shp', 'z.shx', 'z.dbf', 'dev.shp', 'dev.dbf'):
+            open(os.path.join(self.root, 'gis', name), 'w').close()
+
+        self.tgc = tfp.ModelFile(None, **{'path': 'model.tgc', 'command': None,
+                                          'comment': None, 'model_type': 'TGC',
+                                          'root': self.root})
+        self.control = ControlFile('TGC')
+        self.control.control_files.append(self.tgc)
+        self.z = self._gis('z')
+        self.z2 = self._gis('z')
+        self.dev = self._gis('dev')
+        self.gone = self._gis('gone')
+        logic = f.TuflowFactory.createIfLogic(self.tgc, ['If Scenario'], [['DEV']], [''])
+        logic.add_callback = lambda new_part, old_part: None
+        logic.remove_callback = lambda new_part, old_part: None
+        logic.addPart(self.dev, 0)
+        for p in (self.z, self.z2, self.dev, self.gone):
+            self.control.parts.add(p)
+        self.control.logic.add([logic])
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _gis(self, name):
+        line = 'Read GIS Z Shape == {}'.format(os.path.join('gis', name + '.shp'))
+        part = f.TuflowFactory.getTuflowPart(line, self.tgc)[0]
+        part.all_types = ['shp', 'shx', 'dbf']
+        return part
+
+    def test_check(self):
+        checker = PathChecker(threads=4)
+        missing = checker.check([self.z, self.dev, self.gone, self.z2])
+        self.assertEqual([m.part for m in missing], [self.dev, self.gone])
+        self.assertEqual(missing[0].extensions, ['shx'])
+        self.assertEqual(missing[1].extensions, ['shp', 'shx', 'dbf'])
+        self.assertEqual(missing[0].paths, [os.path.join(self.root, 'gis', 'dev.shx')])
+
+        # The results are cached until cleared
+        open(os.path.join(self.root, 'gis', 'dev.shx'), 'w').close()
+        self.assertEqual(len(checker.check([self.dev])), 1)
+        checker.clear()
+        self.assertEqual(checker.check([self.dev]), [])
+
+        checker = PathChecker(threads=1, all_types=False)
+        missing = checker.check([self.z, self.gone])
+        self.assertEqual(missing[0].extensions, ['shp'])
+
+    def test_checkPathsExist(self):
+        self.assertEqual(self.control.checkPathsExist(), [self.gone])
+        self.assertEqual(self.control.checkPathsExist(all_types=True),
+                         [self.dev, self.gone])
+        self.assertEqual(self.control.checkPathsExist(se_vals={'scenario': ['EXG']},
+                                                      all_types=True), [self.gone])
+        self.gone.active = False
+        self.assertEqual(self.control.checkPathsExist(), [])
+
+        model = TuflowModel(self.root)
+        model.control_files['TGC'] = self.control
+        missing = model.missingFiles(active_only=False)
+        self.assertEqual([m.part for m in missing], [self.dev, self.gone])
+        self.assertEqual(model.checkPathsExist(active_only=False), [self.gone])
@@ -0,0 +1,120 @@
+from __future__ import unicode_literals
+
+import math
+import unittest
+
+from ship.fmp import ratingcurve
+from ship.fmp.ratingcurve import RatingBuilder, RatingCurve
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp.datunits import conduitunit
+
+
+def manning(area, wp, n, slope):
+    return (area ** (5.0 / 3.0) / wp ** (2.0 / 3.0)) * math.sqrt(slope) / n
+
+
+class RatingCurveTests(unittest.TestCase):
+
+    def test_interpolation(self):
+        curve = RatingCurve('c', [0.0, 1.0, 2.0], [0.0, 10.0, 30.0], [], [], 0.001)
+        self.assertEqual(curve.flowAt(-1.0), 0.0)
+        self.assertAlmostEqual(curve.flowAt(1.5), 20.0)
+        self.assertEqual(curve.flowAt(5.0), 30.0)
+        self.assertAlmostEqual(curve.stageAt(5.0), 0.5)
+        self.assertAlmostEqual(curve.stageAt(20.0), 1.5)
+        self.assertEqual(curve.stageAt(0.0), 0.0)
+        self.assertTrue(curve.stageAt(50.0) is None)
+
+
+class RiverRatingTests(unittest.TestCase):
+
+    def _river(self, name, slope=0.001):
+        rows = {'main': []}
+        for c, e in zip([0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 0.0, 5.0]):
+            rows['main'].append({rdt.CHAINAGE: c, rdt.ELEVATION: e,
+                                 rdt.ROUGHNESS: 0.04})
+        return iuf.FmpUnitFactory.createUnit(
+            'river', name=name, row_data=rows, head_data={'slope': slope})
+
+    def test_riverRating(self):
+        unit = self._river('riv1', 0.004)
+        curve = ratingcurve.riverRating(unit, 1.0)
+        self.assertEqual(curve.stages, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(curve.flows[0], 0.0)
+        self.assertAlmostEqual(curve.flows[2], manning(20.0, 14.0, 0.04, 0.004))
+        self.assertAlmostEqual(curve.areas[3], 30.0)
+
+    def test_builderCache(self):
+        builder = RatingBuilder(stage_step=0.5)
+        unit = self._river('riv1')
+        curve = builder.rating(unit)
+        self.assertTrue(builder.rating(unit) is curve)
+        self.assertEqual((builder.hits, builder.misses), (1, 1))
+
+        # Changing the slope gives a new curve
+        unit.head_data['slope'].value = 0.002
+        new_curve = builder.rating(unit)
+        self.assertFalse(new_curve is curve)
+        self.assertAlmostEqual(new_curve.flows[-1], curve.flows[-1] * math.sqrt(2.0))
+
+    def test_cannotRate(self):
+        builder = RatingBuilder()
+        unit = iuf.FmpUnitFactory.createUnit('junction', name='j1')
+        self.assertFalse(builder.canRate(unit))
+        self.assertRaises(ValueError, builder.rating, unit)
+
+
+class ConduitRatingTests(unittest.TestCase):
+
+    def test_rectangular(self):
+        c = conduitunit.RectangularConduitUnit()
+        c.readUnitData([
+            'CONDUIT Rectangular conduit unit',
+            'RECTANGULAR',
+            'RECT_US     RECT_DS',
+            '    10.000',
+            'MANNING',
+            '   100.000     2.000     1.000    GLOBAL     0.100     0.110    GLOBAL     0.200     0.210',
+            '   0.03000   0.03000   0.03000',
+        ], 0)
+        curve = ratingcurve.conduitRating(c, 0.001, stage_count=4)
+        self.assertEqual(curve.stages, [100.0, 100.25, 100.5, 100.75, 101.0])
+        self.assertAlmostEqual(curve.areas[2], 1.0)
+        self.assertAlmostEqual(curve.flows[2], manning(1.0, 3.0, 0.03, 0.001))
+
+        # Once full the soffit is wetted as well
+        self.assertAlmostEqual(curve.flows[-1], manning(2.0, 6.0, 0.03, 0.001))
+
+    def test_circular(self):
+        c = conduitunit.CircularConduitUnit()
+        c.readUnitData([
+            'CONDUIT Circular conduit unit',
+            'CIRCULAR',
+            'CIRC_US     CIRC_DS',
+            '    10.000',
+            'MANNING',
+            '     5.000     1.000    GLOBAL     0.000     0.000    GLOBAL     0.000     0.000',
+            '   0.01500   0.01500',
+        ], 0)
+        curve = ratingcurve.conduitRating(c, 0.001, stage_count=2, segments=256)
+        self.assertEqual(curve.stages, [5.0, 5.5, 6.0])
+        self.assertAlmostEqual(curve.areas[1], math.pi / 8.0, places=3)
+        self.assertAlmostEqual(curve.areas[2], math.pi / 4.0, places=3)
+        self.assertAlmostEqual(curve.flows[1], manning(math.pi / 8.0, math.pi / 2.0, 0.015, 0.001),
+                               places=3)
+
+    def test_conduitOutline(self):
+        c = conduitunit.SprungarchConduitUnit()
+        c.head_data['width'].value = 2.0
+        c.head_data['springing_height'].value = 1.0
+        c.head_data['crown_height'].value = 1.5
+        xs, ys, rough = ratingcurve.conduitOutline(c, segments=4)
+        self.assertEqual(len(xs), 7)
+        self.assertEqual(len(rough), 7)
+        self.assertEqual((xs[1], ys[1]), (2.0, 0.0))
+        self.assertAlmostEqual(max(ys), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.tuflow import tuflowfilepart as tfp
+from ship.tuflow import tuflowfactory as f
+from ship.tuflow.controlfile import ControlFile
+from ship.tuflow.tuflowmodel import TuflowModel
+from ship.tuflow.scenariomatrix import ScenarioMatrix, modelTerms, combinationVariables
+
+
+class ScenarioMatrixTests(unittest.TestCase):
+
+    def setUp(self):
+        self.prefix = '/'
+        if os.name != 'posix':
+            self.prefix = 'c:' + os.sep
+        root = os.path.join(self.prefix, 'path', 'to', 'model')
+        self.tgc = tfp.ModelFile(None, **{'path': 'model.tgc', 'command': None,
+                                          'comment': None, 'model_type': 'TGC',
+                                          'root': root})
+        self.control = ControlFile('TGC')
+        self.control.control_files.append(self.tgc)
+        self.base = self._gis('base')
+        self.dev = self._gis('dev')
+        self.exg = self._gis('exg')
+        self.q100 = self._gis('q100')
+        self.var = self._gis('file_<<s1>>')
+
+        scen_logic = f.TuflowFactory.createIfLogic(
+            self.tgc, ['If Scenario', 'Else If Scenario', 'Else'],
+            [['DEV'], ['OPT'], []], ['', '', ''])
+        evt_logic = f.TuflowFactory.createBlockLogic(self.tgc, 'Define Event', ['Q100'], '')
+        for logic in (scen_logic, evt_logic):
+            logic.add_callback = lambda new_part, old_part: None
+            logic.remove_callback = lambda new_part, old_part: None
+        scen_logic.addPart(self.dev, 0)
+        scen_logic.addPart(self.exg, 2)
+        evt_logic.addPart(self.q100)
+        for p in (self.base, self.dev, self.exg, self.q100):
+            self.control.parts.add(p)
+        self.control.logic.add([scen_logic, evt_logic])
+
+        self.model = TuflowModel(root)
+        self.model.control_files['TGC'] = self.control
+
+    def _gis(self, name):
+        line = 'Read GIS Z Shape == {}'.format(os.path.join('gis', name + '.shp'))
+        return f.TuflowFactory.getTuflowPart(line, self.tgc)[0]
+
+    def _names(self, paths):
+        return [os.path.basename(p) for p in paths]
+
+    def test_modelTerms(self):
+        scenarios, events = modelTerms(self.model)
+        self.assertEqual(scenarios, ['DEV', 'OPT'])
+        self.assertEqual(events, ['Q100'])
+
+    def test_resolve(self):
+        matrix = self.model.scenarioMatrix(events=['Q100', 'Q020'])
+        self.assertEqual(len(matrix), 4)
+        self.assertEqual(self._names(matrix.paths('DEV', 'Q100')),
+                         ['base.shp', 'dev.shp', 'q100.shp'])
+        self.assertEqual(self._names(matrix.paths(['OPT'], ['Q020'])), ['base.shp'])
+        self.assertRaises(KeyError, matrix.paths, 'EXG', 'Q100')
+
+        # The paths match those found for each combination on its own
+        for (scenarios, events), paths in matrix.items():
+            se_vals = {'scenario': list(scenarios), 'event': list(events)}
+            self.assertEqual(paths, self.control.filepaths(absolute=True, se_vals=se_vals))
+
+    def test_eventElse(self):
+        other = self._gis('other')
+        q050 = self._gis('q050')
+        evt_logic = f.TuflowFactory.createIfLogic(self.tgc, ['If Event', 'Else'],
+                                                  [['Q050'], []], ['', ''])
+        evt_logic.add_callback = lambda new_part, old_part: None
+        evt_logic.remove_callback = lambda new_part, old_part: None
+        evt_logic.addPart(q050, 0)
+        evt_logic.addPart(other, 1)
+        for p in (q050, other):
+            self.control.parts.add(p)
+        self.control.logic.add([evt_logic])
+
+        # The Else is decided by the events, not the scenarios
+        matrix = ScenarioMatrix(self.model, scenarios=['DEV'], events=['Q050', 'Q100'])
+        matrix.resolve()
+        self.assertEqual(self._names(matrix.paths('DEV', 'Q050')),
+                         ['base.shp', 'dev.shp', 'q050.shp'])
+        self.assertEqual(self._names(matrix.paths('DEV', 'Q100')),
+                         ['base.shp', 'dev.shp', 'q100.shp', 'other.shp'])
+
+        # Including when there aren't any scenarios
+        matrix = ScenarioMatrix(self.model, scenarios=[], events=['Q050'])
+        matrix.resolve()
+        self.assertEqual(self._names(matrix.paths([], 'Q050')),
+                         ['base.shp', 'exg.shp', 'q050.shp'])
+
+    def test_sharedPaths(self):
+        # XXX and YYY activate the same logic groups, so share their paths
+        matrix = ScenarioMatrix(self.model, scenarios=['DEV', 'OPT', 'XXX', 'YYY'],
+                                events=['Q020'])
+        matrix.resolve()
+        self.assertEqual(len(matrix), 4)
+        self.assertEqual(len(matrix.path_sets), 3)
+        self.assertEqual(matrix.set_index, [0, 1, 2, 2])
+        self.assertEqual(self._names(matrix.paths('YYY', 'Q020')), ['base.shp', 'exg.shp'])
+
+        paths, rows = matrix.table()
+        self.assertEqual(self._names(paths), ['base.shp', 'dev.shp', 'exg.shp'])
+        self.assertEqual(rows[0], [True, True, True, True])
+        self.assertEqual(rows[1], [True, False, False, False])
+        self.assertEqual(rows[2], [False, False, True, True])
+
+    def test_placeholders(self):
+        # Paths with placeholders depend on the values, not just the logic
+        self.control.parts.add(self.var)
+        matrix = ScenarioMatrix(self.model, scenarios=['XXX', 'YYY'], events=['Q020'],
+                                user_vars={'s1': 'none'}, absolute=False)
+        matrix.resolve()
+        self.assertEqual(len(matrix.path_sets), 2)
+        self.assertEqual(matrix.paths('XXX', 'Q020'), ['base.shp', 'exg.shp', 'file_XXX.shp'])
+        self.assertEqual(matrix.paths('YYY', 'Q020'), ['base.shp', 'exg.shp', 'file_YYY.shp'])
+
+    def test_combinationVariables(self):
+        user_vars = {'s1': 'a', 'cell': '5'}
+        out = combinationVariables(user_vars, ('DEV', 'OPT'), ('Q100',))
+        self.assertEqual(out, {'s1': 'DEV', 's2': 'OPT', 'e1': 'Q100', 'cell': '5'})
+        self.assertEqual(user_vars['s1'], 'a')
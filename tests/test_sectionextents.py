@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import sectionextents
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class SectionExtentsTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+
+        rows = []
+        for i in range(6):
+            rows.append({rdt.CHAINAGE: i * 2.0, rdt.ELEVATION: 10.0})
+        rows[1][rdt.DEACTIVATION] = 'LEFT'
+        rows[1][rdt.BANKMARKER] = 'LEFT'
+        rows[4][rdt.DEACTIVATION] = 'RIGHT'
+        rows[5][rdt.BANKMARKER] = 'RIGHT'
+        self.riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1',
+                                                  row_data={'main': rows})
+        self.riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2')
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(self.riv2)
+
+    def test_sectionExtents(self):
+        values = sectionextents.sectionExtents(
+            [0.0, 1.0, 2.0, 3.0], ['', 'RIGHT', 'LEFT', ''], ['', '', '', ''])
+        self.assertEqual(values, (3.0, None, 3.0, 2, 1, -1, -1))
+
+    def test_collection(self):
+        extents = self.dat.sectionExtents()
+        self.assertEqual(extents.units, [self.riv1, self.riv2])
+        self.assertEqual(extents.total_width, [10.0, 0.0])
+        self.assertEqual(extents.active_width, [4.0, 0.0])
+        self.assertEqual(extents.bank_width, [8.0, 0.0])
+        self.assertEqual(extents.left_deactivation, [1, -1])
+        self.assertEqual(extents.right_deactivation, [4, -1])
+        self.assertEqual(extents.unitExtents(self.riv1)['right_bank'], 5)
+
+    def test_riverWidth(self):
+        self.assertEqual(self.riv1.width(), 10.0)
+        self.assertEqual(self.riv1.width(active_only=True), 4.0)
+        self.assertEqual(self.riv2.width(active_only=True), 0.0)
+
+        self.riv1.row_data['main'].dataObject(rdt.DEACTIVATION)[4] = ''
+        self.riv1.row_data['main'].dataObject(rdt.DEACTIVATION)[0] = 'RIGHT'
+        self.assertRaises(IndexError, self.riv1.width, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
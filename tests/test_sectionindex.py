@@ -0,0 +1,122 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp.sectionindex import SectionIndex
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.utils.tools.spatialindex import GridIndex
+
+
+class GridIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = GridIndex(10.0)
+        self.grid.insert('a', 1.0, 1.0, 0)
+        self.grid.insert('a', 5.0, 5.0, 1)
+        self.grid.insert('b', 25.0, 25.0, 0)
+        self.grid.insert('c', -40.0, 12.0, 0)
+
+    def test_box(self):
+        found = self.grid.box(0.0, 0.0, 30.0, 30.0)
+        self.assertEqual(sorted([(e[0], e[3]) for e in found]),
+                         [('a', 0), ('a', 1), ('b', 0)])
+
+    def test_radius(self):
+        found = self.grid.radius(0.0, 0.0, 8.0)
+        self.assertEqual(sorted([e[3] for e in found]), [0, 1])
+
+    def test_nearest(self):
+        found = self.grid.nearest(24.0, 24.0, k=2)
+        self.assertEqual([f[1][0] for f in found], ['b', 'a'])
+        found = self.grid.nearest(24.0, 24.0, k=2, distinct=True)
+        self.assertEqual([f[1][0] for f in found], ['b', 'a'])
+        self.assertAlmostEqual(found[1][0], ((19.0 ** 2) * 2) ** 0.5)
+
+        # Query from outside the occupied cells
+        found = self.grid.nearest(-500.0, 10.0, k=1)
+        self.assertEqual(found[0][1][0], 'c')
+
+    def test_remove(self):
+        self.assertEqual(self.grid.remove('a'), 2)
+        self.assertEqual(len(self.grid), 2)
+        self.assertFalse('a' in self.grid)
+        self.assertEqual(self.grid.bounds(), (-4, 1, 2, 2))
+
+
+class SectionIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+
+        self.riv1 = self._river('riv1', 1000.0, 2000.0)
+        self.riv2 = self._river('riv2', 1000.0, 2100.0)
+        self.riv3 = self._river('riv3', 1000.0, 2200.0)
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(self.riv2)
+        self.dat.addUnit(self.riv3)
+        self.index = SectionIndex(self.dat, cell_size=20.0)
+
+    def _river(self, name, east, north):
+        rows = {'main': []}
+        for i in range(3):
+            rows['main'].append({
+                rdt.CHAINAGE: i * 5.0, rdt.ELEVATION: 10.0,
+                rdt.EASTING: east + i * 5.0, rdt.NORTHING: north,
+            })
+        return iuf.FmpUnitFactory.createUnit('river', name=name, row_data=rows)
+
+    def test_build(self):
+        self.assertEqual(len(self.index), 9)
+
+    def test_unitsInBox(self):
+        units = self.index.unitsInBox(990.0, 2050.0, 1020.0, 2250.0)
+        self.assertEqual([u.name for u in units], ['riv2', 'riv3'])
+
+    def test_pointsInRadius(self):
+        points = self.index.pointsInRadius(1005.0, 2100.0, 5.0)
+        self.assertEqual([(p[0].name, p[1]) for p in points],
+                         [('riv2', 0), ('riv2', 1), ('riv2', 2)])
+
+    def test_unitsInPolygon(self):
+        poly = [(990.0, 1990.0), (1020.0, 1990.0), (1020.0, 2150.0),
+                (990.0, 2150.0)]
+        units = self.index.unitsInPolygon(poly)
+        self.assertEqual([u.name for u in units], ['riv1', 'riv2'])
+
+    def test_nearestUnits(self):
+        nearest = self.index.nearestUnits(1012.0, 2180.0, k=2)
+        self.assertEqual([n[0].name for n in nearest], ['riv3', 'riv2'])
+        self.assertAlmostEqual(nearest[0][1], (2.0 ** 2 + 20.0 ** 2) ** 0.5)
+
+    def test_refresh(self):
+        self.assertEqual(self.index.refresh(), 0)
+
+        # Move a section and add a new one
+        self.riv1.row_data['main'].dataObject(rdt.NORTHING)[0] = 5000.0
+        self.dat.addUnit(self._river('riv4', 3000.0, 3000.0))
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(len(self.index), 12)
+        units = self.index.unitsInRadius(1000.0, 5000.0, 1.0)
+        self.assertEqual([u.name for u in units], ['riv1'])
+
+        # Removed units are dropped from the index
+        self.dat.removeUnit('riv2', 'river')
+        units = self.index.unitsInBox(990.0, 2050.0, 1020.0, 2150.0)
+        self.assertEqual(units, [])
+        self.assertEqual(len(self.index), 9)
+
+    def test_zeroCoordinatesIgnored(self):
+        riv = iuf.FmpUnitFactory.createUnit('river', name='nocoords', row_data={
+            'main': [{rdt.CHAINAGE: 0.0, rdt.ELEVATION: 10.0},
+                     {rdt.CHAINAGE: 5.0, rdt.ELEVATION: 10.0}]
+        })
+        self.dat.addUnit(riv)
+        self.index.refresh()
+        self.assertEqual(len(self.index), 9)
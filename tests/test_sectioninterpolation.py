@@ -0,0 +1,66 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.fmp.sectioninterpolation import interpolateSections, ResampledSections
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class SectionInterpolationTests(unittest.TestCase):
+
+    def _river(self, name, x, y, banks=None, n=0.04):
+        rows = []
+        for i, (c, e) in enumerate(zip(x, y)):
+            row = {rdt.CHAINAGE: c, rdt.ELEVATION: e, rdt.ROUGHNESS: n}
+            if banks:
+                row[rdt.BANKMARKER] = banks[i]
+            rows.append(row)
+        return iuf.FmpUnitFactory.createUnit(
+            'river', name=name, head_data={'distance': 100.0},
+            row_data={'main': rows})
+
+    def test_resample(self):
+        us = self._river('us', [0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 0.0, 5.0])
+        ds = self._river('ds', [0.0, 2.0, 4.0, 6.0, 8.0], [4.0, 1.0, 0.0, 1.0, 4.0])
+        resampled = ResampledSections(us, ds)
+        self.assertEqual(resampled.s, [0.0, 0.0, 0.25, 0.5, 0.75, 1.0, 1.0])
+        self.assertEqual(resampled.columns[rdt.ELEVATION][0],
+                         [5.0, 0.0, 0.0, 0.0, 0.0, 0.0, 5.0])
+        self.assertEqual(resampled.columns[rdt.ELEVATION][1],
+                         [4.0, 4.0, 1.0, 0.0, 1.0, 4.0, 4.0])
+
+    def test_interpolateSections(self):
+        us = self._river('us', [0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 0.0, 5.0], n=0.03)
+        ds = self._river('ds', [0.0, 2.0, 4.0, 6.0, 8.0], [4.0, 1.0, 0.0, 1.0, 4.0],
+                         n=0.05)
+        units = interpolateSections(us, ds, [75.0, 50.0])
+        self.assertEqual([u.name for u in units], ['us_1', 'us_2'])
+        self.assertEqual([u.head_data['distance'].value for u in units], [25.0, 25.0])
+
+        rows = units[0].row_data['main']
+        self.assertEqual(rows.dataObjectAsList(rdt.CHAINAGE),
+                         [0.0, 0.0, 2.25, 4.5, 6.75, 9.0, 9.0])
+        self.assertEqual(rows.dataObjectAsList(rdt.ELEVATION),
+                         [4.5, 2.0, 0.5, 0.0, 0.5, 2.0, 4.5])
+        self.assertAlmostEqual(rows.dataObjectAsList(rdt.ROUGHNESS)[3], 0.04)
+
+        self.assertRaises(ValueError, interpolateSections, us, ds, [100.0])
+
+    def test_bankMarkers(self):
+        banks = ['', 'LEFT', 'BED', 'RIGHT', '']
+        us = self._river('us', [0.0, 2.0, 5.0, 8.0, 10.0], [5.0, 1.0, 0.0, 1.0, 5.0],
+                         banks)
+        ds = self._river('ds', [0.0, 1.0, 2.0, 6.0, 9.0], [4.0, 2.0, 0.0, 2.0, 4.0],
+                         banks)
+        unit = interpolateSections(us, ds, [25.0])[0]
+        rows = unit.row_data['main']
+        self.assertEqual(rows.dataObjectAsList(rdt.CHAINAGE),
+                         [0.0, 1.75, 4.25, 7.5, 9.75])
+        self.assertEqual(rows.dataObjectAsList(rdt.ELEVATION),
+                         [4.75, 1.25, 0.0, 1.25, 4.75])
+        self.assertEqual(rows.dataObjectAsList(rdt.BANKMARKER), banks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import sectionsimplify as ss
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class SectionSimplifyTests(unittest.TestCase):
+
+    def setUp(self):
+        # V shaped channel with lots of extra points along straight banks
+        self.x = [float(i) for i in range(21)]
+        self.y = [abs(10.0 - i) * 0.5 for i in range(21)]
+
+    def test_douglasPeucker(self):
+        kept = ss.douglasPeucker(self.x, self.y, 0.01)
+        self.assertEqual(kept, [0, 10, 20])
+
+        keep = [False] * 21
+        keep[4] = True
+        self.assertEqual(ss.douglasPeucker(self.x, self.y, 0.01, keep), [0, 4, 10, 20])
+
+    def test_visvalingam(self):
+        kept = ss.visvalingam(self.x, self.y, 0.01)
+        self.assertEqual(kept, [0, 10, 20])
+
+    def test_requiredPoints(self):
+        section = {
+            rdt.CHAINAGE: self.x, rdt.ELEVATION: self.y,
+            rdt.BANKMARKER: [''] * 21, rdt.PANEL_MARKER: [False] * 21,
+            rdt.ROUGHNESS: [0.04] * 10 + [0.03] * 11,
+        }
+        section[rdt.BANKMARKER][2] = 'LEFT'
+        section[rdt.PANEL_MARKER][15] = True
+        keep = ss.requiredPoints(section)
+        self.assertEqual([i for i, k in enumerate(keep) if k], [0, 2, 10, 15, 20])
+
+    def test_simplifySection(self):
+        # A small bump that changes the area too much to remove
+        self.y[5] = 3.5
+        result = ss.simplifySection({rdt.CHAINAGE: self.x, rdt.ELEVATION: self.y},
+                                    0.8, max_area_error=0.001)
+        self.assertTrue(5 in result.kept)
+        self.assertTrue(result.tolerance < 0.8)
+        self.assertTrue(result.area_error <= 0.001)
+
+    def test_simplifySections(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        dat = DatCollection.initialisedDat(os.path.join(prefix, 'fake', 'datfile.dat'))
+        rows = [{rdt.CHAINAGE: x, rdt.ELEVATION: y} for x, y in zip(self.x, self.y)]
+        rows[3][rdt.BANKMARKER] = 'LEFT'
+        unit = iuf.FmpUnitFactory.createUnit('river', name='riv1',
+                                             row_data={'main': rows})
+        dat.addUnit(unit)
+
+        results = ss.simplifySections(dat, 0.01, dry_run=True)
+        self.assertEqual(results[0].kept, [0, 3, 10, 20])
+        self.assertEqual(unit.row_data['main'].numberOfRows(), 21)
+
+        ss.simplifySections(dat, 0.01)
+        section = unit.row_data['main']
+        self.assertEqual(section.dataObjectAsList(rdt.CHAINAGE), [0.0, 3.0, 10.0, 20.0])
+        self.assertEqual(section.dataObjectAsList(rdt.BANKMARKER), ['', 'LEFT', '', ''])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+from ship.fmp import sectiontable as st
+
+
+class SectionTableTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+
+        self.riv1 = self._river('riv1', [20.0, 10.0, 11.0, 20.0], 0.04)
+        self.riv2 = self._river('riv2', [19.0, 9.0, 19.0], 0.12)
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(iuf.FmpUnitFactory.createUnit('river', name='empty'))
+        self.dat.addUnit(self.riv2)
+        self.table = self.dat.sectionTable()
+
+    def _river(self, name, elevations, n):
+        rows = {'main': []}
+        for i, e in enumerate(elevations):
+            rows['main'].append({rdt.CHAINAGE: i * 2.0, rdt.ELEVATION: e,
+                                 rdt.ROUGHNESS: n})
+        return iuf.FmpUnitFactory.createUnit('river', name=name, row_data=rows)
+
+    def test_build(self):
+        self.assertEqual(len(self.table), 7)
+        self.assertEqual([u.name for u in self.table.units], ['riv1', 'empty', 'riv2'])
+        self.assertEqual(self.table.offsets, [0, 4, 4, 7])
+        self.assertEqual(self.table.column(st.UNIT_ID), [0, 0, 0, 0, 2, 2, 2])
+        self.assertEqual(self.table.unitValues(rdt.ELEVATION, 2), [19.0, 9.0, 19.0])
+
+    def test_units(self):
+        table = self.dat.sectionTable(units=[self.riv2])
+        self.assertEqual(table.units, [self.riv2])
+        self.assertEqual(table.offsets, [0, 3])
+
+    def test_filters(self):
+        self.assertEqual(self.table.where(rdt.ELEVATION, '<', 11.0), [1, 5])
+        units = self.table.unitsWhere(rdt.ROUGHNESS, '>', 0.1)
+        self.assertEqual(units, [self.riv2])
+        rows = self.table.filter(rdt.CHAINAGE, lambda c: c >= 4.0)
+        self.assertEqual(rows, [2, 3, 6])
+        self.assertRaises(ValueError, self.table.where, rdt.ELEVATION, '=<', 1)
+
+    def test_aggregates(self):
+        self.assertEqual(self.table.minByUnit(rdt.ELEVATION), [10.0, None, 9.0])
+        self.assertEqual(self.table.maxByUnit(rdt.CHAINAGE), [6.0, None, 4.0])
+
+    def test_setValue(self):
+        self.table.setValue(rdt.ELEVATION, 5, 8.5)
+        self.assertEqual(self.table.column(rdt.ELEVATION)[5], 8.5)
+        self.assertEqual(self.riv2.row_data['main'].dataObject(rdt.ELEVATION)[1], 8.5)
+        self.assertEqual(self.table.staleUnits(), [])
+
+        # Chainage must still increase
+        self.assertRaises(ValueError, self.table.setValue, rdt.CHAINAGE, 1, 10.0)
+        self.assertRaises(KeyError, self.table.setValue, st.UNIT_ID, 1, 1)
+
+        # Direct changes to the units are reported
+        self.riv1.row_data['main'].dataObject(rdt.ROUGHNESS)[0] = 0.05
+        self.assertEqual(self.table.staleUnits(), [0])
+        self.table.rebuild()
+        self.assertEqual(self.table.column(rdt.ROUGHNESS)[0], 0.05)
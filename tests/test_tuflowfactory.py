@@ -7,6 +7,7 @@ from ship.tuflow import tuflowfilepart as tfp
 from ship.tuflow.tuflowfilepart import *  # TuflowPart, TuflowVariable, TuflowFile, TuflowKeyValue
 from ship.tuflow import FILEPART_TYPES as ft
 from ship.tuflow import tuflowfactory as f
+from ship.tuflow.tuflowmodel import KeywordMatcher, filepartTypes
 
 
 class TuflowFilePartTests(unittest.TestCase):
@@ -521,3 +522,43 @@ class TuflowFilePartTests(unittest.TestCase):
         self.assertFalse(cpart2.filename_is_prefix)
         self.assertTrue(cpart3.filename_is_prefix)
         self.assertFalse(cpart4.filename_is_prefix)
+
+
+class FilepartTypesTests(unittest.TestCase):
+    """Test the command lookup used by the factory and loader."""
+
+    def setUp(self):
+        self.types = filepartTypes()
+
+    def test_shared(self):
+        self.assertTrue(filepartTypes() is self.types)
+
+    def test_find(self):
+        self.assertEqual(self.types.find('Mongoose'), (False, None))
+        self.assertEqual(self.types.find('geometry control file == a.tgc'), (True, ft.MODEL))
+        self.assertEqual(self.types.find('READ GIS Z SHAPE == a.shp'), (True, ft.GIS))
+        self.assertEqual(self.types.find('READ GIS Z SHAPE', ft.DATA), (False, None))
+        self.assertEqual(self.types.find('BC DATABASE == bc.csv', ft.DATA), (True, ft.DATA))
+
+        # Keywords in more than one type
+        self.assertEqual(self.types.find('END DEFINE'), (True, ft.EVENT_LOGIC))
+        self.assertEqual(self.types.find('END DEFINE', ft.SECTION_LOGIC),
+                         (True, ft.SECTION_LOGIC))
+
+    def test_findAmbiguous(self):
+        self.assertEqual(self.types.find('Write Check Files == ..\\checks'),
+                         (True, ft.RESULT))
+        self.assertEqual(self.types.find('Write Check Files Include == uvpt'),
+                         (True, ft.VARIABLE))
+        self.assertEqual(self.types.find('Define Event == evt1'),
+                         (True, ft.EVENT_LOGIC))
+
+    def test_keywordMatcher(self):
+        matcher = KeywordMatcher()
+        matcher.add('READ', (1, 0), 'a')
+        matcher.add('READ GIS', (0, 0), 'b')
+        matcher.add('READ GRID', (0, 1), 'c')
+        self.assertEqual(matcher.first('READ GIS Z SHAPE'), ('READ GIS', 'b'))
+        self.assertEqual(matcher.first('READ FILE'), ('READ', 'a'))
+        self.assertEqual(matcher.keys('READ GRID == x'), set(['a', 'c']))
+        self.assertTrue(matcher.first('WRITE') is None)
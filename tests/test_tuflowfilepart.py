@@ -156,6 +156,56 @@ class TuflowFilePartTests(unittest.TestCase):
         self.assertEqual(var2, '10')
         self.assertEqual(var3, '10')
 
+    def test_placeholderResolver(self):
+        """Check the compiled PlaceholderResolver matches resolvePlaceholder."""
+        user_vars = {'s1': 'scen1', 's': 'S', 'size': '10', 'a.b': 'dot'}
+        resolver = tfp.placeholderResolver(user_vars)
+        self.assertTrue(resolver is tfp.placeholderResolver(dict(user_vars)))
+        self.assertTrue(resolver is tfp.placeholderResolver(resolver))
+        self.assertFalse(resolver is tfp.placeholderResolver({'s1': 'other'}))
+
+        value = 'x_<<s1>>_<<s>>_<<size>><<a.b>>_<<axb>>_<<unknown>>_<s1>'
+        expected = 'x_scen1_S_10dot_<<axb>>_<<unknown>>_<s1>'
+        self.assertEqual(resolver.resolve(value), expected)
+        self.assertEqual(resolver.resolve(value), expected)
+        self.assertEqual(TuflowPart.resolvePlaceholder(value, resolver), expected)
+        self.assertEqual(tfp.PlaceholderResolver({}).resolve(value), value)
+
+        # Values containing placeholders are replaced one at a time
+        nested = tfp.PlaceholderResolver({'s1': '<<e1>>', 'e1': 'event1'})
+        self.assertEqual(nested.resolve('<<s1>>'), 'event1')
+
+        path = self.tgc.absolutePath(user_vars=resolver)
+        self.assertEqual(path, self.tgc.absolutePath(user_vars=user_vars))
+
+    def test_TPhash(self):
+        """Check TuflowPart hashes are unique and usable in sets and dicts."""
+        parts = [self.tcf, self.tgc, self.gis, self.var, self.gis2]
+        hashes = [p.hash for p in parts]
+        self.assertEqual(len(set(hashes)), len(parts))
+        self.assertEqual(len(set(parts)), len(parts))
+        self.assertTrue(self.gis in set(parts))
+        lookup = dict((p, i) for i, p in enumerate(parts))
+        self.assertEqual(lookup[self.var], 3)
+        self.assertTrue(self.gis != self.gis2)
+        self.assertFalse(self.gis != self.gis)
+
+        new_part = tfp.newPartHash()
+        self.assertTrue(new_part > max(hashes))
+        self.assertTrue(self.iflogic.isTuflowPart(self.gis))
+        self.assertFalse(self.iflogic.isTuflowPart(self.gis.hash))
+
+    def test_TPcopy(self):
+        """Check that a copied TuflowPart gets a new hash."""
+        gis_copy = self.gis.copy()
+        self.assertNotEqual(gis_copy.hash, self.gis.hash)
+        self.assertNotEqual(gis_copy, self.gis)
+        self.assertEqual(gis_copy.comment, '')
+        self.assertEqual(gis_copy.filename, self.gis.filename)
+        self.assertTrue(gis_copy.associates.parent is self.tgc)
+        self.assertTrue(gis_copy.associates.logic is None)
+        self.assertTrue(self.gis.associates.logic is self.iflogic)
+
     def test_TFabsolutePath(self):
         """Test return value of absolutePath in TuflowFile."""
         path1 = os.path.join(self.prefix, 'path', 'to', 'model', 'tgcfile.tgc')
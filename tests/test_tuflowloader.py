@@ -0,0 +1,108 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from ship.utils.fileloaders.tuflowloader import TuflowLoader
+
+# filetools.getFile() opens files with mode 'rU', which was removed in 3.11
+CAN_LOAD = sys.version_info < (3, 11)
+
+TCF = '''Model Scenarios == DEV | Q100
+Set Variable CELL == 5
+Cell Size == <<CELL>>
+If Scenario == DEV
+    Geometry Control File == ../model/model.tgc
+    Timestep == 1
+Else
+    Geometry Control File == ../model/model.tgc ! the same file again
+    Timestep == 2
+End If
+BC Control File == ../model/missing.tbc
+Estry Control File == model.ecf
+Define Event == Q100
+    BC Event Source == ~ARI~ | 100
+End Define
+Read Materials File == ../model/materials.csv
+'''
+
+TGC = '''! geometry
+Read GIS Z Shape == gis/base.shp
+If Scenario == DEV
+    Read GIS Z Shape == gis/dev.shp | gis/dev_pts.shp
+End If
+Cell Size == <<ECFVAR>>
+'''
+
+ECF = '''Timestep == 1
+Read GIS Network == ../model/gis/1d_nwk.shp
+Set Variable ECFVAR == 3
+'''
+
+
+@unittest.skipUnless(CAN_LOAD, "filetools.getFile() can't read files on this Python")
+class TuflowLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        runs = os.path.join(self.folder, 'runs')
+        model = os.path.join(self.folder, 'model')
+        os.mkdir(runs)
+        os.mkdir(model)
+        self.tcf_path = os.path.join(runs, 'model.tcf')
+        for path, contents in ((self.tcf_path, TCF),
+                               (os.path.join(model, 'model.tgc'), TGC),
+                               (os.path.join(runs, 'model.ecf'), ECF)):
+            with open(path, 'w') as f:
+                f.write(contents)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _describe(self, model):
+        """Get everything about a loaded model that doesn't depend on hashes."""
+        out = {}
+        for key, control in model.control_files.items():
+            logic = list(control.logic)
+            parts = []
+            for p in control.parts:
+                parent = p.associates.parent
+                part_logic = p.associates.logic
+                parts.append((
+                    type(p).__name__, getattr(p, 'command', None),
+                    getattr(p, 'variable', None), getattr(p, 'path_as_read', None),
+                    getattr(p, 'data', None), p.active,
+                    parent.filenameAndExtension() if parent is not None else None,
+                    logic.index(part_logic) if part_logic in logic else None,
+                    part_logic.getGroup(p) if part_logic is not None else None,
+                ))
+            logic_desc = [(type(l).__name__, l.commands, l.terms,
+                           [[control.parts.index(p) for p in g] for g in l.group_parts])
+                          for l in logic]
+            out[key] = (parts, logic_desc, control.getPrintableContents(),
+                        [c.filenameAndExtension() for c in control.control_files])
+        return out, model.user_variables.variablesToDict(), model.bc_event, \
+            model.missing_model_files
+
+    def test_readThreads(self):
+        serial = TuflowLoader().loadFile(self.tcf_path)
+        threaded = TuflowLoader(read_threads=4).loadFile(self.tcf_path)
+        self.assertEqual(self._describe(threaded), self._describe(serial))
+
+        serial_desc = self._describe(serial)
+        self.assertEqual(sorted(serial_desc[0].keys()), ['ECF', 'TCF', 'TGC'])
+        self.assertEqual(len(serial.control_files['TGC'].control_files), 2)
+        self.assertEqual(serial_desc[1], {'s1': 'DEV', 's2': 'Q100', 'CELL': '5', 'ECFVAR': '3'})
+        self.assertEqual(len(serial.missing_model_files), 1)
+        self.assertTrue(serial.missing_model_files[0].endswith('missing.tbc'))
+
+        # Passed in the arg_dict
+        threaded = TuflowLoader().loadFile(self.tcf_path, {'read_threads': 3})
+        self.assertEqual(self._describe(threaded), serial_desc)
+
+
+if __name__ == '__main__':
+    unittest.main()
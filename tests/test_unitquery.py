@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+
+
+class UnitQueryTests(unittest.TestCase):
+
+    def setUp(self):
+        prefix = '/'
+        if os.name != 'posix':
+            prefix = 'c:' + os.sep
+        fake_path = os.path.join(prefix, 'fake', 'path', 'to', 'datfile.dat')
+        self.dat = DatCollection.initialisedDat(fake_path)
+
+        create = iuf.FmpUnitFactory.createUnit
+        self.riv1 = create('river', name='RIV_001', reach_number=1)
+        self.riv2 = create('river', name='RIV_002', reach_number=1)
+        self.riv3 = create('river', name='TRIB_001', reach_number=2)
+        self.spill1 = create('spill', name='SPL_001', head_data={'weir_coef': 1.2})
+        self.spill2 = create('spill', name='SPL_002', head_data={'weir_coef': 1.7})
+        self.brg1 = create('usbpr', name='RIV_BR1', head_data={'calibration_coef': 0.9})
+        self.brg2 = create('arch', name='RIV_BR2')
+        for u in [self.riv1, self.spill1, self.riv2, self.brg1, self.riv3,
+                  self.spill2, self.brg2]:
+            self.dat.addUnit(u)
+
+    def test_type(self):
+        self.assertEqual(self.dat.query().type('river').all(),
+                         [self.riv1, self.riv2, self.riv3])
+        self.assertEqual(self.dat.query().type('spill', 'arch').all(),
+                         [self.spill1, self.spill2, self.brg2])
+        self.assertEqual(self.dat.query().category('bridge').all(),
+                         [self.brg1, self.brg2])
+
+    def test_name(self):
+        self.assertEqual(self.dat.query().name('RIV_*').all(),
+                         [self.riv1, self.riv2, self.brg1, self.brg2])
+        self.assertEqual(self.dat.query().name('*_001').all(),
+                         [self.riv1, self.spill1, self.riv3])
+        self.assertEqual(self.dat.query().name('RIV_00[12]').all(),
+                         [self.riv1, self.riv2])
+        self.assertEqual(self.dat.query().name(r'RIV_\d+$', regex=True).all(),
+                         [self.riv1, self.riv2])
+        self.assertEqual(self.dat.query().name('SPL_002').first(), self.spill2)
+        self.assertEqual(self.dat.query().name('nothing').first(), None)
+
+    def test_reach(self):
+        self.assertEqual(self.dat.query().reach(2).all(), [self.riv3])
+        self.assertEqual(self.dat.query().reach(1).name('*2').all(), [self.riv2])
+
+    def test_where(self):
+        q = self.dat.query().type('spill').where('weir_coef', '<', 1.5)
+        self.assertEqual(q.all(), [self.spill1])
+        q = self.dat.query().category('bridge').where('calibration_coef', '!=', 1.0)
+        self.assertEqual(q.all(), [self.brg1])
+        # Units without the key are ignored
+        self.assertEqual(self.dat.query().where('weir_coef', '>', 0).count(), 2)
+        self.assertRaises(ValueError, self.dat.query().where, 'weir_coef', '~', 1)
+
+    def test_composable(self):
+        rivers = self.dat.query().type('river')
+        trib = rivers.name('TRIB*')
+        self.assertEqual(rivers.count(), 3)
+        self.assertEqual(trib.all(), [self.riv3])
+        custom = rivers.filter(lambda u: u.name.endswith('2'))
+        self.assertEqual(custom.all(), [self.riv2])
+
+    def test_indexUpdates(self):
+        q = self.dat.query().name('RIV_003')
+        self.assertEqual(q.all(), [])
+        self.riv2.name = 'RIV_003'
+        self.assertEqual(q.all(), [self.riv2])
+        riv4 = iuf.FmpUnitFactory.createUnit('river', name='RIV_003', reach_number=3)
+        self.dat.addUnit(riv4)
+        self.assertEqual(q.all(), [self.riv2, riv4])
+        self.dat.removeUnit(self.riv2)
+        self.assertEqual(q.all(), [riv4])